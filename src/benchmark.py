@@ -0,0 +1,303 @@
+"""
+Benchmarks del solver.
+
+Subcomandos:
+    ejecutar    Resuelve cada instancia con semillas fijas y varias repeticiones y
+                guarda un archivo JSON de resultados.
+    comparar    Compara dos archivos de resultados y marca las regresiones
+                (código de salida 1 si hay alguna).
+    operadores  Micro-benchmark de tiempo y memoria por generación de los
+                operadores genéticos sobre una instancia.
+
+Uso:
+    python src/benchmark.py ejecutar --salida resultados.json
+    python src/benchmark.py comparar base.json resultados.json --tolerancia 0.10
+    python src/benchmark.py operadores --instancia data/instance10.json
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import re
+import statistics
+import subprocess
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+import main
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DIRECTORIO_DATOS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+
+# Métricas comparadas entre dos ejecuciones: (clave, True si más alto es mejor,
+# diferencia absoluta por debajo de la cual el cambio se considera ruido)
+METRICAS_COMPARADAS = [
+    ('tiempo_mediano', False, 0.05),
+    ('evaluaciones_por_segundo', True, 0),
+    ('mejor_penalizacion_media', False, 0),
+    ('tiempo_primera_factible_mediano', False, 0.05),
+    ('memoria_pico_mb', False, 1.0),
+]
+
+
+def listar_instancias(directorio=DIRECTORIO_DATOS):
+    """Retorna los archivos instanceN.json del directorio ordenados por N."""
+    rutas = glob.glob(os.path.join(directorio, 'instance*.json'))
+    return sorted(rutas, key=lambda ruta: int(re.sub(r'\D', '', os.path.basename(ruta)) or 0))
+
+
+def _memoria_pico_mb():
+    """Memoria residente máxima del proceso y de sus hijos (MiB), o None si no se puede medir."""
+    if resource is None:
+        return None
+    propio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    hijos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    # ru_maxrss está en KiB en Linux y en bytes en macOS
+    divisor = 2**20 if platform.system() == 'Darwin' else 2**10
+    return max(propio, hijos) / divisor
+
+
+def _ejecutar_corrida(ruta, semilla, configuracion):
+    """Resuelve una instancia con una semilla en un proceso nuevo y retorna sus métricas."""
+    main.configurar_parametros(GENERACIONES=configuracion['generaciones'])
+    with open(ruta, 'r') as f:
+        datos = json.load(f)
+    random.seed(semilla)
+    inicio = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = main.resolver_instancia(
+            datos, modo_evaluacion=configuracion['modo_evaluacion'], num_islas=configuracion['num_islas'],
+            solver=configuracion['solver'], tiempo_limite_solver=configuracion['tiempo_limite_solver'],
+            tiempo_limite=configuracion['tiempo_limite'], usar_cota_inferior=configuracion['usar_cota_inferior'],
+            mostrar_progreso=False)
+    tiempo = time.perf_counter() - inicio
+    tiempo_bucle = resultado['tiempo']
+    return {
+        'instancia': os.path.basename(ruta),
+        'semilla': semilla,
+        'tiempo': tiempo,
+        'evaluaciones': resultado['evaluaciones'],
+        'evaluaciones_por_segundo': resultado['evaluaciones'] / tiempo_bucle if tiempo_bucle else None,
+        'mejor_penalizacion': resultado['mejor_penalizacion'],
+        'tiempo_primera_factible': resultado['tiempo_primera_factible'],
+        'generacion_parada': resultado['generacion_parada'],
+        'motivo_parada': resultado['motivo_parada'],
+        'tasa_aciertos_cache': resultado['cache']['tasa_aciertos'] if resultado['cache'] else None,
+        'memoria_pico_mb': _memoria_pico_mb(),
+    }
+
+
+def _resumir(corridas):
+    """Agrega las repeticiones de una instancia."""
+    def mediana(clave):
+        valores = [c[clave] for c in corridas if c[clave] is not None]
+        return statistics.median(valores) if valores else None
+
+    penalizaciones = [c['mejor_penalizacion'] for c in corridas]
+    velocidades = [c['evaluaciones_por_segundo'] for c in corridas if c['evaluaciones_por_segundo'] is not None]
+    return {
+        'repeticiones': len(corridas),
+        'tiempo_mediano': mediana('tiempo'),
+        'evaluaciones_por_segundo': statistics.mean(velocidades) if velocidades else None,
+        'mejor_penalizacion': min(penalizaciones),
+        'mejor_penalizacion_media': statistics.mean(penalizaciones),
+        'tiempo_primera_factible_mediano': mediana('tiempo_primera_factible'),
+        'corridas_factibles': sum(1 for c in corridas if c['tiempo_primera_factible'] is not None),
+        'memoria_pico_mb': max((c['memoria_pico_mb'] for c in corridas if c['memoria_pico_mb'] is not None), default=None),
+    }
+
+
+def _version_codigo():
+    """Commit de git del árbol actual, si está disponible."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def ejecutar_benchmark(rutas, repeticiones=3, semilla_base=0, generaciones=100, modo_evaluacion=main.MODO_EVALUACION,
+                       num_islas=1, solver='ga', tiempo_limite_solver=main.TIEMPO_LIMITE_SOLVER, tiempo_limite=None,
+                       usar_cota_inferior=False):
+    """
+    Resuelve cada instancia `repeticiones` veces con las semillas semilla_base,
+    semilla_base + 1, ... Cada corrida se ejecuta sola en un proceso nuevo para
+    que el tiempo y la memoria pico no se mezclen entre corridas.
+    Retorna el diccionario de resultados (configuración, corridas y resumen por instancia).
+    """
+    configuracion = {
+        'generaciones': generaciones, 'poblacion': main.POBLACION_SIZE, 'modo_evaluacion': modo_evaluacion,
+        'num_islas': num_islas, 'solver': solver, 'tiempo_limite_solver': tiempo_limite_solver,
+        'tiempo_limite': tiempo_limite, 'usar_cota_inferior': usar_cota_inferior,
+        'repeticiones': repeticiones, 'semilla_base': semilla_base,
+    }
+    contexto = multiprocessing.get_context('spawn')
+    corridas = []
+    for ruta in rutas:
+        for repeticion in range(repeticiones):
+            with ProcessPoolExecutor(max_workers=1, mp_context=contexto) as pool:
+                corrida = pool.submit(_ejecutar_corrida, ruta, semilla_base + repeticion, configuracion).result()
+            corridas.append(corrida)
+            print(f"{corrida['instancia']} semilla {corrida['semilla']}: penalización {corrida['mejor_penalizacion']}, "
+                  f"{corrida['tiempo']:.2f}s")
+
+    por_instancia = {}
+    for corrida in corridas:
+        por_instancia.setdefault(corrida['instancia'], []).append(corrida)
+    return {
+        'fecha': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': _version_codigo(),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'configuracion': configuracion,
+        'corridas': corridas,
+        'resumen': {instancia: _resumir(c) for instancia, c in por_instancia.items()},
+    }
+
+
+def comparar_resultados(base, nuevo, tolerancia=0.10):
+    """
+    Compara el resumen por instancia de dos ejecuciones. Una métrica es regresión
+    si empeora más de `tolerancia` (fracción) respecto a la base y más que su
+    umbral de ruido en `METRICAS_COMPARADAS`. Retorna la lista
+    de filas (instancia, métrica, base, nuevo, cambio relativo, es_regresion).
+    """
+    filas = []
+    for instancia, resumen_base in base['resumen'].items():
+        resumen_nuevo = nuevo['resumen'].get(instancia)
+        if resumen_nuevo is None:
+            continue
+        for metrica, mas_alto_es_mejor, umbral_ruido in METRICAS_COMPARADAS:
+            valor_base, valor_nuevo = resumen_base.get(metrica), resumen_nuevo.get(metrica)
+            if valor_base is None or valor_nuevo is None:
+                # Dejar de encontrar soluciones factibles también es una regresión
+                regresion = metrica == 'tiempo_primera_factible_mediano' and valor_base is not None
+                filas.append((instancia, metrica, valor_base, valor_nuevo, None, regresion))
+                continue
+            cambio = (valor_nuevo - valor_base) / abs(valor_base) if valor_base else (0.0 if valor_nuevo == valor_base else float('inf'))
+            empeora = -cambio if mas_alto_es_mejor else cambio
+            regresion = empeora > tolerancia and abs(valor_nuevo - valor_base) > umbral_ruido
+            filas.append((instancia, metrica, valor_base, valor_nuevo, cambio, regresion))
+    return filas
+
+
+def medir_generaciones(datos, generaciones=20, semilla=0, modo_evaluacion=main.MODO_EVALUACION):
+    """
+    Evoluciona `generaciones` generaciones desde una población aleatoria y retorna
+    el tiempo medio por generación de `siguiente_generacion` (s), la memoria pico
+    asignada por generación (bytes, medida con tracemalloc en una segunda pasada
+    con la misma semilla) y la mejor penalización final.
+    """
+    def ejecutar(medir_memoria):
+        random.seed(semilla)
+        poblacion = main.preparar_poblacion(
+            [main.crear_individuo(datos['employees'], datos['days'], datos['dias_por_empleado'],
+                                  datos['escritorios_por_empleado'], datos['indice'])
+             for _ in range(main.POBLACION_SIZE)], datos, modo_evaluacion)
+        tiempo_total = 0.0
+        pico_maximo = 0
+        for _ in range(generaciones):
+            puntuaciones = list(zip(poblacion, main.evaluar_poblacion(poblacion, datos, modo_evaluacion)))
+            puntuaciones.sort(key=lambda x: x[1])
+            if medir_memoria:
+                tracemalloc.start()
+                poblacion = main.siguiente_generacion(puntuaciones, datos)
+                pico_maximo = max(pico_maximo, tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+            else:
+                inicio = time.perf_counter()
+                poblacion = main.siguiente_generacion(puntuaciones, datos)
+                tiempo_total += time.perf_counter() - inicio
+        mejor = min(main.evaluar_poblacion(poblacion, datos, modo_evaluacion))
+        return tiempo_total / generaciones, pico_maximo, mejor
+
+    segundos, _, mejor = ejecutar(medir_memoria=False)
+    _, pico, _ = ejecutar(medir_memoria=True)
+    return {'segundos_por_generacion': segundos, 'memoria_pico_por_generacion': pico, 'mejor_penalizacion': mejor}
+
+
+def _formatear(valor):
+    if valor is None:
+        return '-'
+    return f"{valor:.4g}" if isinstance(valor, float) else str(valor)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks del solver de asignación de escritorios.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    parser_ejecutar = subparsers.add_parser('ejecutar', help="Resuelve las instancias y guarda los resultados.")
+    parser_ejecutar.add_argument('instancias', nargs='*', help="Archivos JSON (por defecto, data/instance*.json).")
+    parser_ejecutar.add_argument('--salida', default='resultados_benchmark.json', help="Archivo JSON de resultados.")
+    parser_ejecutar.add_argument('--repeticiones', type=int, default=3, help="Corridas por instancia.")
+    parser_ejecutar.add_argument('--semilla', type=int, default=0, help="Semilla de la primera repetición.")
+    parser_ejecutar.add_argument('--generaciones', type=int, default=100, help="Generaciones por corrida.")
+    parser_ejecutar.add_argument('--modo-evaluacion', default=main.MODO_EVALUACION, help="Modo de evaluación de la población.")
+    parser_ejecutar.add_argument('--islas', type=int, default=1, help="Número de islas.")
+    parser_ejecutar.add_argument('--solver', default='ga', help="'ga', 'cp_sat' o 'hibrido'.")
+    parser_ejecutar.add_argument('--tiempo-limite-solver', type=float, default=main.TIEMPO_LIMITE_SOLVER, help="Segundos para CP-SAT.")
+    parser_ejecutar.add_argument('--tiempo-limite', type=float, default=None, help="Segundos para el bucle de generaciones.")
+    parser_ejecutar.add_argument('--cota-inferior', action='store_true', help="Parar al alcanzar la cota inferior.")
+
+    parser_comparar = subparsers.add_parser('comparar', help="Compara dos archivos de resultados.")
+    parser_comparar.add_argument('base', help="Resultados de referencia.")
+    parser_comparar.add_argument('nuevo', help="Resultados a evaluar.")
+    parser_comparar.add_argument('--tolerancia', type=float, default=0.10, help="Empeoramiento relativo tolerado (0.10 = 10%%).")
+
+    parser_operadores = subparsers.add_parser('operadores', help="Micro-benchmark de los operadores genéticos.")
+    parser_operadores.add_argument('--instancia', default=os.path.join(DIRECTORIO_DATOS, 'instance10.json'), help="Archivo JSON de la instancia.")
+    parser_operadores.add_argument('--generaciones', type=int, default=20, help="Generaciones a medir.")
+    parser_operadores.add_argument('--semilla', type=int, default=0, help="Semilla del generador aleatorio.")
+    parser_operadores.add_argument('--modo-evaluacion', default=main.MODO_EVALUACION, help="Modo de evaluación de la población.")
+
+    args = parser.parse_args()
+
+    if args.comando == 'ejecutar':
+        resultados = ejecutar_benchmark(
+            args.instancias or listar_instancias(), args.repeticiones, args.semilla, args.generaciones,
+            args.modo_evaluacion, args.islas, args.solver, args.tiempo_limite_solver, args.tiempo_limite, args.cota_inferior)
+        with open(args.salida, 'w') as f:
+            json.dump(resultados, f, indent=2)
+        print(f"\n{'Instancia':<18}{'Tiempo (s)':>12}{'Eval/s':>12}{'Mejor':>12}{'Media':>12}{'Factible (s)':>14}{'Memoria (MiB)':>15}")
+        for instancia, resumen in resultados['resumen'].items():
+            print(f"{instancia:<18}{_formatear(resumen['tiempo_mediano']):>12}{_formatear(resumen['evaluaciones_por_segundo']):>12}"
+                  f"{_formatear(resumen['mejor_penalizacion']):>12}{_formatear(resumen['mejor_penalizacion_media']):>12}"
+                  f"{_formatear(resumen['tiempo_primera_factible_mediano']):>14}{_formatear(resumen['memoria_pico_mb']):>15}")
+        print(f"\nResultados guardados en: '{args.salida}'")
+
+    elif args.comando == 'comparar':
+        with open(args.base, 'r') as f:
+            base = json.load(f)
+        with open(args.nuevo, 'r') as f:
+            nuevo = json.load(f)
+        if base['configuracion'] != nuevo['configuracion']:
+            print("Aviso: las configuraciones de las dos ejecuciones difieren.")
+        filas = comparar_resultados(base, nuevo, args.tolerancia)
+        print(f"{'Instancia':<18}{'Métrica':<34}{'Base':>12}{'Nuevo':>12}{'Cambio':>10}")
+        for instancia, metrica, valor_base, valor_nuevo, cambio, regresion in filas:
+            texto_cambio = f"{cambio:+.1%}" if cambio is not None else '-'
+            print(f"{instancia:<18}{metrica:<34}{_formatear(valor_base):>12}{_formatear(valor_nuevo):>12}{texto_cambio:>10}"
+                  f"{'  REGRESIÓN' if regresion else ''}")
+        regresiones = sum(1 for fila in filas if fila[-1])
+        print(f"\n{regresiones} regresión(es) con tolerancia {args.tolerancia:.0%}.")
+        raise SystemExit(1 if regresiones else 0)
+
+    else:
+        with open(args.instancia, 'r') as f:
+            datos = main.preprocesar_datos(json.load(f))
+        resultado = medir_generaciones(datos, args.generaciones, args.semilla, args.modo_evaluacion)
+        print(f"Instancia: {args.instancia} | modo: {args.modo_evaluacion} | generaciones: {args.generaciones}")
+        print(f"  Tiempo por generación: {resultado['segundos_por_generacion'] * 1000:.1f} ms")
+        print(f"  Memoria pico por generación: {resultado['memoria_pico_por_generacion'] / 2**20:.2f} MiB")
+        print(f"  Mejor penalización: {resultado['mejor_penalizacion']}")
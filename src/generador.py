@@ -0,0 +1,170 @@
+"""
+Generador de instancias sintéticas con el mismo esquema JSON que las de data/
+(Employees, Desks, Days, Groups, Zones, Desks_Z, Desks_E, Employees_G, Days_E),
+para medir cómo escalan el algoritmo y los reportes con miles de empleados.
+
+La misma semilla y los mismos parámetros producen siempre el mismo archivo.
+
+Uso:
+    python src/generador.py --empleados 5000 --semilla 1 -o sintetica_5000.json
+    python src/generador.py --empleados 2000 --escritorios 300 --zonas 30 \\
+        --densidad-elegibilidad 0.2 --tamano-grupo 12 --distribucion-grupos geometrica \\
+        --dias-preferidos 3 --concentracion 0.8 -o campus.json
+"""
+
+import argparse
+import json
+import math
+import random
+
+DIAS_SEMANA = ["L", "Ma", "Mi", "J", "V"]
+DISTRIBUCIONES_GRUPOS = ('fijo', 'uniforme', 'geometrica')
+
+
+def _nombres_dias(num_dias):
+    """Días de la semana como en data/ (L, Ma, Mi, J, V) y, si se piden más, D5, D6, ..."""
+    return DIAS_SEMANA[:num_dias] + [f"D{i}" for i in range(len(DIAS_SEMANA), num_dias)]
+
+
+def _tamanos_grupos(num_empleados, tamano_medio, distribucion, aleatorio):
+    """
+    Tamaños de grupo que suman `num_empleados`: todos de `tamano_medio` ('fijo'),
+    uniformes entre 2 y 2*tamano_medio - 2 ('uniforme') o 2 más una geométrica de
+    media tamano_medio - 2, con algunos grupos grandes ('geometrica').
+    """
+    if distribucion not in DISTRIBUCIONES_GRUPOS:
+        raise ValueError(f"Distribución de grupos desconocida: '{distribucion}'")
+    tamanos = []
+    restantes = num_empleados
+    while restantes > 0:
+        if distribucion == 'fijo':
+            tamano = tamano_medio
+        elif distribucion == 'uniforme':
+            tamano = aleatorio.randint(2, max(2, 2 * tamano_medio - 2))
+        else:
+            exceso = tamano_medio - 2
+            p = 1 / (exceso + 1) if exceso > 0 else 1
+            tamano = 2 + int(math.log(1 - aleatorio.random()) / math.log(1 - p)) if p < 1 else 2
+        tamano = max(1, min(tamano, restantes))
+        tamanos.append(tamano)
+        restantes -= tamano
+    return tamanos
+
+
+def generar_instancia(num_empleados, num_escritorios=None, num_zonas=None, num_dias=5, densidad_elegibilidad=0.5,
+                      tamano_grupo=6, distribucion_grupos='fijo', dias_preferidos=2.5, concentracion=0.0, semilla=0):
+    """
+    Genera una instancia sintética y la retorna como diccionario con el esquema de data/.
+
+    - `num_escritorios` (por defecto 45% de los empleados, como instance10) se
+      reparten en `num_zonas` zonas contiguas (por defecto unos 10 escritorios por zona).
+    - `densidad_elegibilidad`: fracción media de escritorios permitidos a cada
+      empleado (al menos uno).
+    - `tamano_grupo` y `distribucion_grupos` ('fijo', 'uniforme' o 'geometrica'):
+      tamaño de los grupos, que reparten a todos los empleados.
+    - `dias_preferidos`: número medio de días preferidos por empleado (al menos uno).
+    - `concentracion` (0 a 1): qué tan ajustadas son las preferencias. Con 0 los
+      días se eligen al azar; con 1 todos los miembros de un grupo eligen entre
+      los mismos días favoritos del grupo, y esos favoritos se cargan hacia la
+      mitad de la semana, lo que concentra la demanda en pocos días.
+    """
+    if num_empleados < 1 or num_dias < 1:
+        raise ValueError("Se necesita al menos un empleado y un día")
+    if not 0 < densidad_elegibilidad <= 1:
+        raise ValueError("densidad_elegibilidad debe estar en (0, 1]")
+    if not 0 <= concentracion <= 1:
+        raise ValueError("concentracion debe estar en [0, 1]")
+    aleatorio = random.Random(semilla)
+    num_escritorios = num_escritorios or max(1, round(0.45 * num_empleados))
+    num_zonas = min(num_zonas or max(1, math.ceil(num_escritorios / 10)), num_escritorios)
+
+    empleados = [f"E{i}" for i in range(num_empleados)]
+    escritorios = [f"D{i}" for i in range(num_escritorios)]
+    dias = _nombres_dias(num_dias)
+    zonas = [f"Z{i}" for i in range(num_zonas)]
+
+    # Zonas de escritorios contiguos de tamaño parejo
+    escritorios_por_zona = {
+        zona: escritorios[i * num_escritorios // num_zonas:(i + 1) * num_escritorios // num_zonas]
+        for i, zona in enumerate(zonas)
+    }
+
+    # Escritorios permitidos: una muestra por empleado de tamaño cercano a la densidad pedida
+    media_permitidos = densidad_elegibilidad * num_escritorios
+    escritorios_por_empleado = {}
+    for e in empleados:
+        cantidad = round(aleatorio.gauss(media_permitidos, 0.25 * media_permitidos))
+        escritorios_por_empleado[e] = aleatorio.sample(escritorios, max(1, min(num_escritorios, cantidad)))
+
+    # Grupos que reparten a todos los empleados (en orden, como en data/)
+    tamanos = _tamanos_grupos(num_empleados, tamano_grupo, distribucion_grupos, aleatorio)
+    grupos = [f"G{i}" for i in range(len(tamanos))]
+    empleados_por_grupo = {}
+    inicio = 0
+    for grupo, tamano in zip(grupos, tamanos):
+        empleados_por_grupo[grupo] = empleados[inicio:inicio + tamano]
+        inicio += tamano
+
+    # Días preferidos: peso base uniforme o cargado hacia la mitad de la semana
+    mitad = (num_dias - 1) / 2
+    pesos_semana = [(1 - concentracion) + concentracion * (1 + mitad - abs(i - mitad)) for i in range(num_dias)]
+    dias_por_empleado = {}
+    for miembros in empleados_por_grupo.values():
+        cantidad_favoritos = min(num_dias, max(1, math.ceil(dias_preferidos)))
+        favoritos = set(_muestra_ponderada(dias, pesos_semana, cantidad_favoritos, aleatorio))
+        for e in miembros:
+            cantidad = max(1, min(num_dias, round(aleatorio.gauss(dias_preferidos, 0.75))))
+            pesos = [p * (1 + 9 * concentracion) if d in favoritos else p * (1 - concentracion) + 1e-9
+                     for d, p in zip(dias, pesos_semana)]
+            elegidos = set(_muestra_ponderada(dias, pesos, cantidad, aleatorio))
+            dias_por_empleado[e] = [d for d in dias if d in elegidos]
+
+    return {
+        "Employees": empleados,
+        "Desks": escritorios,
+        "Days": dias,
+        "Groups": grupos,
+        "Zones": zonas,
+        "Desks_Z": escritorios_por_zona,
+        "Desks_E": escritorios_por_empleado,
+        "Employees_G": empleados_por_grupo,
+        "Days_E": dias_por_empleado,
+    }
+
+
+def _muestra_ponderada(elementos, pesos, cantidad, aleatorio):
+    """Muestra sin reemplazo de `cantidad` elementos con probabilidad proporcional a `pesos`."""
+    # Claves de Efraimidis-Spirakis: u^(1/peso), se quedan las mayores
+    claves = [(aleatorio.random() ** (1 / peso), i) for i, peso in enumerate(pesos)]
+    return [elementos[i] for _, i in sorted(claves, reverse=True)[:cantidad]]
+
+
+def crear_parser():
+    """Parser de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera instancias sintéticas de asignación de escritorios.")
+    parser.add_argument('--empleados', type=int, required=True, help="Número de empleados.")
+    parser.add_argument('--escritorios', type=int, default=None, help="Número de escritorios (por defecto, 45%% de los empleados).")
+    parser.add_argument('--zonas', type=int, default=None, help="Número de zonas (por defecto, unos 10 escritorios por zona).")
+    parser.add_argument('--dias', type=int, default=5, help="Número de días.")
+    parser.add_argument('--densidad-elegibilidad', type=float, default=0.5,
+                        help="Fracción media de escritorios permitidos a cada empleado.")
+    parser.add_argument('--tamano-grupo', type=int, default=6, help="Tamaño medio de los grupos.")
+    parser.add_argument('--distribucion-grupos', default='fijo', choices=DISTRIBUCIONES_GRUPOS,
+                        help="Distribución del tamaño de los grupos.")
+    parser.add_argument('--dias-preferidos', type=float, default=2.5, help="Días preferidos medios por empleado.")
+    parser.add_argument('--concentracion', type=float, default=0.0,
+                        help="Qué tan ajustadas son las preferencias de días (0: al azar, 1: todas en los días favoritos del grupo).")
+    parser.add_argument('--semilla', type=int, default=0, help="Semilla del generador aleatorio.")
+    parser.add_argument('-o', '--salida', required=True, help="Archivo JSON de salida.")
+    return parser
+
+
+if __name__ == "__main__":
+    args = crear_parser().parse_args()
+    instancia = generar_instancia(args.empleados, args.escritorios, args.zonas, args.dias, args.densidad_elegibilidad,
+                                  args.tamano_grupo, args.distribucion_grupos, args.dias_preferidos, args.concentracion,
+                                  args.semilla)
+    with open(args.salida, 'w', encoding='utf-8') as f:
+        json.dump(instancia, f, ensure_ascii=False)
+    print(f"Instancia generada en '{args.salida}': {len(instancia['Employees'])} empleados, "
+          f"{len(instancia['Desks'])} escritorios, {len(instancia['Zones'])} zonas, {len(instancia['Groups'])} grupos.")
@@ -1,17 +1,19 @@
+import argparse
 import json
 import random
-import copy
-from collections import defaultdict
-import pandas as pd
-import matplotlib.pyplot as plt
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.units import inch
-from reportlab.lib import colors
-
-# Import the files module for Colab
-from google.colab import files
+import os
+import re
+import sys
+import multiprocessing
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import OrderedDict, defaultdict
+import numpy as np
+
+# openpyxl, pyarrow, matplotlib, reportlab y google.colab se importan dentro de las funciones
+# que los usan: sólo se cargan si se pide el reporte correspondiente o si el
+# script se ejecuta en Colab.
 
 # ==============================================================================
 # PARÁMETROS DEL ALGORITMO GENÉTICO 
@@ -26,197 +28,374 @@ TASA_MUTACION_ESCRITORIO_REL = 0.75
 TASA_MUTACION_DIA_REL = 0.20
 TASA_MUTACION_ELIMINACION_REL = 0.05
 TASA_MUTACION_ADICION = 0.10
+OPERADOR_CRUCE = 'uniforme'  # 'uniforme' (por asignación), 'dias' (días completos) o 'grupos' (grupos completos)
+MODO_EVALUACION = 'incremental'  # 'incremental', 'vectorizado', 'paralelo' o 'completo'
+NUM_PROCESOS = None  # Procesos del modo 'paralelo' (None = todos los núcleos)
+MIN_CELDAS_PARALELO = 1_000_000  # Por debajo de población x empleados x días se evalúa en serie
+NUM_ISLAS = 1  # Más de una isla activa el modelo de islas multiproceso
+INTERVALO_MIGRACION = 25  # Generaciones entre migraciones
+NUM_MIGRANTES = 5  # Élites que cada isla envía en cada migración
+TOPOLOGIA_MIGRACION = 'anillo'  # 'anillo' o 'aleatoria'
+SOLVER = 'ga'  # 'ga', 'cp_sat' o 'hibrido' (CP-SAT siembra la población del GA)
+TIEMPO_LIMITE_SOLVER = 30.0  # Segundos para CP-SAT
+NUM_TRABAJADORES_SOLVER = 8  # Hilos de búsqueda de CP-SAT
+MAX_GENERACIONES_SIN_MEJORA = None  # Parar tras N generaciones sin mejora (None = sin límite)
+TIEMPO_LIMITE = None  # Segundos de reloj para el bucle de generaciones (None = sin límite)
+PENALIZACION_OBJETIVO = None  # Parar al alcanzar esta penalización (None = sin objetivo)
+USAR_COTA_INFERIOR = True  # Parar si la mejor penalización iguala la cota inferior de la instancia
+PROPORCION_INICIAL_GRUPAL = 0.1  # Fracción de la población inicial creada con el constructor por grupos
+PROPORCION_INICIAL_REGRET = 0.1  # Fracción de la población inicial creada con el constructor por arrepentimiento
+BUSQUEDA_LOCAL = None  # Paso memético: None, 'primera' (primera mejora) o 'mejor' (mejor mejora)
+FRACCION_BUSQUEDA_LOCAL = 0.1  # Fracción de los mejores individuos a los que se aplica la búsqueda local
+TIEMPO_BUSQUEDA_LOCAL = 0.5  # Segundos de búsqueda local por generación (repartidos entre esos individuos)
+CONTROL_ADAPTATIVO = False  # Ajusta durante la ejecución las tasas de los operadores (ver ControlAdaptativo)
+TASA_APRENDIZAJE_ADAPTATIVO = 0.2  # Velocidad con que se actualizan la recompensa y la probabilidad de cada operador
+PROBABILIDAD_MINIMA_OPERADOR = 0.05  # Probabilidad mínima de cada alternativa en el control adaptativo
+UMBRAL_DIVERSIDAD = 0.2  # Por debajo de esta diversidad se aumenta la tasa de mutación
+FACTOR_MUTACION_MAXIMO = 8.0  # Máximo múltiplo de TASA_MUTACION que alcanza el control adaptativo
+MULTIOBJETIVO = False  # NSGA-II sobre los componentes de la penalización: retorna un frente de Pareto
+INTERVALO_PUNTO_CONTROL = 10  # Generaciones entre puntos de control (si se indica un archivo de punto de control)
+PENALIZACION_CAMBIO = 0  # Replanificación: penalización por asignación conservada del plan anterior que cambia
+PROPORCION_SEMILLA_REPLANIFICACION = 0.5  # Replanificación: fracción de la población sembrada desde el plan anterior
+FRACCION_GENERACIONES_REPLANIFICACION = 0.25  # Replanificación: fracción de GENERACIONES que se ejecuta
+TAMANO_CACHE_FITNESS = 20_000  # Penalizaciones memorizadas por genoma (0 = sin caché; no aplica al modo 'incremental')
+FORMATOS_REPORTE = ('json', 'excel', 'graficos', 'pdf', 'jsonl', 'csv', 'parquet')  # Reportes disponibles (el PDF incluye los gráficos)
+FORMATOS_REPORTE_POR_DEFECTO = ('json', 'excel', 'graficos', 'pdf')  # Reportes que se generan si no se eligen otros
+FILAS_POR_BLOQUE_REPORTE = 50_000  # Filas por grupo en el reporte Parquet
+TRABAJADORES_REPORTES = 0  # Procesos de la etapa de reportes en segundo plano (0: en el proceso principal)
+FILAS_POR_TABLA_PDF = 1000  # Filas por tabla en el PDF (cada tabla repite el encabezado en cada página)
 # ==============================================================================
 # FUNCIONES DEL ALGORITMO GENÉTICO 
 # ==============================================================================
 
-def crear_individuo(employees, days, dias_por_empleado, escritorios_por_empleado):
+def crear_individuo(employees, days, dias_por_empleado, escritorios_por_empleado, indice=None):
     """Crea un individuo (solución) inicial, priorizando restricciones duras."""
+    indice = indice or IndiceInstancia(escritorios_por_empleado)
     asignacion = {}
-    escritorios_ocupados = set()
+    ocupados_por_dia = defaultdict(int)  # Día -> máscara de escritorios ocupados
     lista_empleados = list(employees)
     random.shuffle(lista_empleados)
+    _asignar_dias_preferidos(asignacion, ocupados_por_dia, lista_empleados, dias_por_empleado, indice)
+    _asignar_sin_dias(asignacion, ocupados_por_dia, lista_empleados, days, dias_por_empleado, indice)
+    return asignacion
+
 
+def _asignar_dias_preferidos(asignacion, ocupados_por_dia, lista_empleados, dias_por_empleado, indice):
+    """Asigna a cada empleado, en orden, un escritorio libre al azar en cada uno de sus días preferidos."""
     for e in lista_empleados:
-        dias_preferidos = dias_por_empleado.get(e, [])
+        dias_preferidos = list(dias_por_empleado.get(e, []))
         random.shuffle(dias_preferidos)
         for d in dias_preferidos:
-            escritorios_validos = escritorios_por_empleado.get(e, [])
-            opciones = [esc for esc in escritorios_validos if (d, esc) not in escritorios_ocupados]
-            if opciones:
-                escritorio_elegido = random.choice(opciones)
+            escritorio_elegido = indice.escritorio_aleatorio(indice.mascara_permitidos.get(e, 0) & ~ocupados_por_dia[d])
+            if escritorio_elegido is not None:
                 asignacion[(e, d)] = escritorio_elegido
-                escritorios_ocupados.add((d, escritorio_elegido))
+                ocupados_por_dia[d] |= indice.bit_escritorio[escritorio_elegido]
 
+
+def _asignar_sin_dias(asignacion, ocupados_por_dia, lista_empleados, days, dias_por_empleado, indice):
+    """Da un día no preferido (y un escritorio libre) a cada empleado que quedó sin asignar."""
+    empleados_asignados = {e for (e, _) in asignacion}
     for e in lista_empleados:
-        if not any(key[0] == e for key in asignacion):
+        if e not in empleados_asignados:
             dias_asignados_actualmente = dias_por_empleado.get(e, [])
             dias_no_preferidos = [d for d in days if d not in dias_asignados_actualmente]
             random.shuffle(dias_no_preferidos)
             for d_alt in dias_no_preferidos:
-                escritorios_validos = escritorios_por_empleado.get(e, [])
-                opciones = [esc for esc in escritorios_validos if (d_alt, esc) not in escritorios_ocupados]
-                if opciones:
-                    escritorio_elegido = random.choice(opciones)
+                escritorio_elegido = indice.escritorio_aleatorio(indice.mascara_permitidos.get(e, 0) & ~ocupados_por_dia[d_alt])
+                if escritorio_elegido is not None:
                     asignacion[(e, d_alt)] = escritorio_elegido
-                    escritorios_ocupados.add((d_alt, escritorio_elegido))
+                    ocupados_por_dia[d_alt] |= indice.bit_escritorio[escritorio_elegido]
                     break
+
+
+def _zona_de(indice, desk):
+    """Zona del escritorio según el índice (None si no tiene)."""
+    return indice.zona_de_escritorio[indice.indice_escritorio[desk]]
+
+
+def _dia_reunion(miembros, days, dias_por_empleado):
+    """Día preferido por más miembros del grupo (empates al azar), o None si no hay días."""
+    votos = {d: random.random() for d in days}
+    for m in miembros:
+        for d in dias_por_empleado.get(m, []):
+            if d in votos:
+                votos[d] += 1
+    return max(votos, key=votos.get) if votos else None
+
+
+def crear_individuo_grupal(employees, days, dias_por_empleado, escritorios_por_empleado, indice=None):
+    """
+    Constructor voraz por grupos: para cada grupo (en orden aleatorio) elige como
+    día de reunión el día preferido por más miembros y la zona con más escritorios
+    libres para ellos ese día, y sienta ahí a todo el grupo. Después completa los
+    días preferidos de cada miembro en su mismo escritorio o, si no está libre, en
+    la zona del grupo. Los empleados sin grupo se ubican como en `crear_individuo`.
+    """
+    indice = indice or IndiceInstancia(escritorios_por_empleado)
+    asignacion = {}
+    ocupados_por_dia = defaultdict(int)
+    escritorio_habitual = {}
+
+    def ubicar(e, d, mascara_preferida=0):
+        libres = indice.mascara_permitidos.get(e, 0) & ~ocupados_por_dia[d]
+        desk = escritorio_habitual.get(e)
+        if desk is None or not libres & indice.bit_escritorio[desk]:
+            desk = indice.escritorio_aleatorio(libres & mascara_preferida)
+            if desk is None:
+                desk = indice.escritorio_aleatorio(libres)
+        if desk is not None:
+            asignacion[(e, d)] = desk
+            ocupados_por_dia[d] |= indice.bit_escritorio[desk]
+            escritorio_habitual.setdefault(e, desk)
+
+    grupos = list(indice.miembros_de_grupo.items())
+    random.shuffle(grupos)
+    for _, miembros in grupos:
+        dia_reunion = _dia_reunion(miembros, days, dias_por_empleado)
+        if dia_reunion is None:
+            continue
+
+        libres_dia = ~ocupados_por_dia[dia_reunion]
+        capacidad = {}
+        for zona, mascara in indice.mascara_zona.items():
+            union = 0
+            for m in miembros:
+                union |= indice.mascara_permitidos.get(m, 0) & mascara
+            capacidad[zona] = (union & libres_dia).bit_count() + random.random()
+        mascara_grupo = indice.mascara_zona[max(capacidad, key=capacidad.get)] if capacidad else 0
+
+        # Primero los miembros con menos escritorios posibles en la zona elegida
+        orden = sorted(miembros, key=lambda m: ((indice.mascara_permitidos.get(m, 0) & mascara_grupo & libres_dia).bit_count(), random.random()))
+        for m in orden:
+            ubicar(m, dia_reunion, mascara_grupo)
+        for m in orden:
+            for d in dias_por_empleado.get(m, []):
+                if d != dia_reunion and d in days:
+                    ubicar(m, d, mascara_grupo)
+
+    lista_empleados = list(employees)
+    random.shuffle(lista_empleados)
+    for e in lista_empleados:
+        if e not in indice.grupo_de_empleado:
+            for d in dias_por_empleado.get(e, []):
+                ubicar(e, d)
+    _asignar_sin_dias(asignacion, ocupados_por_dia, lista_empleados, days, dias_por_empleado, indice)
     return asignacion
 
 
-def calcular_fitness(asignacion, datos_completos):
-    """Calcula la aptitud de un individuo (menor penalización es mejor)."""
-    penalizacion = 0
+def crear_individuo_regret(employees, days, dias_por_empleado, escritorios_por_empleado, indice=None):
+    """
+    Constructor voraz por arrepentimiento: busca para cada empleado un único
+    escritorio libre en todos sus días preferidos más el día de reunión de su
+    grupo (el preferido por más miembros). En cada paso atiende al
+    empleado con menos escritorios así disponibles (el que más perdería si se le
+    posterga) y, entre esos escritorios, prefiere las zonas donde ya se sientan
+    compañeros de su grupo. Si no queda ninguno, usa el escritorio que cubre más
+    días preferidos y completa los demás con otros escritorios libres.
+    """
+    indice = indice or IndiceInstancia(escritorios_por_empleado)
+    asignacion = {}
+    ocupados_por_dia = defaultdict(int)
+    zonas_de_grupo = defaultdict(int)  # Grupo -> máscara de las zonas donde ya hay miembros
+    pendientes = list(employees)
+    random.shuffle(pendientes)
+    dias_objetivo = {e: [d for d in dias_por_empleado.get(e, []) if d in days] for e in employees}
+    for miembros in indice.miembros_de_grupo.values():
+        dia_reunion = _dia_reunion(miembros, days, dias_por_empleado)
+        for m in miembros:
+            if dia_reunion is not None and m in dias_objetivo and dia_reunion not in dias_objetivo[m]:
+                dias_objetivo[m].append(dia_reunion)
+
+    def escritorios_comunes(e):
+        mascara = indice.mascara_permitidos.get(e, 0)
+        for d in dias_objetivo[e]:
+            mascara &= ~ocupados_por_dia[d]
+        return mascara
+
+    while pendientes:
+        posicion, e = min(enumerate(pendientes), key=lambda par: escritorios_comunes(par[1]).bit_count())
+        pendientes.pop(posicion)
+        dias_e = dias_objetivo[e]
+        if not dias_e:
+            continue
+        grupo = indice.grupo_de_empleado.get(e)
+        comunes = escritorios_comunes(e)
+        desk = indice.escritorio_aleatorio(comunes & zonas_de_grupo[grupo]) if grupo else None
+        if desk is None:
+            desk = indice.escritorio_aleatorio(comunes)
+        if desk is None:
+            candidatos = indice.escritorios_de(indice.mascara_permitidos.get(e, 0))
+            if not candidatos:
+                continue
+            desk = max(candidatos, key=lambda k: (sum(1 for d in dias_e if not ocupados_por_dia[d] & indice.bit_escritorio[k]), random.random()))
+
+        for d in dias_e:
+            elegido = desk
+            if ocupados_por_dia[d] & indice.bit_escritorio[desk]:
+                libres = indice.mascara_permitidos.get(e, 0) & ~ocupados_por_dia[d]
+                elegido = indice.escritorio_aleatorio(libres & zonas_de_grupo[grupo]) if grupo else None
+                if elegido is None:
+                    elegido = indice.escritorio_aleatorio(libres)
+                if elegido is None:
+                    continue
+            asignacion[(e, d)] = elegido
+            ocupados_por_dia[d] |= indice.bit_escritorio[elegido]
+            zona = _zona_de(indice, elegido)
+            if grupo and zona:
+                zonas_de_grupo[grupo] |= indice.mascara_zona[zona]
+
+    _asignar_sin_dias(asignacion, ocupados_por_dia, list(employees), days, dias_por_empleado, indice)
+    return asignacion
 
-    employees = datos_completos['employees']
-    empleados_por_grupo = datos_completos['empleados_por_grupo']
-    dias_por_empleado = datos_completos['dias_por_empleado']
-    escritorios_por_empleado = datos_completos['escritorios_por_empleado']
-    grupo_por_empleado = datos_completos['grupo_por_empleado']
+
+CONSTRUCTORES_INICIALES = {
+    'aleatorio': crear_individuo,
+    'grupal': crear_individuo_grupal,
+    'regret': crear_individuo_regret,
+}
+
+
+def crear_poblacion_inicial(datos, tamano):
+    """
+    Crea `tamano` individuos: las fracciones PROPORCION_INICIAL_GRUPAL y
+    PROPORCION_INICIAL_REGRET con los constructores voraces y el resto con
+    `crear_individuo`.
+    """
+    cantidades = {
+        'grupal': int(round(tamano * PROPORCION_INICIAL_GRUPAL)),
+        'regret': int(round(tamano * PROPORCION_INICIAL_REGRET)),
+    }
+    if sum(cantidades.values()) > tamano:
+        raise ValueError("PROPORCION_INICIAL_GRUPAL + PROPORCION_INICIAL_REGRET no puede superar 1")
+    cantidades['aleatorio'] = tamano - sum(cantidades.values())
+    poblacion = []
+    for nombre in ('aleatorio', 'grupal', 'regret'):
+        constructor = CONSTRUCTORES_INICIALES[nombre]
+        poblacion += [constructor(datos['employees'], datos['days'], datos['dias_por_empleado'],
+                                  datos['escritorios_por_empleado'], datos['indice'])
+                      for _ in range(cantidades[nombre])]
+    return poblacion
+
+
+def agregar_asignacion(asignacion, datos_completos):
+    """
+    Recorre la asignación una sola vez y acumula los conteos de los que se derivan
+    tanto la penalización (`penalizacion_de_agregados`) como los KPIs
+    (`kpis_de_agregados`): ocupación por (día, escritorio), días y escritorios
+    de cada empleado, empleados por (día, zona, grupo), escritorios ocupados por
+    día, asignaciones fuera de los escritorios permitidos y, en una
+    replanificación, asignaciones del plan anterior que cambiaron.
+    """
+    indice = datos_completos.get('indice')
+    if indice is not None:
+        permitidos = indice.permitidos
+    else:
+        permitidos = {e: frozenset(lista) for e, lista in datos_completos['escritorios_por_empleado'].items()}
     zona_por_escritorio = datos_completos['zona_por_escritorio']
+    grupo_por_empleado = datos_completos['grupo_por_empleado']
 
-    ocupacion = defaultdict(list)
-    zonas_dia = defaultdict(lambda: defaultdict(list))
+    ocupacion = defaultdict(int)
     dias_asignados = defaultdict(set)
+    escritorios_usados = defaultdict(set)
+    grupos_zona_dia = defaultdict(int)
+    escritorios_ocupados_por_dia = defaultdict(set)
+    fuera_de_permitidos = 0
+    plan_anterior = datos_completos.get('plan_anterior') or {}
+    conservadas = 0
+    vacio = frozenset()
 
     for (e, d), desk in asignacion.items():
-        ocupacion[(d, desk)].append(e)
+        ocupacion[(d, desk)] += 1
+        dias_asignados[e].add(d)
+        escritorios_usados[e].add(desk)
+        escritorios_ocupados_por_dia[d].add(desk)
+        if desk not in permitidos.get(e, vacio):
+            fuera_de_permitidos += 1
+        if plan_anterior and plan_anterior.get((e, d)) == desk:
+            conservadas += 1
         zona = zona_por_escritorio.get(desk)
         if zona:
-            zonas_dia[d][zona].append(e)
-        dias_asignados[e].add(d)
+            grupo = grupo_por_empleado.get(e)
+            if grupo:
+                grupos_zona_dia[(d, zona, grupo)] += 1
 
-    for empleados_conflicto in ocupacion.values():
-        if len(empleados_conflicto) > 1: penalizacion += 10000 * (len(empleados_conflicto) - 1)
-    for (e, d), desk in asignacion.items():
-        if desk not in escritorios_por_empleado.get(e, []): penalizacion += 10000
-    for e in employees:
-        if e not in dias_asignados: penalizacion += 5000
-    for grupo, miembros in empleados_por_grupo.items():
+    # Mejor día de reunión (el de más miembros presentes) de cada grupo
+    reuniones = {}
+    for grupo, miembros in datos_completos['empleados_por_grupo'].items():
         dias_reunion = defaultdict(int)
-        for miembro in miembros:
-            for dia in dias_asignados.get(miembro, []): dias_reunion[dia] += 1
-        max_reunidos = max(dias_reunion.values()) if dias_reunion else 0
-        if max_reunidos < len(miembros): penalizacion += 10000 * (len(miembros) - max_reunidos)
-    for d, zonas in zonas_dia.items():
-        for z, empleados_en_zona in zonas.items():
-            grupos_presentes = defaultdict(int)
-            for e in empleados_en_zona:
-                grupo_e = grupo_por_empleado.get(e)
-                if grupo_e: grupos_presentes[grupo_e] += 1
-            for count in grupos_presentes.values():
-                if count == 1: penalizacion += 500
-    for e in employees:
-        dias_preferidos_e = set(dias_por_empleado.get(e, []))
-        dias_asignados_e = dias_asignados.get(e, set())
-        dias_no_cubiertos = dias_preferidos_e - dias_asignados_e
-        penalizacion += 200 * len(dias_no_cubiertos)
-        dias_no_preferidos_asignados = dias_asignados_e - dias_preferidos_e
-        penalizacion += 100 * len(dias_no_preferidos_asignados)
-    for e in employees:
-        escritorios_usados = {desk for (emp, _), desk in asignacion.items() if emp == e}
-        if len(escritorios_usados) > 1: penalizacion += 50 * (len(escritorios_usados) - 1)
-    return penalizacion
-
-def reparar_individuo(individuo, escritorios_por_empleado):
-    """Repara conflictos de asignación en un individuo."""
-    ocupacion = defaultdict(list)
-    for (e, d), desk in individuo.items():
-        ocupacion[(d, desk)].append(e)
-    for (d, desk), empleados_conflicto in ocupacion.items():
-        if len(empleados_conflicto) > 1:
-            for e_reasignar in empleados_conflicto[1:]:
-                del individuo[(e_reasignar, d)]
-                escritorios_ocupados_dia = {v for (k_e, k_d), v in individuo.items() if k_d == d}
-                opciones = [esc for esc in escritorios_por_empleado.get(e_reasignar, []) if esc not in escritorios_ocupados_dia]
-                if opciones:
-                    individuo[(e_reasignar, d)] = random.choice(opciones)
-    return individuo
+        for m in miembros:
+            for d in dias_asignados.get(m, ()):
+                dias_reunion[d] += 1
+        mejor_dia = max(dias_reunion, key=dias_reunion.get) if dias_reunion else None
+        reuniones[grupo] = (mejor_dia, dias_reunion[mejor_dia] if mejor_dia is not None else 0)
+
+    return {
+        'total_asignaciones': len(asignacion),
+        'ocupacion': ocupacion,
+        'dias_asignados': dias_asignados,
+        'escritorios_usados': escritorios_usados,
+        'grupos_zona_dia': grupos_zona_dia,
+        'escritorios_ocupados_por_dia': escritorios_ocupados_por_dia,
+        'fuera_de_permitidos': fuera_de_permitidos,
+        'reuniones': reuniones,
+        'cambios_plan_anterior': len(plan_anterior) - conservadas,
+    }
 
-def cruzar(padre1, padre2, escritorios_por_empleado):
-    """Realiza cruce uniforme y repara al hijo resultante."""
-    hijo = {}
-    claves_padre1 = set(padre1.keys())
-    claves_padre2 = set(padre2.keys())
-    for clave in claves_padre1:
-        if random.random() < 0.5: hijo[clave] = padre1[clave]
-    for clave in claves_padre2:
-        if random.random() < 0.5: hijo[clave] = padre2[clave]
-    return reparar_individuo(hijo, escritorios_por_empleado)
-
-def mutar(individuo, employees, days, escritorios_por_empleado):
-    """Aplica mutaciones a un individuo para introducir diversidad."""
-    mutado = copy.deepcopy(individuo)
-    if not mutado: return reparar_individuo(mutado, escritorios_por_empleado)
-    claves_a_mutar = list(mutado.keys())
-    for (e, d) in claves_a_mutar:
-        if (e, d) not in mutado: continue
-        if random.random() < TASA_MUTACION:
-            tipo_mutacion = random.random()
-            if tipo_mutacion < TASA_MUTACION_ESCRITORIO_REL:
-                escritorios_ocupados_dia = {v for (k_e, k_d), v in mutado.items() if k_d == d and k_e != e}
-                opciones = [esc for esc in escritorios_por_empleado.get(e, []) if esc not in escritorios_ocupados_dia]
-                if opciones: mutado[(e, d)] = random.choice(opciones)
-            elif tipo_mutacion < TASA_MUTACION_ESCRITORIO_REL + TASA_MUTACION_DIA_REL:
-                escritorio_actual = mutado.pop((e, d))
-                dias_posibles = [day for day in days if day != d]
-                random.shuffle(dias_posibles)
-                reasignado = False
-                for nuevo_d in dias_posibles:
-                    escritorios_ocupados_nuevo_dia = {v for (k_e, k_d), v in mutado.items() if k_d == nuevo_d}
-                    if escritorio_actual not in escritorios_ocupados_nuevo_dia:
-                        mutado[(e, nuevo_d)] = escritorio_actual
-                        reasignado = True
-                        break
-                if not reasignado: mutado[(e, d)] = escritorio_actual
-            else:
-                del mutado[(e, d)]
-    if random.random() < TASA_MUTACION_ADICION:
-        e_candidato = random.choice(list(employees))
-        dias_asignados_e = {k_d for (k_e, k_d) in mutado.keys() if k_e == e_candidato}
-        dias_disponibles_e = [day for day in days if day not in dias_asignados_e]
-        if dias_disponibles_e:
-            d_nuevo = random.choice(dias_disponibles_e)
-            escritorios_ocupados_dia = {v for (k_e, k_d), v in mutado.items() if k_d == d_nuevo}
-            opciones = [esc for esc in escritorios_por_empleado.get(e_candidato, []) if esc not in escritorios_ocupados_dia]
-            if opciones: mutado[(e_candidato, d_nuevo)] = random.choice(opciones)
-    return reparar_individuo(mutado, escritorios_por_empleado)
 
-def seleccionar_padre_por_torneo(poblacion_con_puntuaciones):
-    """Selecciona un padre mediante el método de torneo."""
-    participantes = random.sample(poblacion_con_puntuaciones, TOURNAMENT_SIZE)
-    ganador = min(participantes, key=lambda x: x[1])
-    return ganador[0]
+# Componentes de la penalización (en este orden) que optimiza por separado el modo multiobjetivo
+OBJETIVOS = ('restricciones', 'dias_preferidos', 'reuniones', 'aislamiento', 'escritorio')
 
-# ==============================================================================
-# FUNCIONES DE REPORTE Y ANÁLISIS 
-# ==============================================================================
 
-def reportar_resultados(mejor_asignacion, datos_completos):
+def objetivos_de_agregados(agregados, datos_completos):
     """
-    Calcula los KPIs de la mejor solución encontrada y los retorna.
+    Penalización de una asignación separada en los componentes de OBJETIVOS:
+    restricciones duras (sobre-asignación, escritorios no permitidos y empleados
+    sin asignación), días preferidos, reuniones de grupo, aislamiento y
+    escritorio (escritorio único y, en una replanificación, cambios respecto al
+    plan anterior). Su suma es `penalizacion_de_agregados`.
     """
+    restricciones = 0
+    for n in agregados['ocupacion'].values():
+        if n > 1: restricciones += 10000 * (n - 1)
+    restricciones += 10000 * agregados['fuera_de_permitidos']
+
+    reuniones = 0
+    for grupo, miembros in datos_completos['empleados_por_grupo'].items():
+        reuniones += _penalizacion_grupo(len(miembros), agregados['reuniones'][grupo][1])
+    aislamiento = 500 * sum(1 for n in agregados['grupos_zona_dia'].values() if n == 1)
+    escritorio = datos_completos.get('penalizacion_cambio', 0) * agregados['cambios_plan_anterior']
+
+    dias_preferidos = 0
+    vacio = frozenset()
+    dias_asignados = agregados['dias_asignados']
+    dias_por_empleado = datos_completos['dias_por_empleado']
+    for e in datos_completos['employees']:
+        dias_asignados_e = dias_asignados.get(e, vacio)
+        if not dias_asignados_e: restricciones += 5000
+        dias_preferidos_e = set(dias_por_empleado.get(e, []))
+        dias_preferidos += 200 * len(dias_preferidos_e - dias_asignados_e)
+        dias_preferidos += 100 * len(dias_asignados_e - dias_preferidos_e)
+        escritorios_usados_e = agregados['escritorios_usados'].get(e, vacio)
+        if len(escritorios_usados_e) > 1: escritorio += 50 * (len(escritorios_usados_e) - 1)
+    return {'restricciones': restricciones, 'dias_preferidos': dias_preferidos, 'reuniones': reuniones,
+            'aislamiento': aislamiento, 'escritorio': escritorio}
+
+
+def penalizacion_de_agregados(agregados, datos_completos):
+    """Penalización de una asignación a partir de sus conteos (`agregar_asignacion`)."""
+    return sum(objetivos_de_agregados(agregados, datos_completos).values())
+
+
+def kpis_de_agregados(agregados, datos_completos):
+    """KPIs de una asignación (ver `reportar_resultados`) a partir de sus conteos (`agregar_asignacion`)."""
     employees = datos_completos['employees']
     desks = datos_completos['desks']
     days = datos_completos['days']
-    escritorios_por_empleado = datos_completos['escritorios_por_empleado']
     dias_por_empleado = datos_completos['dias_por_empleado']
     empleados_por_grupo = datos_completos['empleados_por_grupo']
-    grupo_por_empleado = datos_completos['grupo_por_empleado']
-    zona_por_escritorio = datos_completos['zona_por_escritorio']
-
-    ocupacion = defaultdict(list)
-    zonas_dia = defaultdict(lambda: defaultdict(list))
-    dias_asignados = defaultdict(set)
-    escritorios_ocupados_por_dia = defaultdict(set)
-
-    for (e, d), desk in mejor_asignacion.items():
-        ocupacion[(d, desk)].append(e)
-        zona = zona_por_escritorio.get(desk)
-        if zona:
-            zonas_dia[d][zona].append(e)
-        dias_asignados[e].add(d)
-        escritorios_ocupados_por_dia[d].add(desk)
+    dias_asignados = agregados['dias_asignados']
+    total_asignaciones = agregados['total_asignaciones']
+    vacio = frozenset()
 
     kpis = {}
 
@@ -225,32 +404,24 @@ def reportar_resultados(mejor_asignacion, datos_completos):
     empleados_asignados = len(dias_asignados)
     kpis['empleados_con_asignacion_pct'] = (empleados_asignados / total_empleados) * 100 if total_empleados > 0 else 0
 
-    conflictos = sum(1 for v in ocupacion.values() if len(v) > 1)
+    conflictos = sum(1 for n in agregados['ocupacion'].values() if n > 1)
     kpis['escritorios_con_sobre_asignacion'] = conflictos
 
-    asignaciones_permitidas = sum(1 for (e, day_assigned), desk_assigned in mejor_asignacion.items() if desk_assigned in escritorios_por_empleado.get(e, []))
-    kpis['asignaciones_en_escritorios_permitidos_pct'] = (asignaciones_permitidas / len(mejor_asignacion)) * 100 if len(mejor_asignacion) > 0 else 0
+    asignaciones_permitidas = total_asignaciones - agregados['fuera_de_permitidos']
+    kpis['asignaciones_en_escritorios_permitidos_pct'] = (asignaciones_permitidas / total_asignaciones) * 100 if total_asignaciones > 0 else 0
 
     # --- KPIs de Restricciones Suaves ---
-    cumplimiento_dias_pref = sum(len(dias_asignados.get(e, set()) & set(dias_por_empleado.get(e, []))) / len(dias_por_empleado.get(e, [])) for e in employees if dias_por_empleado.get(e))
+    cumplimiento_dias_pref = sum(len(dias_asignados.get(e, vacio) & set(dias_por_empleado.get(e, []))) / len(dias_por_empleado.get(e, [])) for e in employees if dias_por_empleado.get(e))
     kpis['cumplimiento_promedio_dias_preferidos_pct'] = (cumplimiento_dias_pref / len(employees)) * 100 if len(employees) > 0 else 0
 
-    dias_no_pref = sum(len(dias_asignados.get(e, set()) - set(dias_por_empleado.get(e, []))) for e in employees)
+    dias_no_pref = sum(len(dias_asignados.get(e, vacio) - set(dias_por_empleado.get(e, []))) for e in employees)
     kpis['promedio_dias_asignados_no_preferidos'] = dias_no_pref / total_empleados if total_empleados > 0 else 0
 
-    escritorio_unico = sum(1 for e in employees if len({desk for (emp, _), desk in mejor_asignacion.items() if emp == e}) == 1)
+    escritorio_unico = sum(1 for e in employees if len(agregados['escritorios_usados'].get(e, vacio)) == 1)
     kpis['empleados_con_escritorio_unico_pct'] = (escritorio_unico / total_empleados) * 100 if total_empleados > 0 else 0
 
     # --- KPIs de Colaboración ---
-    total_asignaciones = len(mejor_asignacion)
-    instancias_aislamiento = 0
-    for d_zonas in zonas_dia.values():
-        for z_empleados in d_zonas.values():
-            grupos_presentes = defaultdict(int)
-            for e in z_empleados:
-                if grupo_por_empleado.get(e): grupos_presentes[grupo_por_empleado.get(e)] += 1
-            instancias_aislamiento += sum(count for count in grupos_presentes.values() if count == 1)
-
+    instancias_aislamiento = sum(1 for n in agregados['grupos_zona_dia'].values() if n == 1)
     kpis['porcentaje_asignaciones_aisladas'] = (instancias_aislamiento / total_asignaciones) * 100 if total_asignaciones > 0 else 0
 
     kpis['detalle_reuniones_grupo'] = []
@@ -260,17 +431,7 @@ def reportar_resultados(mejor_asignacion, datos_completos):
             kpis['detalle_reuniones_grupo'].append(f"Grupo '{grupo}': No tiene miembros asignados.")
             continue
 
-        dias_reunion = defaultdict(int)
-        for m in miembros:
-            for d in dias_asignados.get(m, []):
-                dias_reunion[d] += 1
-
-        mejor_dia_reunion = None
-        max_miembros_presentes = 0
-
-        if dias_reunion:
-            mejor_dia_reunion = max(dias_reunion, key=dias_reunion.get)
-            max_miembros_presentes = dias_reunion[mejor_dia_reunion]
+        mejor_dia_reunion, max_miembros_presentes = agregados['reuniones'][grupo]
 
         if max_miembros_presentes == len(miembros):
             grupos_con_reunion_completa += 1
@@ -283,6 +444,11 @@ def reportar_resultados(mejor_asignacion, datos_completos):
 
     kpis['grupos_con_reunion_completa_pct'] = (grupos_con_reunion_completa / len(empleados_por_grupo)) * 100 if empleados_por_grupo else 0
 
+    # --- Replanificación: asignaciones del plan anterior que se mantienen ---
+    plan_anterior = datos_completos.get('plan_anterior')
+    if plan_anterior:
+        kpis['asignaciones_conservadas_pct'] = (1 - agregados['cambios_plan_anterior'] / len(plan_anterior)) * 100
+
     # --- KPIs de Eficiencia ---
     total_desks = len(desks)
     total_days = len(days)
@@ -291,7 +457,7 @@ def reportar_resultados(mejor_asignacion, datos_completos):
     total_ocupados_acumulado = 0
     if total_desks > 0 and total_days > 0:
         for d in days:
-            occupied_desks_today = len(escritorios_ocupados_por_dia[d])
+            occupied_desks_today = len(agregados['escritorios_ocupados_por_dia'].get(d, vacio))
             total_ocupados_acumulado += occupied_desks_today
             daily_capacity_percentage = (occupied_desks_today / total_desks) * 100
             kpis['capacidad_utilizada_por_dia'][d] = {
@@ -300,40 +466,1294 @@ def reportar_resultados(mejor_asignacion, datos_completos):
                 'porcentaje': daily_capacity_percentage
             }
 
-        kpis['porcentaje_capacidad_utilizada_global'] = (total_ocupados_acumulado / (total_desks * total_days)) * 100
-    else:
-        kpis['porcentaje_capacidad_utilizada_global'] = 0
+        kpis['porcentaje_capacidad_utilizada_global'] = (total_ocupados_acumulado / (total_desks * total_days)) * 100
+    else:
+        kpis['porcentaje_capacidad_utilizada_global'] = 0
+
+    return kpis
+
+
+def calcular_fitness(asignacion, datos_completos):
+    """Calcula la aptitud de un individuo (menor penalización es mejor)."""
+    return penalizacion_de_agregados(agregar_asignacion(asignacion, datos_completos), datos_completos)
+
+
+def _penalizacion_grupo(num_miembros, max_reunidos):
+    """Penalización de reunión de un grupo dado su máximo de miembros reunidos en un día."""
+    return 10000 * (num_miembros - max_reunidos) if max_reunidos < num_miembros else 0
+
+
+class IndiceInstancia:
+    """
+    Índice compilado de la instancia para los operadores genéticos.
+
+    Cada escritorio es un bit (en el orden de `codificar_instancia`), de modo que
+    los escritorios permitidos de un empleado y los ocupados en un día son
+    máscaras enteras y "escritorios permitidos y libres" es un AND de bits.
+    Además guarda conjuntos de escritorios y días preferidos por empleado, la
+    zona de cada escritorio, los miembros de cada grupo y los días de la instancia.
+    """
+
+    def __init__(self, escritorios_por_empleado, escritorios=None, zona_por_escritorio=None,
+                 empleados_por_grupo=None, dias_por_empleado=None, dias=None):
+        self.dias = tuple(dias or ())
+        if escritorios is None:
+            escritorios = sorted({desk for lista in escritorios_por_empleado.values() for desk in lista})
+        self.escritorios = list(escritorios)
+        self.indice_escritorio = {desk: i for i, desk in enumerate(self.escritorios)}
+        self.bit_escritorio = {desk: 1 << i for i, desk in enumerate(self.escritorios)}
+
+        self.permitidos = {e: frozenset(lista) for e, lista in escritorios_por_empleado.items()}
+        self.mascara_permitidos = {
+            e: sum(self.bit_escritorio[desk] for desk in permitidos_e if desk in self.bit_escritorio)
+            for e, permitidos_e in self.permitidos.items()
+        }
+        self.dias_preferidos = {e: frozenset(lista) for e, lista in (dias_por_empleado or {}).items()}
+
+        zona_por_escritorio = zona_por_escritorio or {}
+        self.zona_de_escritorio = [zona_por_escritorio.get(desk) for desk in self.escritorios]
+        self.mascara_zona = defaultdict(int)
+        for desk, zona in zona_por_escritorio.items():
+            if zona and desk in self.bit_escritorio:
+                self.mascara_zona[zona] |= self.bit_escritorio[desk]
+        self.mascara_zona = dict(self.mascara_zona)
+
+        self.miembros_de_grupo = {g: tuple(miembros) for g, miembros in (empleados_por_grupo or {}).items()}
+        self.grupo_de_empleado = {e: g for g, miembros in self.miembros_de_grupo.items() for e in miembros}
+
+        # Valores de Zobrist por (empleado, día, escritorio), generados al usarse por primera vez
+        # con un generador propio para no alterar la secuencia de `random`
+        self.valores_zobrist = {}
+        self._aleatorio_zobrist = random.Random(0)
+
+    def zobrist(self, e, d, desk):
+        """Valor aleatorio de 64 bits, fijo dentro del proceso, de la asignación (e, d) -> desk."""
+        clave = (e, d, desk)
+        valor = self.valores_zobrist.get(clave)
+        if valor is None:
+            valor = self.valores_zobrist[clave] = self._aleatorio_zobrist.getrandbits(64)
+        return valor
+
+    def escritorios_de(self, mascara):
+        """Lista los escritorios cuyos bits están activos en la máscara."""
+        escritorios = []
+        while mascara:
+            bit = mascara & -mascara
+            escritorios.append(self.escritorios[bit.bit_length() - 1])
+            mascara ^= bit
+        return escritorios
+
+    def escritorio_aleatorio(self, mascara):
+        """Elige al azar uno de los escritorios de la máscara, o None si está vacía."""
+        disponibles = mascara.bit_count()
+        if not disponibles:
+            return None
+        for _ in range(random.randrange(disponibles)):
+            mascara &= mascara - 1
+        return self.escritorios[(mascara & -mascara).bit_length() - 1]
+
+
+class AsignacionIndexada(dict):
+    """
+    Individuo (empleado, día) -> escritorio que mantiene al día, en cada
+    asignación o eliminación, la ocupación de cada escritorio, la máscara de
+    escritorios ocupados por día, el número de días de cada empleado, el número
+    de conflictos, los empleados que sobran en cada escritorio con conflicto
+    (`conflictos`, para repararlos sin recorrer todo el individuo) y su clave de
+    Zobrist (XOR de los valores de sus asignaciones: dos genomas iguales tienen
+    la misma clave). Los operadores lo usan como un diccionario normal.
+
+    Todo el estado vive en diccionarios planos de claves y valores inmutables, de
+    modo que `copy()` es un puñado de copias superficiales.
+    """
+
+    _SIN_VALOR = object()
+
+    def __init__(self, asignacion=None, indice=None):
+        super().__init__()
+        self.indice = indice
+        self.ocupacion = {}
+        self.mascara_ocupados = {}
+        self.num_dias = {}
+        self.num_conflictos = 0
+        self.conflictos = {}  # (día, escritorio) -> tupla de empleados además del primero
+        self.clave_zobrist = 0
+        if asignacion:
+            dict.update(self, asignacion)
+        self._reconstruir()
+
+    def _reconstruir(self):
+        """Recalcula todos los conteos en una sola pasada."""
+        # Equivale a llamar a AsignacionIndexada._agregar por cada asignación, con
+        # las búsquedas de atributos fuera del bucle (es el camino caliente del cruce)
+        ocupacion, mascara_ocupados, num_dias = self.ocupacion, self.mascara_ocupados, self.num_dias
+        bit_escritorio, valores_zobrist, zobrist = self.indice.bit_escritorio, self.indice.valores_zobrist, self.indice.zobrist
+        sobrantes = self.conflictos
+        conflictos = 0
+        clave_zobrist = 0
+        for (e, d), desk in self.items():
+            clave_ocupacion = (d, desk)
+            ocupantes = ocupacion.get(clave_ocupacion, 0)
+            if ocupantes:
+                conflictos += 1
+                sobrantes[clave_ocupacion] = sobrantes.get(clave_ocupacion, ()) + (e,)
+            else:
+                mascara_ocupados[d] = mascara_ocupados.get(d, 0) | bit_escritorio.get(desk, 0)
+            ocupacion[clave_ocupacion] = ocupantes + 1
+            num_dias[e] = num_dias.get(e, 0) + 1
+            valor = valores_zobrist.get((e, d, desk))
+            clave_zobrist ^= valor if valor is not None else zobrist(e, d, desk)
+        self.num_conflictos += conflictos
+        self.clave_zobrist ^= clave_zobrist
+
+    def nueva(self, asignacion=None):
+        """Crea un individuo del mismo tipo, sobre la misma instancia, con otra asignación."""
+        return AsignacionIndexada(asignacion, self.indice)
+
+    def libres(self, e, d):
+        """Máscara de escritorios permitidos para e que nadie ocupa el día d."""
+        return self.indice.mascara_permitidos.get(e, 0) & ~self.mascara_ocupados.get(d, 0)
+
+    # --- Actualización de conteos ---
+
+    def _agregar(self, e, d, desk):
+        clave_ocupacion = (d, desk)
+        ocupantes = self.ocupacion.get(clave_ocupacion, 0)
+        if ocupantes:
+            self.num_conflictos += 1
+            self.conflictos[clave_ocupacion] = self.conflictos.get(clave_ocupacion, ()) + (e,)
+        else:
+            self.mascara_ocupados[d] = self.mascara_ocupados.get(d, 0) | self.indice.bit_escritorio.get(desk, 0)
+        self.ocupacion[clave_ocupacion] = ocupantes + 1
+        self.num_dias[e] = self.num_dias.get(e, 0) + 1
+        self.clave_zobrist ^= self.indice.zobrist(e, d, desk)
+
+    def _retirar(self, e, d, desk):
+        clave_ocupacion = (d, desk)
+        ocupantes = self.ocupacion[clave_ocupacion]
+        if ocupantes > 1:
+            self.num_conflictos -= 1
+            self.ocupacion[clave_ocupacion] = ocupantes - 1
+            # Si sale el primer ocupante, el primero de los sobrantes pasa a serlo
+            sobrantes = self.conflictos[clave_ocupacion]
+            sobrantes = tuple(x for x in sobrantes if x != e) if e in sobrantes else sobrantes[1:]
+            if sobrantes: self.conflictos[clave_ocupacion] = sobrantes
+            else: del self.conflictos[clave_ocupacion]
+        else:
+            del self.ocupacion[clave_ocupacion]
+            self.mascara_ocupados[d] &= ~self.indice.bit_escritorio.get(desk, 0)
+        dias_e = self.num_dias[e]
+        if dias_e > 1: self.num_dias[e] = dias_e - 1
+        else: del self.num_dias[e]
+        self.clave_zobrist ^= self.indice.zobrist(e, d, desk)
+
+    # --- Interfaz de diccionario ---
+
+    def __setitem__(self, clave, desk):
+        if clave in self:
+            self._retirar(clave[0], clave[1], dict.__getitem__(self, clave))
+        dict.__setitem__(self, clave, desk)
+        self._agregar(clave[0], clave[1], desk)
+
+    def __delitem__(self, clave):
+        desk = dict.pop(self, clave)
+        self._retirar(clave[0], clave[1], desk)
+
+    def pop(self, clave, por_defecto=_SIN_VALOR):
+        if clave not in self:
+            if por_defecto is AsignacionIndexada._SIN_VALOR: raise KeyError(clave)
+            return por_defecto
+        desk = dict.pop(self, clave)
+        self._retirar(clave[0], clave[1], desk)
+        return desk
+
+    def popitem(self):
+        clave, desk = dict.popitem(self)
+        self._retirar(clave[0], clave[1], desk)
+        return clave, desk
+
+    def setdefault(self, clave, por_defecto=None):
+        if clave not in self:
+            self[clave] = por_defecto
+        return dict.__getitem__(self, clave)
+
+    def update(self, *args, **kwargs):
+        for clave, desk in dict(*args, **kwargs).items():
+            self[clave] = desk
+
+    def __ior__(self, otro):
+        self.update(otro)
+        return self
+
+    def clear(self):
+        for clave in list(self.keys()):
+            del self[clave]
+
+    def copy(self):
+        nueva = self.__class__.__new__(self.__class__)
+        dict.update(nueva, self)
+        self._copiar_estado(nueva)
+        return nueva
+
+    def _copiar_estado(self, nueva):
+        nueva.indice = self.indice
+        nueva.ocupacion = self.ocupacion.copy()
+        nueva.mascara_ocupados = self.mascara_ocupados.copy()
+        nueva.num_dias = self.num_dias.copy()
+        nueva.num_conflictos = self.num_conflictos
+        nueva.conflictos = self.conflictos.copy()
+        nueva.clave_zobrist = self.clave_zobrist
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        # Las claves y los valores son inmutables: la copia superficial ya es independiente.
+        return self.copy()
+
+    def __reduce__(self):
+        # Entre procesos viaja sólo el genoma; los conteos se reconstruyen donde haga falta.
+        return (dict, (dict(self),))
+
+
+class AsignacionIncremental(AsignacionIndexada):
+    """
+    Individuo (empleado, día) -> escritorio que mantiene su penalización al día.
+
+    Además de los conteos de `AsignacionIndexada`, cada asignación o eliminación
+    actualiza los grupos por zona/día, los histogramas de días por grupo y los
+    escritorios por empleado, de modo que `penalizacion` coincide con
+    `calcular_fitness` sin recalcular desde cero.
+    """
+
+    def __init__(self, asignacion=None, datos_completos=None):
+        self.datos = datos_completos
+        self.grupos_zona_dia = {}
+        self.dias_grupo = {}
+        self.max_por_grupo = {g: 0 for g in datos_completos['empleados_por_grupo']}
+        self.usos_escritorio = {}
+        self.num_escritorios = {}
+        self.penalizacion = 0
+        super().__init__(asignacion, datos_completos['indice'])
+
+    def _reconstruir(self):
+        """Recalcula todos los conteos y la penalización en una sola pasada."""
+        super()._reconstruir()
+        datos = self.datos
+        empleados = datos['conjunto_empleados']
+        permitidos = datos['escritorios_permitidos']
+        dias_preferidos = datos['dias_preferidos']
+        zona_por_escritorio = datos['zona_por_escritorio']
+        grupo_por_empleado = datos['grupo_por_empleado']
+        grupos_de_empleado = datos['grupos_de_empleado']
+        plan_anterior = datos.get('plan_anterior')
+        penalizacion_cambio = datos.get('penalizacion_cambio', 0) if plan_anterior else 0
+        penalizacion = penalizacion_cambio * len(plan_anterior) if penalizacion_cambio else 0
+
+        for (e, d), desk in self.items():
+            if desk not in permitidos.get(e, ()): penalizacion += 10000
+            if penalizacion_cambio and plan_anterior.get((e, d)) == desk: penalizacion -= penalizacion_cambio
+            if e in empleados:
+                penalizacion += -200 if d in dias_preferidos.get(e, ()) else 100
+                clave_uso = (e, desk)
+                if clave_uso not in self.usos_escritorio:
+                    self.num_escritorios[e] = self.num_escritorios.get(e, 0) + 1
+                self.usos_escritorio[clave_uso] = self.usos_escritorio.get(clave_uso, 0) + 1
+            for g in grupos_de_empleado.get(e, ()):
+                self.dias_grupo[(g, d)] = self.dias_grupo.get((g, d), 0) + 1
+            zona = zona_por_escritorio.get(desk)
+            grupo_e = grupo_por_empleado.get(e)
+            if zona and grupo_e:
+                clave_zona = (d, zona, grupo_e)
+                self.grupos_zona_dia[clave_zona] = self.grupos_zona_dia.get(clave_zona, 0) + 1
+
+        penalizacion += 10000 * self.num_conflictos
+        penalizacion += 500 * sum(1 for c in self.grupos_zona_dia.values() if c == 1)
+        penalizacion += sum(50 * (n - 1) for n in self.num_escritorios.values())
+
+        for grupo, miembros in datos['empleados_por_grupo'].items():
+            self.max_por_grupo[grupo] = self._max_dias_grupo(grupo)
+            penalizacion += _penalizacion_grupo(len(miembros), self.max_por_grupo[grupo])
+
+        for e in datos['employees']:
+            preferidos_e = dias_preferidos.get(e, ())
+            penalizacion += 200 * len(preferidos_e)
+            if e not in self.num_dias: penalizacion += 5000
+
+        self.penalizacion = penalizacion
+
+    def _max_dias_grupo(self, grupo):
+        """Máximo de miembros del grupo que coinciden en un mismo día (también fuera del calendario, como `agregar_asignacion`)."""
+        return max((self.dias_grupo.get((grupo, d), 0) for d in self.datos['dias_evaluacion']), default=0)
+
+    def nueva(self, asignacion=None):
+        return AsignacionIncremental(asignacion, self.datos)
+
+    # --- Actualización de conteos ---
+
+    def _agregar(self, e, d, desk):
+        datos = self.datos
+        delta = 10000 if self.ocupacion.get((d, desk)) else 0
+        primer_dia = e not in self.num_dias
+        super()._agregar(e, d, desk)
+
+        if desk not in datos['escritorios_permitidos'].get(e, ()): delta += 10000
+        if datos['penalizacion_cambio'] and datos['plan_anterior'].get((e, d)) == desk: delta -= datos['penalizacion_cambio']
+
+        es_empleado = e in datos['conjunto_empleados']
+        if es_empleado:
+            if primer_dia: delta -= 5000
+            delta += -200 if d in datos['dias_preferidos'].get(e, ()) else 100
+
+        for g in datos['grupos_de_empleado'].get(e, ()):
+            coinciden = self.dias_grupo.get((g, d), 0) + 1
+            self.dias_grupo[(g, d)] = coinciden
+            max_anterior = self.max_por_grupo[g]
+            if coinciden > max_anterior:
+                num_miembros = len(datos['empleados_por_grupo'][g])
+                self.max_por_grupo[g] = coinciden
+                delta += _penalizacion_grupo(num_miembros, coinciden) - _penalizacion_grupo(num_miembros, max_anterior)
+
+        zona = datos['zona_por_escritorio'].get(desk)
+        grupo_e = datos['grupo_por_empleado'].get(e)
+        if zona and grupo_e:
+            clave_zona = (d, zona, grupo_e)
+            presentes = self.grupos_zona_dia.get(clave_zona, 0)
+            if presentes == 0: delta += 500
+            elif presentes == 1: delta -= 500
+            self.grupos_zona_dia[clave_zona] = presentes + 1
+
+        if es_empleado:
+            clave_uso = (e, desk)
+            veces = self.usos_escritorio.get(clave_uso, 0)
+            if veces == 0:
+                distintos = self.num_escritorios.get(e, 0)
+                if distintos: delta += 50
+                self.num_escritorios[e] = distintos + 1
+            self.usos_escritorio[clave_uso] = veces + 1
+
+        self.penalizacion += delta
+
+    def _retirar(self, e, d, desk):
+        datos = self.datos
+        delta = -10000 if self.ocupacion[(d, desk)] > 1 else 0
+        super()._retirar(e, d, desk)
+
+        if desk not in datos['escritorios_permitidos'].get(e, ()): delta -= 10000
+        if datos['penalizacion_cambio'] and datos['plan_anterior'].get((e, d)) == desk: delta += datos['penalizacion_cambio']
+
+        es_empleado = e in datos['conjunto_empleados']
+        if es_empleado:
+            if e not in self.num_dias: delta += 5000
+            delta += 200 if d in datos['dias_preferidos'].get(e, ()) else -100
+
+        for g in datos['grupos_de_empleado'].get(e, ()):
+            anterior = self.dias_grupo[(g, d)]
+            if anterior > 1: self.dias_grupo[(g, d)] = anterior - 1
+            else: del self.dias_grupo[(g, d)]
+            max_anterior = self.max_por_grupo[g]
+            if anterior == max_anterior:
+                nuevo_max = self._max_dias_grupo(g)
+                num_miembros = len(datos['empleados_por_grupo'][g])
+                self.max_por_grupo[g] = nuevo_max
+                delta += _penalizacion_grupo(num_miembros, nuevo_max) - _penalizacion_grupo(num_miembros, max_anterior)
+
+        zona = datos['zona_por_escritorio'].get(desk)
+        grupo_e = datos['grupo_por_empleado'].get(e)
+        if zona and grupo_e:
+            clave_zona = (d, zona, grupo_e)
+            presentes = self.grupos_zona_dia[clave_zona]
+            if presentes == 1:
+                delta -= 500
+                del self.grupos_zona_dia[clave_zona]
+            else:
+                if presentes == 2: delta += 500
+                self.grupos_zona_dia[clave_zona] = presentes - 1
+
+        if es_empleado:
+            clave_uso = (e, desk)
+            veces = self.usos_escritorio[clave_uso]
+            if veces > 1:
+                self.usos_escritorio[clave_uso] = veces - 1
+            else:
+                del self.usos_escritorio[clave_uso]
+                distintos = self.num_escritorios[e] - 1
+                if distintos:
+                    delta -= 50
+                    self.num_escritorios[e] = distintos
+                else:
+                    del self.num_escritorios[e]
+
+        self.penalizacion += delta
+
+    def _copiar_estado(self, nueva):
+        super()._copiar_estado(nueva)
+        nueva.datos = self.datos
+        nueva.grupos_zona_dia = self.grupos_zona_dia.copy()
+        nueva.dias_grupo = self.dias_grupo.copy()
+        nueva.max_por_grupo = self.max_por_grupo.copy()
+        nueva.usos_escritorio = self.usos_escritorio.copy()
+        nueva.num_escritorios = self.num_escritorios.copy()
+        nueva.penalizacion = self.penalizacion
+
+
+def evaluar_individuo(individuo, datos_completos):
+    """Retorna la penalización del individuo, reutilizando su estado incremental si lo tiene."""
+    if isinstance(individuo, AsignacionIncremental):
+        return individuo.penalizacion
+    return calcular_fitness(individuo, datos_completos)
+
+
+def es_factible(asignacion, datos_completos):
+    """
+    Indica si la asignación cumple las restricciones duras: ningún escritorio
+    ocupado dos veces el mismo día y cada empleado sólo en escritorios permitidos.
+    """
+    if isinstance(asignacion, AsignacionIndexada) and asignacion.num_conflictos:
+        return False
+    permitidos = datos_completos['escritorios_permitidos']
+    ocupados = set()
+    for (e, d), desk in asignacion.items():
+        if desk not in permitidos.get(e, ()) or (d, desk) in ocupados:
+            return False
+        ocupados.add((d, desk))
+    return True
+
+
+def _indice_operador(individuo, escritorios_por_empleado, indice):
+    """Índice que usa un operador: el recibido, el del individuo o uno mínimo construido al vuelo."""
+    if indice is not None:
+        return indice
+    if isinstance(individuo, AsignacionIndexada):
+        return individuo.indice
+    return IndiceInstancia(escritorios_por_empleado)
+
+
+def reparar_individuo(individuo, escritorios_por_empleado, indice=None):
+    """
+    Repara conflictos de asignación en un individuo: cada escritorio ocupado
+    más de una vez en un día se queda con su primer ocupante y los demás pasan a
+    un escritorio libre al azar (o se quedan sin asignación ese día). Recorre
+    sólo los conflictos del índice del individuo, no todas sus asignaciones.
+    """
+    indice = _indice_operador(individuo, escritorios_por_empleado, indice)
+    if not isinstance(individuo, AsignacionIndexada):
+        individuo = AsignacionIndexada(individuo, indice)
+    if not individuo.num_conflictos:
+        return individuo
+    for (d, desk), sobrantes in list(individuo.conflictos.items()):
+        for e_reasignar in sobrantes:
+            del individuo[(e_reasignar, d)]
+            nuevo_desk = indice.escritorio_aleatorio(individuo.libres(e_reasignar, d))
+            if nuevo_desk is not None:
+                individuo[(e_reasignar, d)] = nuevo_desk
+    return individuo
+
+def cruzar(padre1, padre2, escritorios_por_empleado, indice=None, reparar=True, operador=None):
+    """
+    Cruza dos padres y repara al hijo resultante (salvo con `reparar` en False).
+
+    `operador` (por defecto OPERADOR_CRUCE) elige el cruce: 'uniforme' toma cada
+    asignación de uno u otro padre; 'dias' hereda cada día completo de un solo
+    padre, de modo que dos padres sin conflictos dan un hijo sin conflictos; y
+    'grupos' hereda todas las asignaciones de los miembros de cada grupo de un
+    solo padre (los empleados sin grupo vienen del primero), lo que conserva las
+    reuniones y sólo produce conflictos entre grupos.
+    """
+    operador = operador or OPERADOR_CRUCE
+    if operador == 'uniforme':
+        hijo = {}
+        for clave in padre1:
+            if random.random() < 0.5: hijo[clave] = padre1[clave]
+        for clave in padre2:
+            if random.random() < 0.5: hijo[clave] = padre2[clave]
+    elif operador == 'dias':
+        indice = _indice_operador(padre1, escritorios_por_empleado, indice)
+        dias = indice.dias or sorted({d for (_, d) in padre1} | {d for (_, d) in padre2})
+        del_segundo = {d for d in dias if random.random() < 0.5}
+        hijo = {clave: desk for clave, desk in padre1.items() if clave[1] not in del_segundo}
+        hijo.update((clave, desk) for clave, desk in padre2.items() if clave[1] in del_segundo)
+    elif operador == 'grupos':
+        indice = _indice_operador(padre1, escritorios_por_empleado, indice)
+        del_segundo = {g for g in indice.miembros_de_grupo if random.random() < 0.5}
+        grupo_de_empleado = indice.grupo_de_empleado
+        hijo = {clave: desk for clave, desk in padre1.items() if grupo_de_empleado.get(clave[0]) not in del_segundo}
+        hijo.update((clave, desk) for clave, desk in padre2.items() if grupo_de_empleado.get(clave[0]) in del_segundo)
+    else:
+        raise ValueError(f"Operador de cruce desconocido: '{operador}'")
+    if isinstance(padre1, AsignacionIndexada):
+        hijo = padre1.nueva(hijo)
+    if not reparar:
+        return hijo
+    return reparar_individuo(hijo, escritorios_por_empleado, indice)
+
+def mutar(individuo, employees, days, escritorios_por_empleado, indice=None, reparar=True, tasas=None, aplicados=None):
+    """
+    Aplica mutaciones a un individuo para introducir diversidad y repara el
+    resultado (salvo con `reparar` en False).
+
+    No modifica `individuo`: lo copia al escribir, sólo si alguna mutación lo
+    toca o si hay que repararlo; si no, retorna el mismo objeto.
+
+    `tasas` reemplaza las tasas globales (claves 'mutacion', 'escritorio', 'dia'
+    y 'adicion', como en `ControlAdaptativo.tasas`). Si se da el conjunto
+    `aplicados`, se agregan a él los tipos de mutación usados ('escritorio',
+    'dia', 'eliminacion' y 'adicion' si se intentó una adición).
+    """
+    if tasas is None:
+        tasa_mutacion, tasa_escritorio, tasa_dia, tasa_adicion = (
+            TASA_MUTACION, TASA_MUTACION_ESCRITORIO_REL, TASA_MUTACION_DIA_REL, TASA_MUTACION_ADICION)
+    else:
+        tasa_mutacion, tasa_escritorio, tasa_dia, tasa_adicion = (
+            tasas['mutacion'], tasas['escritorio'], tasas['dia'], tasas['adicion'])
+    indice = _indice_operador(individuo, escritorios_por_empleado, indice)
+    compartido = isinstance(individuo, AsignacionIndexada)
+    mutado = individuo if compartido else AsignacionIndexada(individuo, indice)
+    if not mutado: return reparar_individuo(mutado, escritorios_por_empleado, indice) if reparar else mutado
+    for (e, d) in individuo:
+        if (e, d) not in mutado: continue
+        if random.random() < tasa_mutacion:
+            if compartido:
+                mutado, compartido = mutado.copy(), False
+            tipo_mutacion = random.random()
+            if tipo_mutacion < tasa_escritorio:
+                if aplicados is not None: aplicados.add('escritorio')
+                # El escritorio actual cuenta como libre si sólo lo ocupa e
+                escritorio_actual = mutado[(e, d)]
+                libres = mutado.libres(e, d)
+                if mutado.ocupacion[(d, escritorio_actual)] == 1:
+                    libres |= indice.mascara_permitidos.get(e, 0) & indice.bit_escritorio.get(escritorio_actual, 0)
+                nuevo_desk = indice.escritorio_aleatorio(libres)
+                if nuevo_desk is not None: mutado[(e, d)] = nuevo_desk
+            elif tipo_mutacion < tasa_escritorio + tasa_dia:
+                if aplicados is not None: aplicados.add('dia')
+                escritorio_actual = mutado.pop((e, d))
+                dias_posibles = [day for day in days if day != d]
+                random.shuffle(dias_posibles)
+                reasignado = False
+                for nuevo_d in dias_posibles:
+                    if (nuevo_d, escritorio_actual) not in mutado.ocupacion:
+                        mutado[(e, nuevo_d)] = escritorio_actual
+                        reasignado = True
+                        break
+                if not reasignado: mutado[(e, d)] = escritorio_actual
+            else:
+                if aplicados is not None: aplicados.add('eliminacion')
+                del mutado[(e, d)]
+    if random.random() < tasa_adicion:
+        if aplicados is not None: aplicados.add('adicion')
+        e_candidato = random.choice(list(employees))
+        dias_disponibles_e = [day for day in days if (e_candidato, day) not in mutado]
+        if dias_disponibles_e:
+            d_nuevo = random.choice(dias_disponibles_e)
+            nuevo_desk = indice.escritorio_aleatorio(mutado.libres(e_candidato, d_nuevo))
+            if nuevo_desk is not None:
+                if compartido:
+                    mutado, compartido = mutado.copy(), False
+                mutado[(e_candidato, d_nuevo)] = nuevo_desk
+    if compartido and mutado.num_conflictos:
+        mutado = mutado.copy()
+    if not reparar:
+        return mutado
+    return reparar_individuo(mutado, escritorios_por_empleado, indice)
+
+def seleccionar_padre_por_torneo(poblacion_con_puntuaciones):
+    """Selecciona un padre mediante el método de torneo."""
+    return _torneo(poblacion_con_puntuaciones)[0]
+
+
+def _torneo(poblacion_con_puntuaciones):
+    """Par (individuo, penalización) ganador de un torneo."""
+    participantes = random.sample(poblacion_con_puntuaciones, TOURNAMENT_SIZE)
+    return min(participantes, key=lambda x: x[1])
+
+# ==============================================================================
+# BÚSQUEDA LOCAL (PASO MEMÉTICO)
+# ==============================================================================
+
+def _aplicar_cambios(asignacion, cambios):
+    """
+    Aplica una lista de cambios [(clave, escritorio o None para eliminar)] y
+    retorna la lista que los deshace.
+    """
+    deshacer = [(clave, asignacion.get(clave)) for clave, _ in cambios][::-1]
+    for clave, desk in cambios:
+        if desk is None:
+            asignacion.pop(clave, None)
+        else:
+            asignacion[clave] = desk
+    return deshacer
+
+
+def _movimientos_posicion(asignacion, datos, ocupante, e, d):
+    """
+    Movimientos que involucran al empleado e el día d, como listas de cambios:
+    cambio a otro escritorio libre, intercambio de escritorio con otro empleado
+    del mismo día y cambio a otro día (o, si e no asiste ese día, asignarlo a un
+    escritorio libre).
+    """
+    indice = asignacion.indice
+    desk = asignacion.get((e, d))
+    movimientos = []
+    if desk is None:
+        for libre in indice.escritorios_de(asignacion.libres(e, d)):
+            movimientos.append([((e, d), libre)])
+        return movimientos
+
+    for libre in indice.escritorios_de(asignacion.libres(e, d)):
+        movimientos.append([((e, d), libre)])
+
+    ocupados_permitidos = indice.mascara_permitidos.get(e, 0) & asignacion.mascara_ocupados.get(d, 0)
+    for otro_desk in indice.escritorios_de(ocupados_permitidos & ~indice.bit_escritorio.get(desk, 0)):
+        otro = ocupante.get((d, otro_desk))
+        if otro is not None and otro != e and desk in indice.permitidos.get(otro, ()):
+            movimientos.append([((e, d), otro_desk), ((otro, d), desk)])
+
+    for otro_d in datos['days']:
+        if (e, otro_d) in asignacion:
+            continue
+        if (otro_d, desk) not in asignacion.ocupacion:
+            nuevo_desk = desk
+        else:
+            nuevo_desk = indice.escritorio_aleatorio(asignacion.libres(e, otro_d))
+        if nuevo_desk is not None:
+            movimientos.append([((e, d), None), ((e, otro_d), nuevo_desk)])
+    return movimientos
+
+
+def busqueda_local(individuo, datos, estrategia='primera', tiempo_limite=None):
+    """
+    Mejora una copia de `individuo` con búsqueda local. Recorre en orden
+    aleatorio las posiciones (empleado, día) asignadas y los días preferidos sin
+    asignar, evalúa sus movimientos (`_movimientos_posicion`) con el delta de
+    `AsignacionIncremental` (aplicar y deshacer) y acepta el primero que mejora
+    ('primera') o el mejor de la posición ('mejor'). Repite hasta una pasada sin
+    mejoras o hasta agotar `tiempo_limite` segundos.
+    Retorna (individuo mejorado, penalización, movimientos aceptados).
+    """
+    if estrategia not in ('primera', 'mejor'):
+        raise ValueError(f"Estrategia de búsqueda local desconocida: '{estrategia}'")
+    fin = time.perf_counter() + tiempo_limite if tiempo_limite is not None else float('inf')
+    actual = individuo.copy() if isinstance(individuo, AsignacionIncremental) else AsignacionIncremental(individuo, datos)
+    ocupante = {(d, desk): e for (e, d), desk in actual.items()}
+    aceptados = 0
+
+    mejoro = True
+    while mejoro and time.perf_counter() < fin:
+        mejoro = False
+        posiciones = list(actual.keys())
+        posiciones += [(e, d) for e, preferidos in datos['dias_preferidos'].items() for d in preferidos
+                       if (e, d) not in actual and d in datos['days']]
+        random.shuffle(posiciones)
+        for e, d in posiciones:
+            if time.perf_counter() >= fin:
+                break
+            mejor_movimiento, mejor_delta = None, 0
+            for cambios in _movimientos_posicion(actual, datos, ocupante, e, d):
+                antes = actual.penalizacion
+                deshacer = _aplicar_cambios(actual, cambios)
+                delta = actual.penalizacion - antes
+                _aplicar_cambios(actual, deshacer)
+                if delta < mejor_delta:
+                    mejor_movimiento, mejor_delta = cambios, delta
+                    if estrategia == 'primera':
+                        break
+            if mejor_movimiento is not None:
+                for clave, desk in _aplicar_cambios(actual, mejor_movimiento):
+                    if desk is not None and ocupante.get((clave[1], desk)) == clave[0]:
+                        del ocupante[(clave[1], desk)]
+                for (e_mov, d_mov), desk in mejor_movimiento:
+                    if desk is not None:
+                        ocupante[(d_mov, desk)] = e_mov
+                aceptados += 1
+                mejoro = True
+    return actual, actual.penalizacion, aceptados
+
+
+def intensificar_poblacion(puntuaciones_y_individuos, datos, estrategia=None, fraccion=None, tiempo_total=None):
+    """
+    Paso memético: aplica `busqueda_local` a la fracción `fraccion` de mejores
+    individuos de la lista (individuo, penalización) ordenada, repartiendo
+    `tiempo_total` segundos entre ellos. Por defecto usa BUSQUEDA_LOCAL,
+    FRACCION_BUSQUEDA_LOCAL y TIEMPO_BUSQUEDA_LOCAL. Retorna una lista nueva,
+    ordenada, con los individuos mejorados en lugar de los originales.
+    """
+    estrategia = estrategia or BUSQUEDA_LOCAL
+    fraccion = FRACCION_BUSQUEDA_LOCAL if fraccion is None else fraccion
+    tiempo_total = TIEMPO_BUSQUEDA_LOCAL if tiempo_total is None else tiempo_total
+    cantidad = max(1, int(len(puntuaciones_y_individuos) * fraccion))
+    fin = time.perf_counter() + tiempo_total
+    resultado = list(puntuaciones_y_individuos)
+    for i in range(min(cantidad, len(resultado))):
+        restante = fin - time.perf_counter()
+        if restante <= 0:
+            break
+        individuo, penalizacion = resultado[i]
+        mejorado, nueva_penalizacion, aceptados = busqueda_local(individuo, datos, estrategia, restante / (cantidad - i))
+        if aceptados and nueva_penalizacion < penalizacion:
+            resultado[i] = (mejorado, nueva_penalizacion)
+    resultado.sort(key=lambda x: x[1])
+    return resultado
+
+
+# ==============================================================================
+# CONTROL ADAPTATIVO DE OPERADORES
+# ==============================================================================
+
+class ControlAdaptativo:
+    """
+    Ajusta durante la ejecución la probabilidad de los operadores según qué tan
+    seguido producen hijos mejores que su mejor padre (persecución adaptativa,
+    "adaptive pursuit"). Hay tres decisiones, cada una con sus alternativas:
+    cruzar o no ('cruce'), el tipo de mutación de una asignación ('escritorio',
+    'dia', 'eliminacion') y si intentar una adición ('adicion'). Para cada
+    alternativa se lleva una recompensa media; la probabilidad de la mejor se
+    acerca a su máximo y la de las demás a PROBABILIDAD_MINIMA_OPERADOR.
+    Además, si la diversidad de la población cae bajo UMBRAL_DIVERSIDAD, la
+    tasa de mutación se duplica (hasta FACTOR_MUTACION_MAXIMO veces
+    TASA_MUTACION) y vuelve a bajar cuando la diversidad se recupera.
+    """
+
+    def __init__(self):
+        self.decisiones = {
+            'cruce': {'si': TASA_CRUCE, 'no': 1 - TASA_CRUCE},
+            'tipo_mutacion': {'escritorio': TASA_MUTACION_ESCRITORIO_REL, 'dia': TASA_MUTACION_DIA_REL,
+                              'eliminacion': TASA_MUTACION_ELIMINACION_REL},
+            'adicion': {'si': TASA_MUTACION_ADICION, 'no': 1 - TASA_MUTACION_ADICION},
+        }
+        for alternativas in self.decisiones.values():
+            self._acotar(alternativas)
+        self.recompensas = {decision: dict.fromkeys(alternativas, 0.0) for decision, alternativas in self.decisiones.items()}
+        self.factor_mutacion = 1.0
+        self.pendientes = {}  # Posición en la población -> (alternativas usadas, penalización del mejor padre)
+
+    @staticmethod
+    def _acotar(alternativas):
+        """Normaliza las probabilidades dentro de [PROBABILIDAD_MINIMA_OPERADOR, máximo]."""
+        minima = min(PROBABILIDAD_MINIMA_OPERADOR, 1 / len(alternativas))
+        maxima = 1 - (len(alternativas) - 1) * minima
+        for nombre, p in alternativas.items():
+            alternativas[nombre] = min(max(p, minima), maxima)
+        total = sum(alternativas.values())
+        for nombre in alternativas:
+            alternativas[nombre] /= total
+
+    def tasas(self):
+        """Tasas actuales en el formato de `mutar` más la de cruce."""
+        tipo = self.decisiones['tipo_mutacion']
+        return {
+            'cruce': self.decisiones['cruce']['si'],
+            'mutacion': min(1.0, TASA_MUTACION * self.factor_mutacion),
+            'escritorio': tipo['escritorio'],
+            'dia': tipo['dia'],
+            'adicion': self.decisiones['adicion']['si'],
+        }
+
+    def registrar_hijo(self, posicion, cruzado, aplicados, penalizacion_padre):
+        """Recuerda qué alternativas produjeron al hijo que ocupa `posicion` en la nueva población."""
+        usadas = [('cruce', 'si' if cruzado else 'no'), ('adicion', 'si' if 'adicion' in aplicados else 'no')]
+        usadas += [('tipo_mutacion', tipo) for tipo in ('escritorio', 'dia', 'eliminacion') if tipo in aplicados]
+        self.pendientes[posicion] = (usadas, penalizacion_padre)
+
+    def actualizar(self, penalizaciones):
+        """
+        Recompensa a las alternativas según las penalizaciones (en el orden de la
+        población) de los hijos registrados, ajusta sus probabilidades y la tasa de
+        mutación según la diversidad de `penalizaciones`.
+        """
+        aprendizaje = TASA_APRENDIZAJE_ADAPTATIVO
+        exitos = defaultdict(list)
+        for posicion, (usadas, penalizacion_padre) in self.pendientes.items():
+            exito = 1.0 if penalizaciones[posicion] < penalizacion_padre else 0.0
+            for usada in usadas:
+                exitos[usada].append(exito)
+        self.pendientes = {}
+
+        for decision, alternativas in self.decisiones.items():
+            recompensas = self.recompensas[decision]
+            for nombre in alternativas:
+                muestras = exitos.get((decision, nombre))
+                if muestras:
+                    recompensas[nombre] += aprendizaje * (sum(muestras) / len(muestras) - recompensas[nombre])
+            if not any(exitos.get((decision, nombre)) for nombre in alternativas):
+                continue
+            mejor = max(recompensas, key=recompensas.get)
+            minima = min(PROBABILIDAD_MINIMA_OPERADOR, 1 / len(alternativas))
+            maxima = 1 - (len(alternativas) - 1) * minima
+            for nombre in alternativas:
+                objetivo = maxima if nombre == mejor else minima
+                alternativas[nombre] += aprendizaje * (objetivo - alternativas[nombre])
+            self._acotar(alternativas)
+
+        diversidad = len(set(penalizaciones)) / len(penalizaciones) if penalizaciones else 1.0
+        if diversidad < UMBRAL_DIVERSIDAD:
+            self.factor_mutacion = min(FACTOR_MUTACION_MAXIMO, self.factor_mutacion * 2)
+        else:
+            self.factor_mutacion = max(1.0, self.factor_mutacion / 2)
+
+    def estado(self):
+        """Tasas actuales con prefijo 'tasa_', para los registros de generación."""
+        return {f'tasa_{nombre}': valor for nombre, valor in self.tasas().items()}
+
+
+# ==============================================================================
+# CODIFICACIÓN DENSA Y EVALUACIÓN VECTORIZADA
+# ==============================================================================
+
+def codificar_instancia(datos_completos):
+    """
+    Interna empleados, días, escritorios, zonas y grupos a índices enteros y
+    construye las tablas NumPy que usa `calcular_fitness_poblacion`. Los días
+    preferidos fuera de Days tienen su propia columna (después de los de Days),
+    porque los individuos también los asignan.
+    """
+    empleados = list(datos_completos['employees'])
+    dias = list(datos_completos['dias_evaluacion'])
+    escritorios = list(datos_completos['desks'])
+    conocidos = set(escritorios)
+    for lista in list(datos_completos['escritorios_por_empleado'].values()) + list(datos_completos['desks_por_zona'].values()):
+        for desk in lista:
+            if desk not in conocidos:
+                conocidos.add(desk)
+                escritorios.append(desk)
+    zonas = [z for z in datos_completos['desks_por_zona'] if z]
+    grupos = list(datos_completos['empleados_por_grupo'])
+
+    indice_empleado = {e: i for i, e in enumerate(empleados)}
+    indice_dia = {d: i for i, d in enumerate(dias)}
+    indice_escritorio = {desk: i for i, desk in enumerate(escritorios)}
+    indice_zona = {z: i for i, z in enumerate(zonas)}
+    indice_grupo = {g: i for i, g in enumerate(grupos)}
+
+    permitido = np.zeros((len(empleados), len(escritorios)), dtype=bool)
+    preferido = np.zeros((len(empleados), len(dias)), dtype=bool)
+    grupo_de_empleado = np.full(len(empleados), -1, dtype=np.int64)
+    for e, i in indice_empleado.items():
+        for desk in datos_completos['escritorios_por_empleado'].get(e, []):
+            permitido[i, indice_escritorio[desk]] = True
+        for d in datos_completos['dias_por_empleado'].get(e, []):
+            preferido[i, indice_dia[d]] = True
+        grupo_e = datos_completos['grupo_por_empleado'].get(e)
+        if grupo_e: grupo_de_empleado[i] = indice_grupo[grupo_e]
+
+    zona_de_escritorio = np.full(len(escritorios), -1, dtype=np.int64)
+    for desk, z in datos_completos['zona_por_escritorio'].items():
+        if z: zona_de_escritorio[indice_escritorio[desk]] = indice_zona[z]
+
+    # Matriz grupos x empleados con el número de veces que cada empleado figura en el grupo
+    miembros_por_grupo = np.zeros((len(grupos), len(empleados)), dtype=np.int32)
+    tamano_grupo = np.zeros(len(grupos), dtype=np.int64)
+    for g, miembros in datos_completos['empleados_por_grupo'].items():
+        tamano_grupo[indice_grupo[g]] = len(miembros)
+        for m in miembros:
+            if m in indice_empleado: miembros_por_grupo[indice_grupo[g], indice_empleado[m]] += 1
+
+    # Plan anterior de una replanificación como matriz empleados x días (-1 = sin asignación)
+    plan_anterior = np.full((len(empleados), len(dias)), -1, dtype=np.int16)
+    for (e, d), desk in (datos_completos.get('plan_anterior') or {}).items():
+        if e in indice_empleado and d in indice_dia and desk in indice_escritorio:
+            plan_anterior[indice_empleado[e], indice_dia[d]] = indice_escritorio[desk]
+
+    return {
+        'empleados': empleados, 'dias': dias, 'escritorios': escritorios, 'zonas': zonas, 'grupos': grupos,
+        'indice_empleado': indice_empleado, 'indice_dia': indice_dia, 'indice_escritorio': indice_escritorio,
+        'permitido': permitido, 'preferido': preferido,
+        'grupo_de_empleado': grupo_de_empleado, 'zona_de_escritorio': zona_de_escritorio,
+        'miembros_por_grupo': miembros_por_grupo, 'tamano_grupo': tamano_grupo,
+        'plan_anterior': plan_anterior, 'penalizacion_cambio': datos_completos.get('penalizacion_cambio', 0),
+    }
+
+
+def asignacion_a_matriz(asignacion, codificacion):
+    """Convierte un individuo en una matriz int16 empleados x días (-1 = sin asignación)."""
+    matriz = np.full((len(codificacion['empleados']), len(codificacion['dias'])), -1, dtype=np.int16)
+    indice_empleado = codificacion['indice_empleado']
+    indice_dia = codificacion['indice_dia']
+    indice_escritorio = codificacion['indice_escritorio']
+    for (e, d), desk in asignacion.items():
+        matriz[indice_empleado[e], indice_dia[d]] = indice_escritorio[desk]
+    return matriz
+
+
+def matriz_a_asignacion(matriz, codificacion):
+    """Convierte una matriz empleados x días al diccionario (empleado, día) -> escritorio."""
+    empleados = codificacion['empleados']
+    dias = codificacion['dias']
+    escritorios = codificacion['escritorios']
+    filas, columnas = np.nonzero(matriz >= 0)
+    return {(empleados[i], dias[j]): escritorios[matriz[i, j]] for i, j in zip(filas.tolist(), columnas.tolist())}
+
+
+def poblacion_a_tensor(poblacion, codificacion):
+    """Apila los individuos de la población en un arreglo int16 población x empleados x días."""
+    tensor = np.full((len(poblacion), len(codificacion['empleados']), len(codificacion['dias'])), -1, dtype=np.int16)
+    for p, individuo in enumerate(poblacion):
+        tensor[p] = asignacion_a_matriz(individuo, codificacion)
+    return tensor
+
+
+def calcular_fitness_poblacion(tensor, codificacion):
+    """
+    Calcula la penalización de todos los individuos de un tensor población x
+    empleados x días con reducciones NumPy. Equivale a `calcular_fitness`
+    aplicado a cada individuo.
+    """
+    return calcular_objetivos_poblacion(tensor, codificacion).sum(axis=1)
+
+
+def calcular_objetivos_poblacion(tensor, codificacion):
+    """
+    Como `calcular_fitness_poblacion`, pero retorna una matriz población x
+    OBJETIVOS con cada componente de la penalización por separado (ver
+    `objetivos_de_agregados`).
+    """
+    tensor = np.asarray(tensor)
+    num_individuos, num_empleados, num_dias = tensor.shape
+    num_escritorios = len(codificacion['escritorios'])
+    num_zonas = len(codificacion['zonas'])
+    num_grupos = len(codificacion['grupos'])
+    objetivos = np.zeros((num_individuos, len(OBJETIVOS)), dtype=np.int64)
+    restricciones, dias_preferidos, reuniones, aislamiento, escritorio = objetivos.T
+
+    presente = tensor >= 0
+    idx_p, idx_e, idx_d = np.nonzero(presente)
+    idx_k = tensor[idx_p, idx_e, idx_d].astype(np.int64)
+
+    # Sobre-asignación de escritorios
+    claves = (idx_p * num_dias + idx_d) * num_escritorios + idx_k
+    ocupacion = np.bincount(claves, minlength=num_individuos * num_dias * num_escritorios)
+    ocupacion = ocupacion.reshape(num_individuos, num_dias * num_escritorios)
+    restricciones += 10000 * np.maximum(ocupacion - 1, 0).sum(axis=1)
+
+    # Escritorios no permitidos
+    no_permitido = ~codificacion['permitido'][idx_e, idx_k]
+    restricciones += 10000 * np.bincount(idx_p[no_permitido], minlength=num_individuos)
+
+    # Empleados sin asignación y días preferidos
+    dias_por_empleado = presente.sum(axis=2)
+    restricciones += 5000 * (dias_por_empleado == 0).sum(axis=1)
+    preferido = codificacion['preferido'][None, :, :]
+    dias_preferidos += 200 * (preferido & ~presente).sum(axis=(1, 2))
+    dias_preferidos += 100 * (presente & ~preferido).sum(axis=(1, 2))
+
+    # Reuniones de grupo: histograma población x grupos x días
+    if num_grupos:
+        histograma = np.matmul(codificacion['miembros_por_grupo'], presente.astype(np.int32))
+        max_reunidos = histograma.max(axis=2) if num_dias else np.zeros((num_individuos, num_grupos), dtype=np.int64)
+        reuniones += 10000 * np.maximum(codificacion['tamano_grupo'][None, :] - max_reunidos, 0).sum(axis=1)
+
+    # Aislamiento: grupos con un único miembro en una zona y día
+    zona = codificacion['zona_de_escritorio'][idx_k]
+    grupo = codificacion['grupo_de_empleado'][idx_e]
+    con_zona_y_grupo = (zona >= 0) & (grupo >= 0)
+    if con_zona_y_grupo.any():
+        bloque = num_dias * num_zonas * num_grupos
+        claves = ((idx_p[con_zona_y_grupo] * num_dias + idx_d[con_zona_y_grupo]) * num_zonas + zona[con_zona_y_grupo]) * num_grupos + grupo[con_zona_y_grupo]
+        unicas, conteos = np.unique(claves, return_counts=True)
+        aislamiento += 500 * np.bincount(unicas[conteos == 1] // bloque, minlength=num_individuos)
+
+    # Escritorio único: escritorios distintos por empleado
+    ordenado = np.sort(tensor, axis=2)
+    distinto = ordenado >= 0
+    distinto[:, :, 1:] &= ordenado[:, :, 1:] != ordenado[:, :, :-1]
+    escritorio += 50 * np.maximum(distinto.sum(axis=2) - 1, 0).sum(axis=1)
+
+    # Replanificación: asignaciones del plan anterior que cambiaron
+    if codificacion.get('penalizacion_cambio'):
+        plan = codificacion['plan_anterior'][None, :, :]
+        escritorio += codificacion['penalizacion_cambio'] * ((plan >= 0) & (tensor != plan)).sum(axis=(1, 2))
+
+    return objetivos
+
+
+# ==============================================================================
+# EVALUACIÓN PARALELA
+# ==============================================================================
+
+# Tablas de la instancia en cada proceso trabajador; se envían una sola vez al crear el pool.
+_codificacion_trabajador = None
+
+
+def _inicializar_trabajador_evaluacion(codificacion):
+    global _codificacion_trabajador
+    _codificacion_trabajador = codificacion
+
+
+def _evaluar_lote(tensor_lote):
+    return calcular_fitness_poblacion(tensor_lote, _codificacion_trabajador)
+
+
+class EvaluadorParalelo:
+    """
+    Pool de procesos que puntúa la población con `calcular_fitness_poblacion`.
+
+    La codificación de la instancia viaja a los trabajadores una única vez (en el
+    inicializador del pool) y cada generación se envían sólo lotes int16 de la
+    población. Si la población es pequeña el costo de serializar supera la
+    ganancia, así que se evalúa en el proceso principal.
+    """
+
+    def __init__(self, datos_completos, num_procesos=NUM_PROCESOS, min_celdas=MIN_CELDAS_PARALELO):
+        self.codificacion = datos_completos['codificacion']
+        self.num_procesos = num_procesos or os.cpu_count() or 1
+        self.min_celdas = min_celdas
+        self.pool = None
+        if self.num_procesos > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.num_procesos,
+                                            initializer=_inicializar_trabajador_evaluacion,
+                                            initargs=(self.codificacion,))
+
+    def evaluar(self, poblacion):
+        tensor = poblacion_a_tensor(poblacion, self.codificacion)
+        if self.pool is None or tensor.size < self.min_celdas:
+            return calcular_fitness_poblacion(tensor, self.codificacion).tolist()
+        lotes = np.array_split(tensor, self.num_procesos)
+        return np.concatenate(list(self.pool.map(_evaluar_lote, lotes))).tolist()
+
+    def cerrar(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class CacheFitness:
+    """
+    Caché LRU acotada de penalizaciones indexada por la clave de Zobrist de los
+    individuos (`AsignacionIndexada.clave_zobrist`). Lleva la cuenta de aciertos
+    y fallos.
+    """
+
+    def __init__(self, capacidad=TAMANO_CACHE_FITNESS):
+        self.capacidad = capacidad
+        self.penalizaciones = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave):
+        """Penalización memorizada para la clave, o None (cuenta el acierto o el fallo)."""
+        penalizacion = self.penalizaciones.get(clave)
+        if penalizacion is None:
+            self.fallos += 1
+            return None
+        self.aciertos += 1
+        self.penalizaciones.move_to_end(clave)
+        return penalizacion
+
+    def guardar(self, clave, penalizacion):
+        self.penalizaciones[clave] = penalizacion
+        self.penalizaciones.move_to_end(clave)
+        if len(self.penalizaciones) > self.capacidad:
+            self.penalizaciones.popitem(last=False)
+
+    def estadisticas(self):
+        """Aciertos, fallos, tasa de aciertos y entradas actuales."""
+        consultas = self.aciertos + self.fallos
+        return {'aciertos': self.aciertos, 'fallos': self.fallos,
+                'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                'entradas': len(self.penalizaciones)}
+
+
+def evaluar_poblacion(poblacion, datos_completos, modo_evaluacion=MODO_EVALUACION, evaluador=None, cache=None):
+    """
+    Retorna la lista de penalizaciones de la población según el modo de evaluación.
+    El modo 'paralelo' requiere un `EvaluadorParalelo` abierto. Con una
+    `CacheFitness`, sólo se evalúa una vez cada genoma que no esté en la caché
+    (el modo 'incremental' no la necesita y la ignora).
+    """
+    if cache is None or modo_evaluacion == 'incremental':
+        return _evaluar_poblacion(poblacion, datos_completos, modo_evaluacion, evaluador)
+
+    penalizaciones = [None] * len(poblacion)
+    pendientes = {}  # Clave de Zobrist -> posiciones de la población con ese genoma
+    for i, ind in enumerate(poblacion):
+        clave = getattr(ind, 'clave_zobrist', None)
+        if clave is None:
+            pendientes[('sin_clave', i)] = [i]
+            continue
+        if clave in pendientes:
+            # Genoma repetido dentro de la misma población: se evalúa una sola vez
+            cache.aciertos += 1
+            pendientes[clave].append(i)
+            continue
+        penalizacion = cache.obtener(clave)
+        if penalizacion is None:
+            pendientes[clave] = [i]
+        else:
+            penalizaciones[i] = penalizacion
+
+    if pendientes:
+        claves = list(pendientes)
+        nuevas = _evaluar_poblacion([poblacion[pendientes[clave][0]] for clave in claves], datos_completos,
+                                    modo_evaluacion, evaluador)
+        for clave, penalizacion in zip(claves, nuevas):
+            for i in pendientes[clave]:
+                penalizaciones[i] = penalizacion
+            if not isinstance(clave, tuple):
+                cache.guardar(clave, penalizacion)
+    return penalizaciones
+
+
+def _evaluar_poblacion(poblacion, datos_completos, modo_evaluacion, evaluador=None):
+    """Evalúa toda la población, sin caché, según el modo de evaluación."""
+    if modo_evaluacion == 'paralelo':
+        return evaluador.evaluar(poblacion)
+    if modo_evaluacion == 'vectorizado':
+        codificacion = datos_completos['codificacion']
+        return calcular_fitness_poblacion(poblacion_a_tensor(poblacion, codificacion), codificacion).tolist()
+    if modo_evaluacion in ('incremental', 'completo'):
+        return [evaluar_individuo(ind, datos_completos) for ind in poblacion]
+    raise ValueError(f"Modo de evaluación desconocido: '{modo_evaluacion}'")
+
+# ==============================================================================
+# FUNCIONES DE REPORTE Y ANÁLISIS 
+# ==============================================================================
+
+def reportar_resultados(mejor_asignacion, datos_completos):
+    """
+    Calcula los KPIs de la mejor solución encontrada y los retorna. Usa los mismos
+    conteos que `calcular_fitness` (`agregar_asignacion`).
+    """
+    return kpis_de_agregados(agregar_asignacion(mejor_asignacion, datos_completos), datos_completos)
+
+
+def _filas_asignacion(asignacion):
+    """Recorre la asignación como filas (empleado, día, escritorio) sin construir tablas intermedias."""
+    for (e, d), desk in asignacion.items():
+        yield e, d, desk
+
+
+def generar_reporte_json(mejor_asignacion, datos_completos, nombre_archivo="reporte_asignaciones.json"):
+    """
+    Genera un archivo JSON con la solución detallada. Se escribe por partes (una
+    asignación o un empleado a la vez) con el mismo formato que `json.dump(..., indent=4)`.
+    Para escribir cada día en una sola pasada se agrupan por día sólo las claves
+    de la asignación (una referencia por fila, sin copiar filas), en orden de
+    primera aparición: O(asignaciones) en tiempo en lugar de O(días × asignaciones).
+    """
+    claves_por_dia = defaultdict(list)
+    for clave in mejor_asignacion:
+        claves_por_dia[clave[1]].append(clave)
+
+    codificar = json.JSONEncoder(ensure_ascii=False).encode
+    fila = '{{\n                "empleado": {},\n                "escritorio": {}\n            }}'
+
+    with open(nombre_archivo, 'w', encoding='utf-8') as f:
+        f.write('{\n    "asignaciones_por_dia": ')
+        if not claves_por_dia:
+            f.write('{}')
+        else:
+            f.write('{')
+            for i, (d, claves) in enumerate(claves_por_dia.items()):
+                f.write(',\n        ' if i else '\n        ')
+                f.write(f'{codificar(d)}: [')
+                for j, clave in enumerate(claves):
+                    f.write(',\n            ' if j else '\n            ')
+                    f.write(fila.format(codificar(clave[0]), codificar(mejor_asignacion[clave])))
+                f.write('\n        ]')
+            f.write('\n    }')
+
+        f.write(',\n    "dias_preferidos_por_empleado": ')
+        dias_por_empleado = datos_completos['dias_por_empleado']
+        if not datos_completos['employees']:
+            f.write('{}')
+        else:
+            f.write('{')
+            for i, e in enumerate(datos_completos['employees']):
+                f.write(',\n        ' if i else '\n        ')
+                dias_e = dias_por_empleado.get(e, [])
+                if dias_e:
+                    f.write(f'{codificar(e)}: [\n            ' + ',\n            '.join(map(codificar, dias_e)) + '\n        ]')
+                else:
+                    f.write(f'{codificar(e)}: []')
+            f.write('\n    }')
+        f.write('\n}')
+    print(f"\nReporte JSON detallado generado en: '{nombre_archivo}'")
+    return nombre_archivo
+
 
-    return kpis
+def generar_reporte_jsonl(mejor_asignacion, nombre_archivo="reporte_asignaciones.jsonl"):
+    """Genera un archivo JSON Lines con una asignación {empleado, dia, escritorio} por línea."""
+    codificar = json.JSONEncoder(ensure_ascii=False).encode
+    with open(nombre_archivo, 'w', encoding='utf-8') as f:
+        for e, d, desk in _filas_asignacion(mejor_asignacion):
+            f.write(f'{{"empleado": {codificar(e)}, "dia": {codificar(d)}, "escritorio": {codificar(desk)}}}\n')
+    print(f"Reporte JSONL generado en: '{nombre_archivo}'")
+    return nombre_archivo
 
 
-def generar_reporte_json(mejor_asignacion, datos_completos, nombre_archivo="reporte_asignaciones.json"):
+def generar_reporte_frente(frente, datos_completos, nombre_archivo="reporte_frente_pareto.csv"):
     """
-    Genera un archivo JSON con la solución detallada.
+    Genera un CSV con una fila por plan del frente de Pareto (`evolucionar_nsga2`):
+    penalización ponderada, cada objetivo y los KPIs de `reportar_resultados`
+    que resume el lote (KPIS_RESUMEN_LOTE).
     """
-    reporte = {
-        "asignaciones_por_dia": defaultdict(list),
-        "dias_preferidos_por_empleado": {e: datos_completos['dias_por_empleado'].get(e, []) for e in datos_completos['employees']}
-    }
-    for (e, d), desk in mejor_asignacion.items():
-        reporte["asignaciones_por_dia"][d].append({"empleado": e, "escritorio": desk})
+    import csv
 
+    with open(nombre_archivo, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['plan', 'penalizacion', *OBJETIVOS, *KPIS_RESUMEN_LOTE])
+        for i, plan in enumerate(frente):
+            kpis = reportar_resultados(plan['asignacion'], datos_completos)
+            escritor.writerow([i, plan['penalizacion'], *(plan['objetivos'][nombre] for nombre in OBJETIVOS),
+                               *(kpis[kpi] for kpi in KPIS_RESUMEN_LOTE)])
+    print(f"Reporte del frente de Pareto generado en: '{nombre_archivo}'")
+    return nombre_archivo
+
+
+def generar_planes_frente(frente, nombre_archivo="planes_frente_pareto.jsonl"):
+    """Genera un archivo JSON Lines con cada plan del frente: número, objetivos y asignaciones [empleado, día, escritorio]."""
     with open(nombre_archivo, 'w', encoding='utf-8') as f:
-        json.dump(reporte, f, indent=4, ensure_ascii=False)
-    print(f"\nReporte JSON detallado generado en: '{nombre_archivo}'")
+        for i, plan in enumerate(frente):
+            f.write(json.dumps({'plan': i, 'penalizacion': plan['penalizacion'], 'objetivos': plan['objetivos'],
+                                'asignaciones': [list(fila) for fila in _filas_asignacion(plan['asignacion'])]},
+                               ensure_ascii=False) + '\n')
+    print(f"Planes del frente de Pareto generados en: '{nombre_archivo}'")
+    return nombre_archivo
 
 
-def generar_reporte_excel(mejor_asignacion, kpis, nombre_archivo="reporte_asignaciones.xlsx"):
+def generar_reporte_csv(mejor_asignacion, nombre_archivo="reporte_asignaciones.csv"):
+    """Genera un CSV compacto con las columnas Empleado, Día y Escritorio."""
+    import csv
+
+    with open(nombre_archivo, 'w', encoding='utf-8', newline='') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(['Empleado', 'Día', 'Escritorio'])
+        escritor.writerows(_filas_asignacion(mejor_asignacion))
+    print(f"Reporte CSV generado en: '{nombre_archivo}'")
+    return nombre_archivo
+
+
+def generar_reporte_parquet(mejor_asignacion, nombre_archivo="reporte_asignaciones.parquet"):
     """
-    Genera un archivo Excel con la mejor asignación y los KPIs.
+    Genera un archivo Parquet (requiere pyarrow) con las columnas Empleado, Día y
+    Escritorio, escrito en grupos de FILAS_POR_BLOQUE_REPORTE filas.
     """
-    # Hoja de Asignaciones
-    data_asignaciones = []
-    for (empleado, dia), escritorio in mejor_asignacion.items():
-        data_asignaciones.append({'Empleado': empleado, 'Día': dia, 'Escritorio': escritorio})
-    df_asignaciones = pd.DataFrame(data_asignaciones)
-
-    # Hoja de KPIs
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = pa.schema([('Empleado', pa.string()), ('Día', pa.string()), ('Escritorio', pa.string())])
+    with pq.ParquetWriter(nombre_archivo, esquema) as escritor:
+        bloque = []
+        for fila in _filas_asignacion(mejor_asignacion):
+            bloque.append(fila)
+            if len(bloque) >= FILAS_POR_BLOQUE_REPORTE:
+                escritor.write_table(pa.Table.from_arrays([pa.array(col, pa.string()) for col in zip(*bloque)], schema=esquema))
+                bloque = []
+        if bloque or not mejor_asignacion:
+            columnas = list(zip(*bloque)) or [(), (), ()]
+            escritor.write_table(pa.Table.from_arrays([pa.array(col, pa.string()) for col in columnas], schema=esquema))
+    print(f"Reporte Parquet generado en: '{nombre_archivo}'")
+    return nombre_archivo
+
+
+def _filas_kpis(kpis):
+    """Filas [KPI, Valor, Unidad, Comentario] de la hoja de KPIs."""
     data_kpis = [
         ["KPI", "Valor", "Unidad", "Comentario"],
         ["Empleados con asignación", f"{kpis['empleados_con_asignacion_pct']:.2f}", "%", "Ideal: 100%"],
@@ -350,42 +1770,61 @@ def generar_reporte_excel(mejor_asignacion, kpis, nombre_archivo="reporte_asigna
     # Agregar detalle de capacidad por día
     for day, info in kpis['capacidad_utilizada_por_dia'].items():
         data_kpis.append([f"Capacidad Día '{day}'", f"{info['ocupados']}/{info['total_escritorios']} ({info['porcentaje']:.2f})", "%", ""])
+    return data_kpis
+
+
+def generar_reporte_excel(mejor_asignacion, kpis, nombre_archivo="reporte_asignaciones.xlsx"):
+    """
+    Genera un archivo Excel con la mejor asignación y los KPIs. Usa el modo de
+    sólo escritura de openpyxl, que vuelca cada fila al disco sin guardar la hoja
+    completa en memoria.
+    """
+    from openpyxl import Workbook
 
+    libro = Workbook(write_only=True)
 
-    df_kpis = pd.DataFrame(data_kpis[1:], columns=data_kpis[0])
+    # Hoja de Asignaciones
+    hoja_asignaciones = libro.create_sheet('Asignaciones')
+    hoja_asignaciones.append(['Empleado', 'Día', 'Escritorio'])
+    for fila in _filas_asignacion(mejor_asignacion):
+        hoja_asignaciones.append(fila)
 
-    with pd.ExcelWriter(nombre_archivo, engine='openpyxl') as writer:
-        df_asignaciones.to_excel(writer, sheet_name='Asignaciones', index=False)
-        df_kpis.to_excel(writer, sheet_name='KPIs', index=False)
+    # Hoja de KPIs
+    hoja_kpis = libro.create_sheet('KPIs')
+    for fila in _filas_kpis(kpis):
+        hoja_kpis.append(fila)
 
+    libro.save(nombre_archivo)
     print(f"Reporte Excel generado en: '{nombre_archivo}'")
+    return nombre_archivo
 
 
-def generar_graficos(kpis, output_dir="."):
-    """
-    Genera gráficos a partir de los KPIs y los guarda como imágenes.
-    Retorna una lista de rutas a los archivos de imagen generados.
-    """
-    graficos_generados = []
+def grafico_capacidad_por_dia(kpis, output_dir="."):
+    """Gráfico de barras de la capacidad utilizada por día. Retorna su ruta, o None si no hay días."""
+    import matplotlib.pyplot as plt
 
-    # Gráfico de Capacidad Utilizada por Día
     days = list(kpis['capacidad_utilizada_por_dia'].keys())
     percentages = [kpis['capacidad_utilizada_por_dia'][d]['porcentaje'] for d in days]
+    if not (days and percentages):
+        return None
+
+    plt.figure(figsize=(10, 6))
+    plt.bar(days, percentages, color='skyblue')
+    plt.xlabel('Día')
+    plt.ylabel('Porcentaje de Capacidad Utilizada (%)')
+    plt.title('Capacidad Utilizada de Escritorios por Día')
+    plt.ylim(0, 100)
+    plt.grid(axis='y', linestyle='--')
+    img_path = f"{output_dir}/capacidad_utilizada_por_dia.png"
+    plt.savefig(img_path)
+    plt.close()
+    return img_path
+
+
+def grafico_kpis_calidad(kpis, output_dir="."):
+    """Gráfico de barras de los KPIs de calidad y colaboración. Retorna su ruta."""
+    import matplotlib.pyplot as plt
 
-    if days and percentages:
-        plt.figure(figsize=(10, 6))
-        plt.bar(days, percentages, color='skyblue')
-        plt.xlabel('Día')
-        plt.ylabel('Porcentaje de Capacidad Utilizada (%)')
-        plt.title('Capacidad Utilizada de Escritorios por Día')
-        plt.ylim(0, 100)
-        plt.grid(axis='y', linestyle='--')
-        img_path = f"{output_dir}/capacidad_utilizada_por_dia.png"
-        plt.savefig(img_path)
-        plt.close()
-        graficos_generados.append(img_path)
-
-    # Gráfico de KPIs de Calidad (ejemplo: cumplimiento días preferidos, escritorio único)
     kpi_nombres = ["Cumplimiento Días Preferidos", "Empleados con Escritorio Único", "Asignaciones Aisladas"]
     kpi_valores = [
         kpis['cumplimiento_promedio_dias_preferidos_pct'],
@@ -406,8 +1845,18 @@ def generar_graficos(kpis, output_dir="."):
     img_path = f"{output_dir}/kpis_calidad_colaboracion.png"
     plt.savefig(img_path)
     plt.close()
-    graficos_generados.append(img_path)
+    return img_path
+
+
+GRAFICOS = (grafico_capacidad_por_dia, grafico_kpis_calidad)  # En el orden en que aparecen en el PDF
+
 
+def generar_graficos(kpis, output_dir="."):
+    """
+    Genera gráficos a partir de los KPIs y los guarda como imágenes.
+    Retorna una lista de rutas a los archivos de imagen generados.
+    """
+    graficos_generados = [ruta for ruta in (grafico(kpis, output_dir) for grafico in GRAFICOS) if ruta]
     print(f"Gráficos generados en: '{output_dir}'")
     return graficos_generados
 
@@ -416,6 +1865,12 @@ def generar_reporte_pdf(mejor_penalizacion, mejor_asignacion, kpis, graficos_pat
     """
     Genera un reporte PDF completo con resultados, KPIs y gráficos.
     """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, LongTable, TableStyle
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import inch
+    from reportlab.lib import colors
+
     doc = SimpleDocTemplate(nombre_archivo, pagesize=letter)
     styles = getSampleStyleSheet()
     story = []
@@ -432,17 +1887,9 @@ def generar_reporte_pdf(mejor_penalizacion, mejor_asignacion, kpis, graficos_pat
     story.append(Paragraph("<b>--- Mejor Asignación Encontrada ---</b>", styles['h2']))
     story.append(Spacer(1, 0.1 * inch))
 
-    asignacion_data = [["Empleado", "Día", "Escritorio"]]
-    for (e, d), desk in mejor_asignacion.items():
-        asignacion_data.append([e, d, desk])
-
-    # Limitar la tabla de asignaciones para PDF si es muy larga
-   # if len(asignacion_data) > 50: # Adjust this limit as needed
-    #    story.append(Paragraph("<i>Mostrando las primeras 50 asignaciones por brevedad. Ver reporte Excel para la lista completa.</i>", styles['Normal']))
-     #   asignacion_data = asignacion_data[:51] # Header + 50 rows
-
-    table = Table(asignacion_data)
-    table.setStyle(TableStyle([
+    # La tabla se parte en bloques de FILAS_POR_TABLA_PDF filas; cada bloque es una
+    # LongTable que repite el encabezado en cada página
+    estilo_tabla = TableStyle([
         ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
         ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
         ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
@@ -450,8 +1897,16 @@ def generar_reporte_pdf(mejor_penalizacion, mejor_asignacion, kpis, graficos_pat
         ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
         ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
         ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(table)
+    ])
+    encabezado = ["Empleado", "Día", "Escritorio"]
+    bloque = [encabezado]
+    for fila in _filas_asignacion(mejor_asignacion):
+        bloque.append(list(fila))
+        if len(bloque) > FILAS_POR_TABLA_PDF:
+            story.append(LongTable(bloque, repeatRows=1, style=estilo_tabla))
+            bloque = [encabezado]
+    if len(bloque) > 1 or not mejor_asignacion:
+        story.append(LongTable(bloque, repeatRows=1, style=estilo_tabla))
     story.append(Spacer(1, 0.2 * inch))
 
 
@@ -506,17 +1961,259 @@ def generar_reporte_pdf(mejor_penalizacion, mejor_asignacion, kpis, graficos_pat
 
     doc.build(story)
     print(f"Reporte PDF generado en: '{nombre_archivo}'")
+    return nombre_archivo
+
+
+# ==============================================================================
+# ETAPA DE REPORTES EN SEGUNDO PLANO
+# ==============================================================================
+
+def _inicializar_trabajador_reportes(formatos_reporte=FORMATOS_REPORTE_POR_DEFECTO):
+    """
+    Importa una sola vez las librerías de los reportes pedidos en un proceso
+    trabajador. Los gráficos usan el backend no interactivo Agg.
+    """
+    if 'excel' in formatos_reporte:
+        import openpyxl  # noqa: F401
+    if 'parquet' in formatos_reporte:
+        import pyarrow.parquet  # noqa: F401
+    if 'graficos' in formatos_reporte or 'pdf' in formatos_reporte:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot  # noqa: F401
+    if 'pdf' in formatos_reporte:
+        import reportlab.platypus  # noqa: F401
+
+
+def _datos_reporte(datos):
+    """Parte de los datos de la instancia que usan los reportes (para enviarla a otro proceso)."""
+    return {'employees': datos['employees'], 'dias_por_empleado': datos['dias_por_empleado']}
+
+
+def _ejecutar_pdf(pool, futuro_pdf, futuros_graficos, argumentos):
+    """Lanza el PDF en `pool` cuando terminan sus gráficos y pasa su resultado a `futuro_pdf`."""
+    import threading
+
+    pendientes = [len(futuros_graficos)]
+    candado = threading.Lock()
+
+    def lanzar(_):
+        with candado:
+            pendientes[0] -= 1
+            if pendientes[0] > 0:
+                return
+        try:
+            rutas = [ruta for ruta in (f.result() for f in futuros_graficos) if ruta]
+            futuro = pool.submit(generar_reporte_pdf, *argumentos[:3], rutas, argumentos[3])
+        except Exception as e:
+            futuro_pdf.set_exception(e)
+            return
+        futuro.add_done_callback(lambda f: futuro_pdf.set_exception(f.exception()) if f.exception()
+                                 else futuro_pdf.set_result(f.result()))
+
+    for futuro in futuros_graficos:
+        futuro.add_done_callback(lanzar)
+
+
+class TrabajoReportes:
+    """Reportes de una solución que se están generando en una `EtapaReportes`."""
+
+    def __init__(self, directorio_salida, futuros):
+        self.directorio_salida = directorio_salida
+        self.futuros = futuros  # Formato -> Future
+
+    def terminado(self):
+        return all(futuro.done() for futuro in self.futuros.values())
+
+    def esperar(self):
+        """Espera a que terminen y retorna {formato: ruta o rutas}. Propaga el primer error."""
+        return {formato: futuro.result() for formato, futuro in self.futuros.items()}
+
+
+class EtapaReportes:
+    """
+    Genera los reportes en un pool de procesos, separado del solver. Cada
+    reporte es una tarea: JSON, Excel, CSV, etc. y cada gráfico (con Agg) corren
+    en paralelo, y el PDF se lanza cuando sus gráficos están listos. `enviar`
+    retorna de inmediato un `TrabajoReportes`; `cerrar` (o salir del bloque
+    `with`) espera a que terminen todos.
+    """
+
+    def __init__(self, num_trabajadores=TRABAJADORES_REPORTES, formatos_reporte=FORMATOS_REPORTE_POR_DEFECTO):
+        self.pool = ProcessPoolExecutor(max(1, num_trabajadores), initializer=_inicializar_trabajador_reportes,
+                                        initargs=(tuple(formatos_reporte),))
+        self.trabajos = []
+
+    def enviar(self, mejor_penalizacion, mejor_asignacion, datos, kpis, directorio_salida=".",
+               formatos_reporte=FORMATOS_REPORTE_POR_DEFECTO):
+        """Encola los reportes de `formatos_reporte` de una solución y retorna su `TrabajoReportes`."""
+        from concurrent.futures import Future
+
+        os.makedirs(directorio_salida, exist_ok=True)
+        asignacion = dict(mejor_asignacion)
+        ruta = lambda nombre: os.path.join(directorio_salida, nombre)
+        futuros = {}
+        if 'json' in formatos_reporte:
+            futuros['json'] = self.pool.submit(generar_reporte_json, asignacion, _datos_reporte(datos), ruta("reporte_asignaciones.json"))
+        if 'jsonl' in formatos_reporte:
+            futuros['jsonl'] = self.pool.submit(generar_reporte_jsonl, asignacion, ruta("reporte_asignaciones.jsonl"))
+        if 'csv' in formatos_reporte:
+            futuros['csv'] = self.pool.submit(generar_reporte_csv, asignacion, ruta("reporte_asignaciones.csv"))
+        if 'parquet' in formatos_reporte:
+            futuros['parquet'] = self.pool.submit(generar_reporte_parquet, asignacion, ruta("reporte_asignaciones.parquet"))
+        if 'excel' in formatos_reporte:
+            futuros['excel'] = self.pool.submit(generar_reporte_excel, asignacion, kpis, ruta("reporte_asignaciones.xlsx"))
+        if 'graficos' in formatos_reporte or 'pdf' in formatos_reporte:
+            futuros_graficos = [self.pool.submit(grafico, kpis, directorio_salida) for grafico in GRAFICOS]
+            if 'graficos' in formatos_reporte:
+                for grafico, futuro in zip(GRAFICOS, futuros_graficos):
+                    futuros[grafico.__name__] = futuro
+            if 'pdf' in formatos_reporte:
+                futuros['pdf'] = Future()
+                _ejecutar_pdf(self.pool, futuros['pdf'], futuros_graficos,
+                              (mejor_penalizacion, asignacion, kpis, ruta("reporte_final.pdf")))
+        trabajo = TrabajoReportes(directorio_salida, futuros)
+        self.trabajos.append(trabajo)
+        return trabajo
+
+    def cerrar(self):
+        """Espera a que terminen todos los reportes encolados y cierra el pool."""
+        try:
+            for trabajo in self.trabajos:
+                for futuro in trabajo.futuros.values():
+                    futuro.exception()
+        finally:
+            self.pool.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+# ==============================================================================
+# INSTRUMENTACIÓN
+# ==============================================================================
+
+# Fases de una generación cuyo tiempo se mide en los registros
+FASES_GENERACION = ('evaluacion', 'busqueda_local', 'seleccion', 'cruce', 'mutacion', 'reparacion', 'migracion')
+
+
+def registro_generacion(generacion, penalizaciones, mejor_global, tiempos, duracion, tiempo_total):
+    """
+    Construye el registro de una generación: penalización mejor, media y peor de
+    la población, mejor penalización global, diversidad (fracción de
+    penalizaciones distintas en la población), segundos por fase
+    ('tiempo_<fase>'), individuos evaluados por segundo y segundos acumulados.
+    """
+    registro = {
+        'generacion': generacion,
+        'tiempo_total': tiempo_total,
+        'mejor': min(penalizaciones),
+        'media': sum(penalizaciones) / len(penalizaciones),
+        'peor': max(penalizaciones),
+        'mejor_global': mejor_global,
+        'diversidad': len(set(penalizaciones)) / len(penalizaciones),
+        'evaluaciones': len(penalizaciones),
+        'evaluaciones_por_segundo': len(penalizaciones) / duracion if duracion > 0 else None,
+        'duracion': duracion,
+    }
+    for fase in FASES_GENERACION:
+        registro[f'tiempo_{fase}'] = tiempos.get(fase, 0.0)
+    return registro
+
+
+class RegistroJSONL:
+    """
+    Callback que escribe cada registro de generación como una línea JSON. El
+    archivo se abre (y se trunca) con el primer registro.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._archivo = None
+
+    def __call__(self, registro):
+        if self._archivo is None:
+            self._archivo = open(self.ruta, 'w')
+        self._archivo.write(json.dumps(registro) + "\n")
+        self._archivo.flush()
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+
+class ConsolaProgreso:
+    """
+    Callback que imprime un resumen de la generación como máximo cada
+    `intervalo` segundos (y siempre la primera), con el reparto del tiempo por fase.
+    """
+
+    def __init__(self, intervalo=5.0):
+        self.intervalo = intervalo
+        self._ultima_impresion = None
+
+    def __call__(self, registro):
+        ahora = time.monotonic()
+        if self._ultima_impresion is not None and ahora - self._ultima_impresion < self.intervalo:
+            return
+        self._ultima_impresion = ahora
+        duracion = registro['duracion'] or 1.0
+        fases = " ".join(f"{fase} {100 * registro[f'tiempo_{fase}'] / duracion:.0f}%"
+                         for fase in FASES_GENERACION if registro[f'tiempo_{fase}'] > 0)
+        prefijo = f"[isla {registro['isla']}] " if 'isla' in registro else ""
+        velocidad = registro['evaluaciones_por_segundo']
+        print(f"{prefijo}Generación {registro['generacion']} ({registro['tiempo_total']:.1f}s): "
+              f"mejor {registro['mejor']} (global {registro['mejor_global']}), media {registro['media']:.0f}, "
+              f"peor {registro['peor']}, diversidad {registro['diversidad']:.2f}, "
+              f"{velocidad or 0:.0f} eval/s | {fases}")
 
 
 # ==============================================================================
 # BUCLE PRINCIPAL DEL ALGORITMO 
 # ==============================================================================
 
-def ejecutar_algoritmo_genetico(datos):
+# Parámetros del algoritmo genético que se pueden cambiar en tiempo de ejecución
+PARAMETROS_CONFIGURABLES = (
+    'POBLACION_SIZE', 'GENERACIONES', 'TASA_CRUCE', 'TASA_MUTACION', 'ELITISMO_COUNT', 'TOURNAMENT_SIZE',
+    'TASA_MUTACION_ESCRITORIO_REL', 'TASA_MUTACION_DIA_REL', 'TASA_MUTACION_ELIMINACION_REL', 'TASA_MUTACION_ADICION',
+    'OPERADOR_CRUCE', 'BUSQUEDA_LOCAL', 'FRACCION_BUSQUEDA_LOCAL', 'TIEMPO_BUSQUEDA_LOCAL',
+    'PROPORCION_INICIAL_GRUPAL', 'PROPORCION_INICIAL_REGRET',
+    'CONTROL_ADAPTATIVO', 'TASA_APRENDIZAJE_ADAPTATIVO', 'PROBABILIDAD_MINIMA_OPERADOR', 'UMBRAL_DIVERSIDAD',
+    'FACTOR_MUTACION_MAXIMO', 'MULTIOBJETIVO',
+)
+
+
+def parametros_algoritmo():
+    """Retorna los valores actuales de PARAMETROS_CONFIGURABLES."""
+    return {nombre: globals()[nombre] for nombre in PARAMETROS_CONFIGURABLES}
+
+
+def configurar_parametros(**parametros):
     """
-    Orquesta la ejecución completa del algoritmo genético.
+    Sustituye parámetros del algoritmo genético (por ejemplo GENERACIONES=100).
+    Los procesos de islas reciben los valores vigentes al crearse.
+    """
+    for nombre, valor in parametros.items():
+        if nombre not in PARAMETROS_CONFIGURABLES:
+            raise ValueError(f"Parámetro desconocido: '{nombre}'")
+        globals()[nombre] = valor
+
+
+def preprocesar_datos(datos):
+    """
+    Desempaqueta el JSON de entrada y añade las estructuras preprocesadas que usan
+    el algoritmo y los reportes. Modifica y retorna el mismo diccionario.
     """
-    # Desempaquetar datos y añadir estructuras preprocesadas
     datos['employees'] = datos.get("Employees", [])
     datos['desks'] = datos.get("Desks", [])
     datos['days'] = datos.get("Days", [])
@@ -529,47 +2226,1128 @@ def ejecutar_algoritmo_genetico(datos):
     datos['zona_por_escritorio'] = {d: z for z, dl in datos['desks_por_zona'].items() for d in dl}
     datos['grupo_por_empleado'] = {e: g for g, ml in datos['empleados_por_grupo'].items() for e in ml}
 
-    # 1. Inicialización de la Población
-    print("Generando población inicial...")
-    poblacion = [crear_individuo(datos['employees'], datos['days'], datos['dias_por_empleado'], datos['escritorios_por_empleado']) for _ in range(POBLACION_SIZE)]
+    # Estructuras para la evaluación incremental
+    datos['conjunto_empleados'] = frozenset(datos['employees'])
+    datos['escritorios_permitidos'] = {e: frozenset(dl) for e, dl in datos['escritorios_por_empleado'].items()}
+    datos['dias_preferidos'] = {e: frozenset(dl) for e, dl in datos['dias_por_empleado'].items()}
+    # Días en que puede haber asignaciones: Days y los días preferidos fuera de él (`crear_individuo` también los usa)
+    dias_evaluacion = list(datos['days'])
+    for dl in datos['dias_por_empleado'].values():
+        dias_evaluacion += [d for d in dl if d not in dias_evaluacion]
+    datos['dias_evaluacion'] = dias_evaluacion
+    grupos_de_empleado = defaultdict(list)
+    for g, ml in datos['empleados_por_grupo'].items():
+        for e in ml:
+            grupos_de_empleado[e].append(g)
+    datos['grupos_de_empleado'] = dict(grupos_de_empleado)
+
+    # Replanificación (ver `preparar_replanificacion`): plan anterior conservado y costo de cambiarlo
+    datos.setdefault('plan_anterior', {})
+    datos.setdefault('penalizacion_cambio', 0)
+
+    # Índices enteros y tablas para la evaluación vectorizada
+    datos['codificacion'] = codificar_instancia(datos)
+
+    # Índice de bits para los operadores genéticos (mismo orden de escritorios)
+    datos['indice'] = IndiceInstancia(
+        datos['escritorios_por_empleado'], datos['codificacion']['escritorios'],
+        datos['zona_por_escritorio'], datos['empleados_por_grupo'], datos['dias_por_empleado'], datos['days'])
+    return datos
+
+
+def preparar_poblacion(poblacion, datos, modo_evaluacion=MODO_EVALUACION):
+    """Adapta individuos en forma de diccionario al modo de evaluación elegido."""
+    if modo_evaluacion == 'incremental':
+        return [ind if isinstance(ind, AsignacionIncremental) else AsignacionIncremental(ind, datos) for ind in poblacion]
+    return [ind if isinstance(ind, AsignacionIndexada) else AsignacionIndexada(ind, datos['indice']) for ind in poblacion]
+
+
+def siguiente_generacion(puntuaciones_y_individuos, datos, tamano_poblacion=None, tiempos=None, control=None):
+    """
+    Construye la siguiente población (élite, torneo, cruce y mutación) a partir
+    de la lista (individuo, penalización) ordenada de menor a mayor penalización.
+    Por defecto la población tiene POBLACION_SIZE individuos. Si se da el
+    diccionario `tiempos`, suma en sus claves 'seleccion', 'cruce', 'mutacion' y
+    'reparacion' los segundos de cada fase. Con un `ControlAdaptativo`, las tasas
+    salen de él y se le registra con qué operadores se creó cada hijo.
+    """
+    tamano_poblacion = tamano_poblacion or POBLACION_SIZE
+    tiempos = tiempos if tiempos is not None else {}
+    for fase in ('seleccion', 'cruce', 'mutacion', 'reparacion'):
+        tiempos.setdefault(fase, 0.0)
+    escritorios_por_empleado, indice = datos['escritorios_por_empleado'], datos['indice']
+    nueva_poblacion = [ind for ind, score in puntuaciones_y_individuos[:ELITISMO_COUNT]]
+    reloj = time.perf_counter
+    tasas = control.tasas() if control is not None else None
+    tasa_cruce = tasas['cruce'] if tasas is not None else TASA_CRUCE
+
+    while len(nueva_poblacion) < tamano_poblacion:
+        t0 = reloj()
+        padre1, penalizacion1 = _torneo(puntuaciones_y_individuos)
+        padre2, penalizacion2 = _torneo(puntuaciones_y_individuos)
+        t1 = reloj()
+        tiempos['seleccion'] += t1 - t0
+
+        cruzado = random.random() < tasa_cruce
+        if cruzado:
+            hijo = cruzar(padre1, padre2, escritorios_por_empleado, indice, reparar=False)
+            penalizacion_padre = min(penalizacion1, penalizacion2)
+            t2 = reloj()
+            tiempos['cruce'] += t2 - t1
+            hijo = reparar_individuo(hijo, escritorios_por_empleado, indice)
+            t1 = reloj()
+            tiempos['reparacion'] += t1 - t2
+        else:
+            # Sin copia: mutar copia al escribir y nunca modifica al padre
+            hijo, penalizacion_padre = random.choice([(padre1, penalizacion1), (padre2, penalizacion2)])
+
+        aplicados = set() if control is not None else None
+        hijo_mutado = mutar(hijo, datos['employees'], datos['days'], escritorios_por_empleado, indice, reparar=False,
+                            tasas=tasas, aplicados=aplicados)
+        if control is not None:
+            control.registrar_hijo(len(nueva_poblacion), cruzado, aplicados, penalizacion_padre)
+        t2 = reloj()
+        tiempos['mutacion'] += t2 - t1
+        nueva_poblacion.append(reparar_individuo(hijo_mutado, escritorios_por_empleado, indice))
+        tiempos['reparacion'] += reloj() - t2
+
+    return nueva_poblacion
 
+
+def calcular_cota_inferior(datos):
+    """
+    Calcula una cota inferior barata de la penalización alcanzable en la instancia:
+    empleados sin escritorios permitidos, empleados sin días preferidos (pagan al
+    menos un día no preferido) y días en que la demanda preferida supera los
+    escritorios que esos empleados pueden usar. Los días son los de
+    `datos['dias_evaluacion']`: los preferidos fuera de Days también se pueden asignar.
+    """
+    days = set(datos['dias_evaluacion'])
+    escritorios_permitidos = datos['escritorios_permitidos']
+    dias_preferidos = datos['dias_preferidos']
+    cota = 0
+    demandantes_por_dia = defaultdict(list)
+
+    for e in datos['employees']:
+        preferidos_e = dias_preferidos.get(e, frozenset())
+        if not escritorios_permitidos.get(e) or not days:
+            # Sin asignación (5000 + días preferidos perdidos) o en escritorio no permitido (10000)
+            cota += min(5000 + 200 * len(preferidos_e), 10000)
+            continue
+        if not preferidos_e:
+            cota += 100
+        for d in preferidos_e:
+            demandantes_por_dia[d].append(e)
+
+    for d, demandantes in demandantes_por_dia.items():
+        capacidad = len(set().union(*(escritorios_permitidos[e] for e in demandantes)))
+        cota += 200 * max(0, len(demandantes) - capacidad)
+    return cota
+
+
+def _verificar_parada(criterios_parada, mejor_penalizacion, generaciones_sin_mejora, segundos, generacion=0):
+    """Retorna el motivo de parada si se cumple algún criterio, o None para continuar."""
+    cota_inferior = criterios_parada.get('cota_inferior')
+    if cota_inferior is not None and mejor_penalizacion <= cota_inferior:
+        return 'cota_inferior'
+    penalizacion_objetivo = criterios_parada.get('penalizacion_objetivo')
+    if penalizacion_objetivo is not None and mejor_penalizacion <= penalizacion_objetivo:
+        return 'penalizacion_objetivo'
+    max_sin_mejora = criterios_parada.get('max_generaciones_sin_mejora')
+    if max_sin_mejora is not None and generaciones_sin_mejora >= max_sin_mejora:
+        return 'estancamiento'
+    max_generaciones = criterios_parada.get('max_generaciones')
+    if max_generaciones is not None and generacion >= max_generaciones:
+        return 'max_generaciones'
+    tiempo_limite = criterios_parada.get('tiempo_limite')
+    if tiempo_limite is not None and segundos >= tiempo_limite:
+        return 'tiempo_limite'
+    return None
+
+
+def evolucionar_poblacion(poblacion, datos, modo_evaluacion=MODO_EVALUACION, evaluador=None, criterios_parada=None,
+                          migrar=None, mostrar_progreso=True, callbacks=(), cache=None, archivo_punto_control=None,
+                          intervalo_punto_control=INTERVALO_PUNTO_CONTROL, estado_inicial=None):
+    """
+    Ejecuta el bucle de generaciones sobre una población inicial hasta completar
+    GENERACIONES o cumplir alguno de los `criterios_parada` (claves
+    'max_generaciones_sin_mejora', 'max_generaciones', 'tiempo_limite',
+    'penalizacion_objetivo' y 'cota_inferior'). Si se da `migrar`, se llama al final de cada generación con
+    (generación, puntuaciones_y_individuos) y retorna la lista usada para la selección.
+    Al final de cada generación se llama a cada función de `callbacks` con el
+    registro de `registro_generacion`. Con BUSQUEDA_LOCAL, tras evaluar se aplica
+    el paso memético (`intensificar_poblacion`). Con CONTROL_ADAPTATIVO, las tasas
+    de los operadores las ajusta un `ControlAdaptativo` y van en los registros.
+    Salvo en el modo 'incremental', las penalizaciones se memorizan en `cache`
+    (por defecto, una `CacheFitness` nueva de TAMANO_CACHE_FITNESS entradas).
+
+    Con `archivo_punto_control`, cada `intervalo_punto_control` generaciones y al
+    parar por `tiempo_limite` se guarda el estado (`guardar_punto_control`). Con
+    `estado_inicial` (un estado de `cargar_punto_control`) se ignora `poblacion`
+    y la ejecución continúa exactamente donde se guardó; el límite de tiempo
+    cuenta desde la reanudación, lo que permite ejecutar por tramos.
+
+    Retorna un diccionario con la mejor penalización y asignación, la generación en
+    la que se detuvo, el motivo de parada, los individuos evaluados y los segundos
+    hasta que la mejor solución fue factible por primera vez (None si nunca lo fue),
+    y en 'cache' las estadísticas de la caché (None si no se usó).
+    """
+    criterios_parada = criterios_parada or {}
+    if cache is None and modo_evaluacion != 'incremental' and TAMANO_CACHE_FITNESS:
+        cache = CacheFitness(TAMANO_CACHE_FITNESS)
+    inicio = time.perf_counter()
     mejor_asignacion_global = None
     mejor_penalizacion_global = float('inf')
-
-    # 2. Bucle de Generaciones
-    for gen in range(GENERACIONES):
-        puntuaciones_y_individuos = [(ind, calcular_fitness(ind, datos)) for ind in poblacion]
+    tiempo_primera_factible = None
+    evaluaciones = 0
+    generaciones_sin_mejora = 0
+    generacion_parada = 0
+    motivo_parada = 'generaciones_completadas'
+    control = ControlAdaptativo() if CONTROL_ADAPTATIVO else None
+    primera_generacion = 0
+    tiempo_previo = 0.0
+    if estado_inicial is not None:
+        poblacion = preparar_poblacion(estado_inicial['poblacion'], datos, modo_evaluacion)
+        if estado_inicial['mejor_asignacion'] is not None:
+            mejor_asignacion_global = preparar_poblacion([estado_inicial['mejor_asignacion']], datos, modo_evaluacion)[0]
+        mejor_penalizacion_global = estado_inicial['mejor_penalizacion']
+        tiempo_primera_factible = estado_inicial['tiempo_primera_factible']
+        evaluaciones = estado_inicial['evaluaciones']
+        generaciones_sin_mejora = estado_inicial['generaciones_sin_mejora']
+        control = estado_inicial['control']
+        primera_generacion = generacion_parada = estado_inicial['generacion']
+        tiempo_previo = estado_inicial['tiempo']
+        random.setstate(estado_inicial['estado_aleatorio'])
+
+    def estado_actual(generacion):
+        return {
+            'generacion': generacion,
+            'poblacion': poblacion,
+            'mejor_penalizacion': mejor_penalizacion_global,
+            'mejor_asignacion': mejor_asignacion_global,
+            'tiempo_primera_factible': tiempo_primera_factible,
+            'evaluaciones': evaluaciones,
+            'generaciones_sin_mejora': generaciones_sin_mejora,
+            'control': control,
+            'tiempo': tiempo_previo + time.perf_counter() - inicio,
+            'estado_aleatorio': random.getstate(),
+        }
+
+    for gen in range(primera_generacion, GENERACIONES):
+        generacion_parada = gen + 1
+        inicio_generacion = time.perf_counter()
+        tiempos = dict.fromkeys(FASES_GENERACION, 0.0)
+        puntuaciones_y_individuos = list(zip(poblacion, evaluar_poblacion(poblacion, datos, modo_evaluacion, evaluador, cache)))
+        if control is not None:
+            control.actualizar([score for _, score in puntuaciones_y_individuos])
         puntuaciones_y_individuos.sort(key=lambda x: x[1])
+        evaluaciones += len(poblacion)
+        tiempos['evaluacion'] = time.perf_counter() - inicio_generacion
+        if BUSQUEDA_LOCAL:
+            inicio_busqueda = time.perf_counter()
+            puntuaciones_y_individuos = intensificar_poblacion(puntuaciones_y_individuos, datos)
+            tiempos['busqueda_local'] = time.perf_counter() - inicio_busqueda
+        penalizaciones = [score for _, score in puntuaciones_y_individuos]
 
         mejor_individuo_actual, mejor_penalizacion_actual = puntuaciones_y_individuos[0]
 
         if mejor_penalizacion_actual < mejor_penalizacion_global:
             mejor_penalizacion_global = mejor_penalizacion_actual
-            mejor_asignacion_global = copy.deepcopy(mejor_individuo_actual)
+            # Los individuos no se modifican una vez creados: basta guardar la referencia
+            mejor_asignacion_global = mejor_individuo_actual
+            generaciones_sin_mejora = 0
+            if tiempo_primera_factible is None and es_factible(mejor_asignacion_global, datos):
+                tiempo_primera_factible = tiempo_previo + time.perf_counter() - inicio
+        else:
+            generaciones_sin_mejora += 1
+
+        if mostrar_progreso:
+            print(f"Generación {gen + 1}/{GENERACIONES}: Mejor Penalización = {mejor_penalizacion_actual}")
+
+        motivo = _verificar_parada(criterios_parada, mejor_penalizacion_global, generaciones_sin_mejora, time.perf_counter() - inicio,
+                                   gen + 1)
+        # Una pausa por tiempo con punto de control sigue como si no parara, para poder reanudar
+        pausa = motivo == 'tiempo_limite' and archivo_punto_control is not None and gen + 1 < GENERACIONES
+        if motivo is None or pausa:
+            if migrar is not None:
+                inicio_migracion = time.perf_counter()
+                puntuaciones_y_individuos = migrar(gen + 1, puntuaciones_y_individuos)
+                tiempos['migracion'] = time.perf_counter() - inicio_migracion
+            poblacion = siguiente_generacion(puntuaciones_y_individuos, datos, tiempos=tiempos, control=control)
+            if archivo_punto_control is not None and (pausa or (gen + 1) % intervalo_punto_control == 0):
+                guardar_punto_control(archivo_punto_control, estado_actual(gen + 1), datos)
+                if pausa:
+                    print(f"Punto de control guardado en '{archivo_punto_control}' (generación {gen + 1})")
+
+        if callbacks:
+            ahora = time.perf_counter()
+            registro = registro_generacion(gen + 1, penalizaciones, mejor_penalizacion_global, tiempos,
+                                           ahora - inicio_generacion, tiempo_previo + ahora - inicio)
+            if control is not None:
+                registro.update(control.estado())
+            for callback in callbacks:
+                callback(registro)
+
+        if motivo is not None:
+            motivo_parada = motivo
+            break
+
+    return {
+        'mejor_penalizacion': mejor_penalizacion_global,
+        'mejor_asignacion': mejor_asignacion_global,
+        'generacion_parada': generacion_parada,
+        'motivo_parada': motivo_parada,
+        'tiempo': tiempo_previo + time.perf_counter() - inicio,
+        'evaluaciones': evaluaciones,
+        'tiempo_primera_factible': tiempo_primera_factible,
+        'cache': cache.estadisticas() if cache is not None and modo_evaluacion != 'incremental' else None,
+    }
+
+# ==============================================================================
+# PUNTOS DE CONTROL
+# ==============================================================================
+
+CABECERA_PUNTO_CONTROL = b'ASOCIO-PC1\n'  # Identifica el formato del archivo de punto de control
+
+
+def huella_instancia(datos):
+    """Resumen SHA-256 de la instancia (y del plan anterior de una replanificación) para validar un punto de control."""
+    import hashlib
+
+    claves = ("Employees", "Desks", "Days", "Groups", "Zones", "Desks_Z", "Desks_E", "Employees_G", "Days_E")
+    contenido = json.dumps([datos.get(clave) for clave in claves], sort_keys=True, ensure_ascii=False)
+    contenido += repr((sorted((datos.get('plan_anterior') or {}).items()), datos.get('penalizacion_cambio', 0)))
+    return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+
+def guardar_punto_control(ruta, estado, datos):
+    """
+    Guarda el estado de `evolucionar_poblacion` (población, mejor solución,
+    contadores, control adaptativo y estado de `random`) junto con la huella de
+    la instancia y los parámetros del algoritmo, como pickle comprimido con zlib.
+    La escritura es atómica: se escribe un archivo temporal que luego reemplaza
+    al anterior, de modo que una interrupción nunca deja un punto de control a medias.
+    """
+    import pickle
+    import zlib
+
+    contenido = dict(estado, huella=huella_instancia(datos), parametros=parametros_algoritmo())
+    datos_binarios = zlib.compress(pickle.dumps(contenido, protocol=pickle.HIGHEST_PROTOCOL), 6)
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'wb') as f:
+        f.write(CABECERA_PUNTO_CONTROL)
+        f.write(datos_binarios)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporal, ruta)
+    return ruta
+
+
+def cargar_punto_control(ruta, datos=None):
+    """
+    Lee un punto de control de `guardar_punto_control`. Si se da `datos`,
+    verifica que sea de la misma instancia y que los parámetros del algoritmo
+    (salvo GENERACIONES, que puede ampliarse al reanudar) coincidan con los
+    actuales; si no, lanza ValueError.
+
+    El contenido es un pickle: cargarlo puede ejecutar código arbitrario, así
+    que sólo deben reanudarse puntos de control de una fuente de confianza (los
+    que escribió la propia ejecución). La cabecera sólo evita abrir por error
+    otro tipo de archivo, no protege contra uno manipulado.
+    """
+    import pickle
+    import zlib
+
+    with open(ruta, 'rb') as f:
+        cabecera = f.read(len(CABECERA_PUNTO_CONTROL))
+        if cabecera != CABECERA_PUNTO_CONTROL:
+            raise ValueError(f"'{ruta}' no es un punto de control")
+        estado = pickle.loads(zlib.decompress(f.read()))
+    if datos is not None:
+        if estado['huella'] != huella_instancia(datos):
+            raise ValueError(f"El punto de control '{ruta}' es de otra instancia")
+        distintos = sorted(nombre for nombre, valor in parametros_algoritmo().items()
+                           if nombre != 'GENERACIONES' and estado['parametros'].get(nombre) != valor)
+        if distintos:
+            raise ValueError(f"El punto de control '{ruta}' usa otros parámetros: {', '.join(distintos)}")
+    return estado
+
+# ==============================================================================
+# MODO MULTIOBJETIVO (NSGA-II)
+# ==============================================================================
+
+def ordenar_no_dominados(objetivos, violaciones=None):
+    """
+    Ordenamiento no dominado rápido de NSGA-II, vectorizado sobre la población:
+    retorna el número de frente (0 = no dominados) de cada fila de la matriz
+    `objetivos` (a minimizar). Con `violaciones`, se usa la dominancia con
+    restricciones: entre dos individuos factibles (violación 0) decide Pareto y
+    si no, domina el de menor violación.
+    """
+    objetivos = np.asarray(objetivos)
+    n = len(objetivos)
+    menor_o_igual = (objetivos[:, None, :] <= objetivos[None, :, :]).all(axis=2)
+    menor = (objetivos[:, None, :] < objetivos[None, :, :]).any(axis=2)
+    domina = menor_o_igual & menor  # domina[i, j]: i domina a j
+    if violaciones is not None:
+        violaciones = np.asarray(violaciones)
+        factibles = violaciones == 0
+        domina = np.where(factibles[:, None] & factibles[None, :], domina, violaciones[:, None] < violaciones[None, :])
+
+    dominadores = domina.sum(axis=0)
+    rangos = np.full(n, -1, dtype=np.int64)
+    frente = np.flatnonzero(dominadores == 0)
+    rango = 0
+    while frente.size:
+        rangos[frente] = rango
+        dominadores -= domina[frente].sum(axis=0)
+        dominadores[frente] = -1
+        frente = np.flatnonzero(dominadores == 0)
+        rango += 1
+    return rangos
+
+
+def distancia_crowding(objetivos, rangos):
+    """
+    Distancia de crowding de NSGA-II de cada individuo dentro de su frente:
+    suma, por objetivo, de la distancia normalizada entre sus vecinos. Los
+    extremos de cada objetivo reciben infinito.
+    """
+    objetivos = np.asarray(objetivos, dtype=np.float64)
+    distancia = np.zeros(len(objetivos))
+    for rango in np.unique(rangos):
+        miembros = np.flatnonzero(rangos == rango)
+        valores = objetivos[miembros]
+        orden = np.argsort(valores, axis=0, kind='stable')
+        ordenados = np.take_along_axis(valores, orden, axis=0)
+        amplitud = ordenados[-1] - ordenados[0]
+        aporte = np.zeros_like(valores)
+        if len(miembros) > 2:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                interior = (ordenados[2:] - ordenados[:-2]) / amplitud
+            np.put_along_axis(aporte, orden[1:-1], np.where(amplitud > 0, interior, 0.0), axis=0)
+        np.put_along_axis(aporte, orden[[0, -1]], np.inf, axis=0)
+        distancia[miembros] = aporte.sum(axis=1)
+    return distancia
+
+
+def seleccionar_nsga2(objetivos, violaciones, cantidad):
+    """
+    Reemplazo de NSGA-II: retorna las posiciones de los `cantidad` mejores
+    individuos por frente y, dentro del último frente que entra, por distancia
+    de crowding, ordenadas de mejor a peor, junto con sus rangos y distancias.
+    """
+    rangos = ordenar_no_dominados(objetivos, violaciones)
+    distancia = distancia_crowding(objetivos, rangos)
+    orden = np.lexsort((-distancia, rangos))[:cantidad]
+    return orden, rangos[orden], distancia[orden]
+
+
+def evaluar_objetivos(poblacion, datos):
+    """Matriz población x OBJETIVOS de la población (`calcular_objetivos_poblacion`)."""
+    codificacion = datos['codificacion']
+    return calcular_objetivos_poblacion(poblacion_a_tensor(poblacion, codificacion), codificacion)
+
+
+def evolucionar_nsga2(poblacion, datos, criterios_parada=None, mostrar_progreso=True, callbacks=()):
+    """
+    Variante multiobjetivo de `evolucionar_poblacion` al estilo NSGA-II: minimiza
+    a la vez los componentes blandos de OBJETIVOS (días preferidos, reuniones,
+    aislamiento y escritorio) y trata las restricciones duras como violación.
+
+    Cada generación crea los hijos con los mismos operadores
+    (`siguiente_generacion`, con la población ordenada por frente y crowding
+    como puntuación del torneo), junta padres e hijos y conserva los mejores
+    según `seleccionar_nsga2`. Los `criterios_parada` y `callbacks` se aplican
+    sobre la penalización ponderada (la suma de los objetivos); los registros
+    llevan además 'tamano_frente'.
+
+    Retorna lo mismo que `evolucionar_poblacion` (la mejor asignación es la del
+    frente con menor penalización ponderada) y en 'frente' los planes no
+    dominados con objetivos distintos, como diccionarios con 'asignacion',
+    'objetivos' y 'penalizacion', de menor a mayor penalización.
+    """
+    criterios_parada = criterios_parada or {}
+    inicio = time.perf_counter()
+    poblacion = preparar_poblacion(poblacion, datos, 'vectorizado')
+    tamano_poblacion = len(poblacion)
+    objetivos = evaluar_objetivos(poblacion, datos)
+    evaluaciones = tamano_poblacion
+    orden, rangos, _ = seleccionar_nsga2(objetivos[:, 1:], objetivos[:, 0], tamano_poblacion)
+    poblacion, objetivos = [poblacion[i] for i in orden], objetivos[orden]
+
+    mejor_penalizacion_global = float('inf')
+    mejor_asignacion_global = None
+    tiempo_primera_factible = None
+    generaciones_sin_mejora = 0
+    generacion_parada = 0
+    motivo_parada = 'generaciones_completadas'
+
+    for gen in range(GENERACIONES):
+        generacion_parada = gen + 1
+        inicio_generacion = time.perf_counter()
+        tiempos = dict.fromkeys(FASES_GENERACION, 0.0)
+
+        # Hijos con los operadores de siempre: la posición en el orden NSGA-II hace de puntuación
+        puntuaciones_y_individuos = list(zip(poblacion, range(tamano_poblacion)))
+        hijos = siguiente_generacion(puntuaciones_y_individuos, datos, tiempos=tiempos)[ELITISMO_COUNT:]
+        inicio_evaluacion = time.perf_counter()
+        objetivos_hijos = evaluar_objetivos(hijos, datos) if hijos else np.zeros((0, len(OBJETIVOS)), dtype=np.int64)
+        evaluaciones += len(hijos)
+
+        candidatos = poblacion + hijos
+        objetivos_candidatos = np.concatenate([objetivos, objetivos_hijos])
+        orden, rangos, _ = seleccionar_nsga2(objetivos_candidatos[:, 1:], objetivos_candidatos[:, 0], tamano_poblacion)
+        poblacion, objetivos = [candidatos[i] for i in orden], objetivos_candidatos[orden]
+        tiempos['evaluacion'] = time.perf_counter() - inicio_evaluacion
+
+        penalizaciones = objetivos.sum(axis=1).tolist()
+        posicion_mejor = min(range(tamano_poblacion), key=penalizaciones.__getitem__)
+        if penalizaciones[posicion_mejor] < mejor_penalizacion_global:
+            mejor_penalizacion_global = penalizaciones[posicion_mejor]
+            mejor_asignacion_global = poblacion[posicion_mejor]
+            generaciones_sin_mejora = 0
+            if tiempo_primera_factible is None and es_factible(mejor_asignacion_global, datos):
+                tiempo_primera_factible = time.perf_counter() - inicio
+        else:
+            generaciones_sin_mejora += 1
+
+        tamano_frente = int((rangos == 0).sum())
+        if mostrar_progreso:
+            print(f"Generación {gen + 1}/{GENERACIONES}: Frente = {tamano_frente} planes, "
+                  f"Mejor Penalización = {penalizaciones[posicion_mejor]}")
+
+        motivo = _verificar_parada(criterios_parada, mejor_penalizacion_global, generaciones_sin_mejora,
+                                   time.perf_counter() - inicio, gen + 1)
+        if callbacks:
+            ahora = time.perf_counter()
+            registro = registro_generacion(gen + 1, penalizaciones, mejor_penalizacion_global, tiempos,
+                                           ahora - inicio_generacion, ahora - inicio)
+            registro['tamano_frente'] = tamano_frente
+            for callback in callbacks:
+                callback(registro)
+        if motivo is not None:
+            motivo_parada = motivo
+            break
+
+    # Frente final: no dominados, un plan por vector de objetivos
+    frente = []
+    vistos = set()
+    for i in np.flatnonzero(rangos == 0):
+        clave = tuple(objetivos[i].tolist())
+        if clave not in vistos:
+            vistos.add(clave)
+            frente.append({'asignacion': poblacion[i], 'objetivos': dict(zip(OBJETIVOS, clave)), 'penalizacion': sum(clave)})
+    frente.sort(key=lambda plan: plan['penalizacion'])
+
+    return {
+        'mejor_penalizacion': mejor_penalizacion_global,
+        'mejor_asignacion': mejor_asignacion_global,
+        'generacion_parada': generacion_parada,
+        'motivo_parada': motivo_parada,
+        'tiempo': time.perf_counter() - inicio,
+        'evaluaciones': evaluaciones,
+        'tiempo_primera_factible': tiempo_primera_factible,
+        'cache': None,
+        'frente': frente,
+    }
+
+# ==============================================================================
+# MODELO DE ISLAS
+# ==============================================================================
+
+def _proceso_isla(id_isla, datos_json, semilla, modo_evaluacion, intervalo_migracion, num_migrantes, cola_salida, cola_entrada,
+                  individuos_semilla=(), criterios_parada=None, parametros=None, enviar_registros=False):
+    """
+    Evoluciona una isla en su propio proceso. Cada `intervalo_migracion`
+    generaciones envía sus `num_migrantes` mejores individuos al coordinador y
+    reemplaza sus peores individuos por los inmigrantes que recibe. Al terminar
+    (o al cumplir un criterio de parada) envía su resultado. `parametros` son los
+    del proceso coordinador (`parametros_algoritmo`). Con `enviar_registros`
+    también envía el registro de cada generación.
+    """
+    try:
+        configurar_parametros(**(parametros or {}))
+        random.seed(semilla)
+        datos = preprocesar_datos(datos_json)
+        poblacion = list(individuos_semilla)[:POBLACION_SIZE]
+        poblacion += crear_poblacion_inicial(datos, POBLACION_SIZE - len(poblacion))
+        poblacion = preparar_poblacion(poblacion, datos, modo_evaluacion)
+
+        def migrar(generacion, puntuaciones_y_individuos):
+            if generacion % intervalo_migracion != 0 or generacion >= GENERACIONES:
+                return puntuaciones_y_individuos
+            emigrantes = [(dict(ind), score) for ind, score in puntuaciones_y_individuos[:num_migrantes]]
+            cola_salida.put(('migracion', id_isla, generacion, emigrantes))
+            inmigrantes = preparar_poblacion([ind for ind, score in cola_entrada.get()], datos, modo_evaluacion)
+            if not inmigrantes:
+                return puntuaciones_y_individuos
+            puntuaciones_inmigrantes = evaluar_poblacion(inmigrantes, datos, modo_evaluacion)
+            puntuaciones_y_individuos = puntuaciones_y_individuos[:-len(inmigrantes)] + list(zip(inmigrantes, puntuaciones_inmigrantes))
+            puntuaciones_y_individuos.sort(key=lambda x: x[1])
+            return puntuaciones_y_individuos
+
+        def enviar_registro(registro):
+            cola_salida.put(('registro', id_isla, registro['generacion'], registro))
+
+        resultado = evolucionar_poblacion(poblacion, datos, modo_evaluacion, criterios_parada=criterios_parada,
+                                          migrar=migrar, mostrar_progreso=False,
+                                          callbacks=[enviar_registro] if enviar_registros else ())
+        resultado['mejor_asignacion'] = dict(resultado['mejor_asignacion'])
+        cola_salida.put(('fin', id_isla, resultado['generacion_parada'], resultado))
+    except Exception:
+        cola_salida.put(('error', id_isla, None, traceback.format_exc()))
+
+
+def _destinos_migracion(islas, topologia):
+    """Retorna, para cada isla de la lista, la isla que recibe sus emigrantes."""
+    if topologia == 'anillo' or len(islas) < 2:
+        return {isla: islas[(i + 1) % len(islas)] for i, isla in enumerate(islas)}
+    if topologia == 'aleatoria':
+        # Permutación sin puntos fijos para que ninguna isla se envíe a sí misma
+        while True:
+            destinos = list(islas)
+            random.shuffle(destinos)
+            if all(i != d for i, d in zip(islas, destinos)):
+                return dict(zip(islas, destinos))
+    raise ValueError(f"Topología de migración desconocida: '{topologia}'")
+
+
+def ejecutar_modelo_islas(datos, num_islas=NUM_ISLAS, intervalo_migracion=INTERVALO_MIGRACION,
+                          num_migrantes=NUM_MIGRANTES, topologia=TOPOLOGIA_MIGRACION,
+                          modo_evaluacion=MODO_EVALUACION, individuos_semilla=(), criterios_parada=None, callbacks=()):
+    """
+    Ejecuta `num_islas` copias independientes del algoritmo genético en procesos
+    separados, intercambiando élites según `topologia` ('anillo' o 'aleatoria')
+    cada `intervalo_migracion` generaciones. Los `individuos_semilla` se incluyen
+    en la población inicial de cada isla y cada isla aplica `criterios_parada`
+    por su cuenta. Retorna el resultado de la isla con la mejor penalización; su
+    'generacion_parada' es la última generación alcanzada por cualquier isla, sus
+    'evaluaciones' y las estadísticas de 'cache' suman las de todas y su
+    'tiempo_primera_factible' es el de la primera isla que encontró una solución
+    factible. Los registros de generación
+    de cada isla llegan a `callbacks` con la clave adicional 'isla'.
+    """
+    if modo_evaluacion == 'paralelo':
+        raise ValueError("El modelo de islas ya usa un proceso por isla; elija otro modo de evaluación.")
+    if topologia not in ('anillo', 'aleatoria'):
+        raise ValueError(f"Topología de migración desconocida: '{topologia}'")
+
+    cola_salida = multiprocessing.Queue()
+    colas_entrada = [multiprocessing.Queue() for _ in range(num_islas)]
+    procesos = [
+        multiprocessing.Process(target=_proceso_isla,
+                                args=(i, datos, random.randrange(2**32), modo_evaluacion, intervalo_migracion,
+                                      num_migrantes, cola_salida, colas_entrada[i], [dict(ind) for ind in individuos_semilla],
+                                      criterios_parada, parametros_algoritmo(), bool(callbacks)),
+                                daemon=True)
+        for i in range(num_islas)
+    ]
+    for proceso in procesos:
+        proceso.start()
+
+    mejor_resultado = None
+    generacion_parada = 0
+    evaluaciones = 0
+    tiempos_factible = []
+    estadisticas_cache = []
+    activas = set(range(num_islas))
+    try:
+        # Cada ronda recibe un mensaje de cada isla activa: sus emigrantes o su resultado final
+        while activas:
+            mensajes = {}
+            while len(mensajes) < len(activas):
+                tipo, id_isla, generacion, contenido = cola_salida.get()
+                if tipo == 'error':
+                    raise RuntimeError(f"La isla {id_isla} falló:\n{contenido}")
+                if tipo == 'registro':
+                    contenido['isla'] = id_isla
+                    for callback in callbacks:
+                        callback(contenido)
+                    continue
+                mensajes[id_isla] = (tipo, generacion, contenido)
+
+            emigrantes_por_isla = {}
+            for id_isla, (tipo, generacion, contenido) in sorted(mensajes.items()):
+                generacion_parada = max(generacion_parada, generacion)
+                if tipo == 'fin':
+                    activas.discard(id_isla)
+                    evaluaciones += contenido['evaluaciones']
+                    if contenido['cache'] is not None:
+                        estadisticas_cache.append(contenido['cache'])
+                    if contenido['tiempo_primera_factible'] is not None:
+                        tiempos_factible.append(contenido['tiempo_primera_factible'])
+                    if mejor_resultado is None or contenido['mejor_penalizacion'] < mejor_resultado['mejor_penalizacion']:
+                        mejor_resultado = contenido
+                else:
+                    emigrantes_por_isla[id_isla] = contenido
+
+            if emigrantes_por_isla:
+                destinos = _destinos_migracion(sorted(emigrantes_por_isla), topologia)
+                for origen, destino in destinos.items():
+                    colas_entrada[destino].put(emigrantes_por_isla[origen] if origen != destino else [])
+                mejores = {i: min((score for _, score in em), default=None) for i, em in sorted(emigrantes_por_isla.items())}
+                print(f"Migración en generación {generacion_parada}/{GENERACIONES}: Mejor Penalización por isla = {mejores}")
+    finally:
+        for proceso in procesos:
+            if proceso.is_alive():
+                proceso.terminate()
+            proceso.join()
+
+    mejor_resultado['generacion_parada'] = generacion_parada
+    mejor_resultado['evaluaciones'] = evaluaciones
+    mejor_resultado['tiempo_primera_factible'] = min(tiempos_factible, default=None)
+    mejor_resultado['cache'] = None
+    if estadisticas_cache:
+        aciertos = sum(e['aciertos'] for e in estadisticas_cache)
+        fallos = sum(e['fallos'] for e in estadisticas_cache)
+        mejor_resultado['cache'] = {'aciertos': aciertos, 'fallos': fallos,
+                                    'tasa_aciertos': aciertos / (aciertos + fallos) if aciertos + fallos else 0.0,
+                                    'entradas': sum(e['entradas'] for e in estadisticas_cache)}
+    return mejor_resultado
+
+# ==============================================================================
+# REPLANIFICACIÓN INCREMENTAL
+# ==============================================================================
+
+def diferenciar_instancias(datos_nuevos, reporte_anterior, datos_anteriores=None):
+    """
+    Compara el plan de `reporte_anterior` (el contenido de un
+    reporte_asignaciones.json) con la instancia `datos_nuevos` (JSON de entrada,
+    sin preprocesar). Un empleado queda afectado si es nuevo, si cambiaron sus
+    días preferidos, si alguna de sus asignaciones anteriores ya no es válida
+    (día o escritorio inexistente, escritorio no permitido o escritorio repetido
+    en el día) o, si se da la instancia `datos_anteriores`, si cambió de grupo.
+    Retorna un diccionario con 'plan_conservado' ((empleado, día) -> escritorio
+    de los empleados no afectados), 'afectados' (en el orden de la instancia),
+    'plan_afectados' (sus asignaciones anteriores, sin validar) y 'resumen'
+    (conteos por motivo).
+    """
+    empleados = datos_nuevos.get("Employees", [])
+    dias = set(datos_nuevos.get("Days", []))
+    permitidos = {e: set(dl) for e, dl in datos_nuevos.get("Desks_E", {}).items()}
+    dias_nuevos = {e: set(dl) for e, dl in datos_nuevos.get("Days_E", {}).items()}
+    if datos_anteriores is not None:
+        dias_anteriores = {e: set(dl) for e, dl in datos_anteriores.get("Days_E", {}).items()}
+    else:
+        dias_anteriores = {e: set(dl) for e, dl in reporte_anterior.get("dias_preferidos_por_empleado", {}).items()}
+
+    plan_anterior = defaultdict(dict)  # Empleado -> {día: escritorio}
+    for d, filas in reporte_anterior.get("asignaciones_por_dia", {}).items():
+        for fila in filas:
+            plan_anterior[fila["empleado"]][d] = fila["escritorio"]
+
+    motivos = defaultdict(set)
+    for e in empleados:
+        if e not in plan_anterior and e not in dias_anteriores:
+            motivos['nuevos'].add(e)
+        elif dias_nuevos.get(e, set()) != dias_anteriores.get(e, set()):
+            motivos['dias_preferidos'].add(e)
+    if datos_anteriores is not None:
+        grupos = lambda instancia: {e: g for g, ml in instancia.get("Employees_G", {}).items() for e in ml}
+        grupos_nuevos, grupos_anteriores = grupos(datos_nuevos), grupos(datos_anteriores)
+        motivos['grupo'] = {e for e in empleados if e in grupos_anteriores and grupos_nuevos.get(e) != grupos_anteriores[e]}
+
+    conjunto_empleados = set(empleados)
+    ocupados = set()  # (día, escritorio) ya tomados por el plan conservado
+    for e in empleados:
+        for d, desk in plan_anterior.get(e, {}).items():
+            if d not in dias or desk not in permitidos.get(e, ()) or (d, desk) in ocupados:
+                motivos['asignacion_invalida'].add(e)
+            else:
+                ocupados.add((d, desk))
+
+    afectados_conjunto = set().union(*motivos.values())
+    afectados = [e for e in empleados if e in afectados_conjunto]
+    plan_conservado = {(e, d): desk for e, dias_e in plan_anterior.items()
+                       if e in conjunto_empleados and e not in afectados_conjunto for d, desk in dias_e.items()}
+    plan_afectados = {(e, d): desk for e in afectados for d, desk in plan_anterior.get(e, {}).items()}
+    resumen = {motivo: len(motivos.get(motivo, ())) for motivo in ('nuevos', 'dias_preferidos', 'grupo', 'asignacion_invalida')}
+    resumen['retirados'] = len(set(plan_anterior) - conjunto_empleados)
+    resumen['afectados'] = len(afectados)
+    resumen['asignaciones_conservadas'] = len(plan_conservado)
+    return {'plan_conservado': plan_conservado, 'afectados': afectados, 'plan_afectados': plan_afectados,
+            'resumen': resumen}
+
+
+def preparar_replanificacion(datos, reporte_anterior, datos_anteriores=None, penalizacion_cambio=PENALIZACION_CAMBIO):
+    """
+    Aplica `diferenciar_instancias` y guarda en `datos` (antes de
+    `preprocesar_datos`) el plan conservado y `penalizacion_cambio`, que se suma
+    a la penalización por cada asignación conservada que la solución no respete
+    (0 = sin penalización). Retorna el resultado de `diferenciar_instancias`.
+    """
+    diferencia = diferenciar_instancias(datos, reporte_anterior, datos_anteriores)
+    datos['plan_anterior'] = diferencia['plan_conservado']
+    datos['penalizacion_cambio'] = penalizacion_cambio
+    return diferencia
+
 
-        print(f"Generación {gen + 1}/{GENERACIONES}: Mejor Penalización = {mejor_penalizacion_actual}")
+def sembrar_replanificacion(datos, diferencia, cantidad):
+    """
+    Crea `cantidad` individuos que parten del plan conservado de `diferencia`
+    (ver `diferenciar_instancias`) y reubican sólo a los empleados afectados, en
+    orden aleatorio: conservan las asignaciones anteriores que siguen siendo
+    válidas (así no se pierden las reuniones de grupo) y en los días preferidos
+    que les faltan usan su escritorio habitual si está libre o uno libre al azar.
+    `datos` debe estar preprocesado.
+    """
+    indice = datos['indice']
+    dias_por_empleado = datos['dias_por_empleado']
+    plan, plan_afectados = diferencia['plan_conservado'], diferencia['plan_afectados']
+    ocupados_base = defaultdict(int)
+    for (_, d), desk in plan.items():
+        ocupados_base[d] |= indice.bit_escritorio[desk]
+    habituales = defaultdict(list)  # Empleado afectado -> escritorios anteriores (el más usado primero)
+    for (e, _), desk in plan_afectados.items():
+        habituales[e].append(desk)
+    for e, escritorios in habituales.items():
+        habituales[e] = sorted(set(escritorios), key=escritorios.count, reverse=True)
+
+    semillas = []
+    for _ in range(cantidad):
+        asignacion = dict(plan)
+        ocupados_por_dia = defaultdict(int, ocupados_base)
+        lista_empleados = list(diferencia['afectados'])
+        random.shuffle(lista_empleados)
+        for e in lista_empleados:
+            permitidos = indice.mascara_permitidos.get(e, 0)
+            for d in datos['days']:
+                desk = plan_afectados.get((e, d))
+                if desk in indice.bit_escritorio and indice.bit_escritorio[desk] & permitidos & ~ocupados_por_dia[d]:
+                    asignacion[(e, d)] = desk
+                    ocupados_por_dia[d] |= indice.bit_escritorio[desk]
+            dias_preferidos = [d for d in dias_por_empleado.get(e, []) if (e, d) not in asignacion]
+            random.shuffle(dias_preferidos)
+            candidatos = list(habituales.get(e, []))
+            for d in dias_preferidos:
+                libres = permitidos & ~ocupados_por_dia[d]
+                escritorio_elegido = next((desk for desk in candidatos
+                                           if desk in indice.bit_escritorio and indice.bit_escritorio[desk] & libres), None)
+                if escritorio_elegido is None:
+                    escritorio_elegido = indice.escritorio_aleatorio(libres)
+                if escritorio_elegido is not None:
+                    asignacion[(e, d)] = escritorio_elegido
+                    ocupados_por_dia[d] |= indice.bit_escritorio[escritorio_elegido]
+                    if escritorio_elegido not in candidatos:
+                        candidatos.append(escritorio_elegido)
+        _asignar_sin_dias(asignacion, ocupados_por_dia, lista_empleados, datos['days'], dias_por_empleado, indice)
+        semillas.append(asignacion)
+    return semillas
+
+# ==============================================================================
+# SOLVER EXACTO (CP-SAT)
+# ==============================================================================
+
+def resolver_cp_sat(datos, tiempo_limite=TIEMPO_LIMITE_SOLVER, num_trabajadores=NUM_TRABAJADORES_SOLVER):
+    """
+    Resuelve la instancia con el solver CP-SAT de OR-Tools.
+
+    La capacidad de los escritorios y `Desks_E` se imponen como restricciones
+    duras; el objetivo reproduce las penalizaciones suaves de `calcular_fitness`
+    (empleados sin asignación, días preferidos, reunión de grupo, aislamiento en
+    zona y escritorio único). Los días son los de `datos['dias_evaluacion']`
+    (Days y los días preferidos fuera de él), los mismos que puede asignar el
+    algoritmo genético. Retorna la penalización (recalculada con
+    `calcular_fitness`) y la mejor asignación encontrada dentro del tiempo límite,
+    o (inf, None) si no se encontró ninguna.
+    """
+    from ortools.sat.python import cp_model
 
-        nueva_poblacion = [ind for ind, score in puntuaciones_y_individuos[:ELITISMO_COUNT]]
+    employees = datos['employees']
+    days = datos['dias_evaluacion']
+    escritorios_permitidos = datos['escritorios_permitidos']
+    dias_preferidos = datos['dias_preferidos']
+    zona_por_escritorio = datos['zona_por_escritorio']
+    grupo_por_empleado = datos['grupo_por_empleado']
 
-        while len(nueva_poblacion) < POBLACION_SIZE:
-            padre1 = seleccionar_padre_por_torneo(puntuaciones_y_individuos)
-            padre2 = seleccionar_padre_por_torneo(puntuaciones_y_individuos)
+    modelo = cp_model.CpModel()
+    objetivo = []
 
-            if random.random() < TASA_CRUCE:
-                hijo = cruzar(padre1, padre2, datos['escritorios_por_empleado'])
+    # x[e, d, desk] = 1 si el empleado e usa el escritorio desk el día d
+    x = {}
+    for e in employees:
+        for d in days:
+            for desk in sorted(escritorios_permitidos.get(e, ())):
+                x[(e, d, desk)] = modelo.NewBoolVar(f"x_{e}_{d}_{desk}")
+
+    por_escritorio_dia = defaultdict(list)
+    por_empleado_dia = defaultdict(list)
+    for (e, d, desk), var in x.items():
+        por_escritorio_dia[(d, desk)].append(var)
+        por_empleado_dia[(e, d)].append(var)
+    for variables in por_escritorio_dia.values():
+        modelo.AddAtMostOne(variables)
+    for variables in por_empleado_dia.values():
+        modelo.AddAtMostOne(variables)
+    asiste = {(e, d): sum(por_empleado_dia[(e, d)]) for e in employees for d in days}
+
+    # Empleados sin asignación y días preferidos
+    sin_asignar = {}
+    for e in employees:
+        sin_asignar[e] = modelo.NewBoolVar(f"sin_asignar_{e}")
+        modelo.Add(sum(asiste[(e, d)] for d in days) + sin_asignar[e] >= 1)
+        objetivo.append(5000 * sin_asignar[e])
+        preferidos_e = dias_preferidos.get(e, frozenset())
+        for d in days:
+            if d in preferidos_e:
+                objetivo.append(200 * (1 - asiste[(e, d)]))
             else:
-                hijo = copy.deepcopy(random.choice([padre1, padre2]))
+                objetivo.append(100 * asiste[(e, d)])
 
-            hijo_mutado = mutar(hijo, datos['employees'], datos['days'], datos['escritorios_por_empleado'])
-            nueva_poblacion.append(hijo_mutado)
+    # Reunión de grupo: se elige un día de reunión y se penaliza a cada miembro
+    # ausente ese día (equivale a tomar el día con más miembros reunidos)
+    for g, miembros in datos['empleados_por_grupo'].items():
+        if not miembros:
+            continue
+        if not days:
+            objetivo.append(10000 * len(miembros))
+            continue
+        dia_reunion = {d: modelo.NewBoolVar(f"reunion_{g}_{d}") for d in days}
+        modelo.AddExactlyOne(dia_reunion.values())
+        for i, m in enumerate(miembros):
+            ausente = modelo.NewBoolVar(f"ausente_{g}_{i}")
+            for d in days:
+                if (m, d) in asiste:
+                    modelo.Add(ausente >= dia_reunion[d] - asiste[(m, d)])
+                else:
+                    modelo.Add(ausente >= dia_reunion[d])
+            objetivo.append(10000 * ausente)
+
+    # Aislamiento: un único miembro de un grupo en una zona y día
+    en_zona = defaultdict(list)
+    for (e, d, desk), var in x.items():
+        zona = zona_por_escritorio.get(desk)
+        grupo_e = grupo_por_empleado.get(e)
+        if zona and grupo_e:
+            en_zona[(d, zona, grupo_e, e)].append(var)
+    miembros_en_zona = defaultdict(list)
+    for (d, zona, grupo_e, e), variables in en_zona.items():
+        miembros_en_zona[(d, zona, grupo_e)].append(sum(variables))
+    for (d, zona, grupo_e), presencias in miembros_en_zona.items():
+        aislado = modelo.NewBoolVar(f"aislado_{d}_{zona}_{grupo_e}")
+        total = sum(presencias)
+        # Si un miembro está presente y ningún otro lo acompaña, el grupo queda aislado
+        for presencia in presencias:
+            modelo.Add(aislado + total - presencia >= presencia)
+        objetivo.append(500 * aislado)
+
+    # Escritorio único: 50 por cada escritorio distinto adicional
+    for e in employees:
+        usa = []
+        for desk in sorted(escritorios_permitidos.get(e, ())):
+            usa_desk = modelo.NewBoolVar(f"usa_{e}_{desk}")
+            for d in days:
+                modelo.AddImplication(x[(e, d, desk)], usa_desk)
+            usa.append(usa_desk)
+        objetivo.append(50 * sum(usa) - 50 * (1 - sin_asignar[e]))
+
+    modelo.Minimize(sum(objetivo))
+
+    solver = cp_model.CpSolver()
+    solver.parameters.max_time_in_seconds = tiempo_limite
+    solver.parameters.num_workers = num_trabajadores
+    estado = solver.Solve(modelo)
+    print(f"CP-SAT: estado {solver.StatusName(estado)}, objetivo {solver.ObjectiveValue() if estado in (cp_model.OPTIMAL, cp_model.FEASIBLE) else '-'}, "
+          f"cota inferior {solver.BestObjectiveBound()}, {solver.WallTime():.2f}s")
+
+    if estado not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return float('inf'), None
+    asignacion = {(e, d): desk for (e, d, desk), var in x.items() if solver.BooleanValue(var)}
+    return calcular_fitness(asignacion, datos), asignacion
+
+
+def resolver_instancia(datos, modo_evaluacion=MODO_EVALUACION, num_procesos=NUM_PROCESOS, num_islas=NUM_ISLAS,
+                       solver=SOLVER, tiempo_limite_solver=TIEMPO_LIMITE_SOLVER,
+                       max_generaciones_sin_mejora=MAX_GENERACIONES_SIN_MEJORA, tiempo_limite=TIEMPO_LIMITE,
+                       penalizacion_objetivo=PENALIZACION_OBJETIVO, usar_cota_inferior=USAR_COTA_INFERIOR,
+                       mostrar_progreso=True, callbacks=(), replanificacion=None, archivo_punto_control=None,
+                       intervalo_punto_control=INTERVALO_PUNTO_CONTROL, reanudar=False,
+                       num_trabajadores_solver=NUM_TRABAJADORES_SOLVER):
+    """
+    Preprocesa `datos` y resuelve la instancia, sin imprimir la solución ni
+    generar reportes.
+
+    `modo_evaluacion` elige cómo se puntúa la población: 'incremental' (cada
+    individuo mantiene su penalización), 'vectorizado' (toda la población en un
+    tensor NumPy), 'paralelo' (el cálculo vectorizado repartido en `num_procesos`
+    procesos) o 'completo' (`calcular_fitness` por individuo). Con `num_islas`
+    mayor que 1 se usa el modelo de islas (`ejecutar_modelo_islas`).
+
+    `solver` elige el método: 'ga' (sólo el algoritmo genético), 'cp_sat' (sólo
+    `resolver_cp_sat`, con `num_trabajadores_solver` hilos de búsqueda) o
+    'hibrido' (la solución de CP-SAT siembra la población inicial del algoritmo genético).
+
+    El bucle se detiene antes de GENERACIONES tras `max_generaciones_sin_mejora`
+    generaciones sin mejorar, al superar `tiempo_limite` segundos, al alcanzar
+    `penalizacion_objetivo` o, con `usar_cota_inferior`, al igualar la cota de
+    `calcular_cota_inferior`. Cada generación se notifica a `callbacks` (ver
+    `evolucionar_poblacion`). Con MULTIOBJETIVO se usa `evolucionar_nsga2` y el
+    resultado lleva además el frente de Pareto en 'frente'. Retorna el diccionario de `evolucionar_poblacion`
+    con la mejor solución, la generación y el motivo de parada, más
+    'tiempo_solver' (segundos de CP-SAT, incluidos en 'tiempo_primera_factible').
+
+    `replanificacion` ({'reporte': contenido del reporte_asignaciones.json
+    anterior, 'instancia_anterior': JSON opcional, 'penalizacion_cambio': peso})
+    resuelve la instancia partiendo del plan anterior (`preparar_replanificacion`):
+    una fracción PROPORCION_SEMILLA_REPLANIFICACION de la población conserva las
+    asignaciones no afectadas y se ejecuta sólo la fracción
+    FRACCION_GENERACIONES_REPLANIFICACION de GENERACIONES. El resumen de la
+    diferencia queda en resultado['replanificacion'].
+
+    Con `archivo_punto_control` se guardan puntos de control cada
+    `intervalo_punto_control` generaciones y al parar por `tiempo_limite` (ver
+    `evolucionar_poblacion`). Con `reanudar`, si el archivo existe, la ejecución
+    continúa desde él sin crear la población inicial ni llamar a CP-SAT.
+    """
+    if solver not in ('ga', 'cp_sat', 'hibrido'):
+        raise ValueError(f"Solver desconocido: '{solver}'")
+    if MULTIOBJETIVO and (solver == 'cp_sat' or num_islas > 1):
+        raise ValueError("El modo multiobjetivo requiere el algoritmo genético con una sola isla.")
+    if archivo_punto_control and (solver == 'cp_sat' or num_islas > 1 or MULTIOBJETIVO):
+        raise ValueError("Los puntos de control requieren el algoritmo genético de una sola población.")
+
+    diferencia = None
+    if replanificacion is not None:
+        diferencia = preparar_replanificacion(datos, replanificacion['reporte'], replanificacion.get('instancia_anterior'),
+                                              replanificacion.get('penalizacion_cambio', PENALIZACION_CAMBIO))
+        resumen = diferencia['resumen']
+        print(f"Replanificación: {resumen['afectados']} empleados afectados ({resumen['nuevos']} nuevos, "
+              f"{resumen['dias_preferidos']} con otros días preferidos, {resumen['grupo']} con otro grupo, "
+              f"{resumen['asignacion_invalida']} con asignaciones inválidas; {resumen['retirados']} retirados), "
+              f"{resumen['asignaciones_conservadas']} asignaciones conservadas")
 
-        poblacion = nueva_poblacion
+    # Desempaquetar datos y añadir estructuras preprocesadas
+    preprocesar_datos(datos)
+
+    estado_inicial = None
+    if reanudar and archivo_punto_control and os.path.exists(archivo_punto_control):
+        estado_inicial = cargar_punto_control(archivo_punto_control, datos)
+        print(f"Reanudando desde '{archivo_punto_control}' en la generación {estado_inicial['generacion']} "
+              f"(mejor penalización {estado_inicial['mejor_penalizacion']})")
+
+    individuos_semilla = []
+    if diferencia is not None and solver != 'cp_sat' and estado_inicial is None:
+        individuos_semilla += sembrar_replanificacion(datos, diferencia, int(round(POBLACION_SIZE * PROPORCION_SEMILLA_REPLANIFICACION)))
+    tiempo_solver = 0.0
+    if solver in ('cp_sat', 'hibrido') and estado_inicial is None:
+        print(f"Resolviendo con CP-SAT (límite {tiempo_limite_solver}s)...")
+        inicio_solver = time.perf_counter()
+        penalizacion_solver, asignacion_solver = resolver_cp_sat(datos, tiempo_limite_solver, num_trabajadores_solver)
+        tiempo_solver = time.perf_counter() - inicio_solver
+        if asignacion_solver is not None:
+            individuos_semilla.append(asignacion_solver)
+
+    criterios_parada = {
+        'max_generaciones_sin_mejora': max_generaciones_sin_mejora,
+        'tiempo_limite': tiempo_limite,
+        'penalizacion_objetivo': penalizacion_objetivo,
+        'cota_inferior': calcular_cota_inferior(datos) if usar_cota_inferior else None,
+    }
+    if diferencia is not None:
+        criterios_parada['max_generaciones'] = max(1, int(round(GENERACIONES * FRACCION_GENERACIONES_REPLANIFICACION)))
+    if usar_cota_inferior:
+        print(f"Cota inferior de la penalización: {criterios_parada['cota_inferior']}")
+
+    if solver == 'cp_sat':
+        factible = asignacion_solver is not None and es_factible(asignacion_solver, datos)
+        resultado = {'mejor_penalizacion': penalizacion_solver, 'mejor_asignacion': asignacion_solver,
+                     'generacion_parada': 0, 'motivo_parada': 'solver_cp_sat', 'tiempo': 0.0,
+                     'evaluaciones': 0, 'tiempo_primera_factible': 0.0 if factible else None, 'cache': None}
+    elif num_islas > 1:
+        print(f"Ejecutando modelo de islas con {num_islas} islas...")
+        resultado = ejecutar_modelo_islas(datos, num_islas, modo_evaluacion=modo_evaluacion,
+                                          individuos_semilla=individuos_semilla, criterios_parada=criterios_parada,
+                                          callbacks=callbacks)
+    else:
+        # 1. Inicialización de la Población
+        if estado_inicial is not None:
+            poblacion = []
+        else:
+            print("Generando población inicial...")
+            poblacion = individuos_semilla + crear_poblacion_inicial(datos, POBLACION_SIZE - len(individuos_semilla))
+        if MULTIOBJETIVO:
+            print("Ejecutando NSGA-II sobre los objetivos:", ", ".join(OBJETIVOS[1:]))
+            resultado = evolucionar_nsga2(poblacion, datos, criterios_parada, mostrar_progreso, callbacks)
+            resultado['tiempo_solver'] = tiempo_solver
+            return resultado
+        poblacion = preparar_poblacion(poblacion, datos, modo_evaluacion)
+
+        # 2. Bucle de Generaciones
+        evaluador = EvaluadorParalelo(datos, num_procesos) if modo_evaluacion == 'paralelo' else None
+        try:
+            resultado = evolucionar_poblacion(poblacion, datos, modo_evaluacion, evaluador, criterios_parada,
+                                              mostrar_progreso=mostrar_progreso, callbacks=callbacks,
+                                              archivo_punto_control=archivo_punto_control,
+                                              intervalo_punto_control=intervalo_punto_control, estado_inicial=estado_inicial)
+        finally:
+            if evaluador is not None:
+                evaluador.cerrar()
+
+    resultado['tiempo_solver'] = tiempo_solver
+    if resultado['tiempo_primera_factible'] is not None:
+        resultado['tiempo_primera_factible'] += tiempo_solver
+    if diferencia is not None:
+        resultado['replanificacion'] = diferencia['resumen']
+    return resultado
+
+
+def ejecutar_algoritmo_genetico(datos, modo_evaluacion=MODO_EVALUACION, num_procesos=NUM_PROCESOS, num_islas=NUM_ISLAS,
+                                solver=SOLVER, tiempo_limite_solver=TIEMPO_LIMITE_SOLVER,
+                                max_generaciones_sin_mejora=MAX_GENERACIONES_SIN_MEJORA, tiempo_limite=TIEMPO_LIMITE,
+                                penalizacion_objetivo=PENALIZACION_OBJETIVO, usar_cota_inferior=USAR_COTA_INFERIOR,
+                                directorio_salida=".", formatos_reporte=FORMATOS_REPORTE_POR_DEFECTO, mostrar_progreso=True,
+                                callbacks=(), archivo_registro=None, etapa_reportes=None, replanificacion=None,
+                                archivo_punto_control=None, intervalo_punto_control=INTERVALO_PUNTO_CONTROL, reanudar=False,
+                                num_trabajadores_solver=NUM_TRABAJADORES_SOLVER):
+    """
+    Orquesta la ejecución completa del algoritmo genético: resuelve la instancia
+    con `resolver_instancia` (mismos parámetros), imprime la mejor solución y sus
+    KPIs y genera en `directorio_salida` los reportes de `formatos_reporte`
+    ('json', 'excel', 'graficos' y 'pdf'). Con `mostrar_progreso` en False no se
+    imprimen las generaciones ni la asignación completa. Los registros de cada
+    generación se pasan a `callbacks` y, si se da `archivo_registro`, se escriben
+    en ese archivo JSONL dentro de `directorio_salida`. Con `etapa_reportes` (una
+    `EtapaReportes`) los reportes se encolan allí y la función retorna sin
+    esperarlos; el `TrabajoReportes` queda en resultado['reportes']. Con
+    `replanificacion` se parte del plan anterior y con `archivo_punto_control`
+    se guardan (y con `reanudar` se retoman) puntos de control (ver `resolver_instancia`).
+    Retorna el resultado con sus KPIs.
+    """
+    formatos_desconocidos = set(formatos_reporte) - set(FORMATOS_REPORTE)
+    if formatos_desconocidos:
+        raise ValueError(f"Formatos de reporte desconocidos: {sorted(formatos_desconocidos)}")
+
+    callbacks = list(callbacks)
+    registro_jsonl = None
+    if archivo_registro:
+        os.makedirs(directorio_salida, exist_ok=True)
+        registro_jsonl = RegistroJSONL(os.path.join(directorio_salida, archivo_registro))
+        callbacks.append(registro_jsonl)
+    try:
+        resultado = resolver_instancia(datos, modo_evaluacion, num_procesos, num_islas, solver, tiempo_limite_solver,
+                                       max_generaciones_sin_mejora, tiempo_limite, penalizacion_objetivo,
+                                       usar_cota_inferior, mostrar_progreso, callbacks, replanificacion,
+                                       archivo_punto_control, intervalo_punto_control, reanudar, num_trabajadores_solver)
+    finally:
+        if registro_jsonl is not None:
+            registro_jsonl.cerrar()
+
+    mejor_penalizacion_global = resultado['mejor_penalizacion']
+    mejor_asignacion_global = resultado['mejor_asignacion']
+    if resultado['generacion_parada']:
+        print(f"\nParada en la generación {resultado['generacion_parada']}/{GENERACIONES}: {resultado['motivo_parada']}")
+    if resultado['cache'] is not None:
+        cache = resultado['cache']
+        print(f"Caché de fitness: {cache['aciertos']} aciertos de {cache['aciertos'] + cache['fallos']} consultas "
+              f"({100 * cache['tasa_aciertos']:.1f}%)")
 
     print("\n" + "="*50)
     print(f"Mejor Puntuación de Penalización Encontrada: {mejor_penalizacion_global}")
-    print("--- Mejor Asignación Encontrada ---")
-    for (e, d), desk in mejor_asignacion_global.items():
-        print(f"  - Empleado: {e}, Día: {d} -> Escritorio: {desk}")
+    if mostrar_progreso:
+        print("--- Mejor Asignación Encontrada ---")
+        for (e, d), desk in mejor_asignacion_global.items():
+            print(f"  - Empleado: {e}, Día: {d} -> Escritorio: {desk}")
     print("="*50)
 
     # Generar y retornar KPIs
@@ -604,6 +3382,8 @@ def ejecutar_algoritmo_genetico(datos):
     for day, info in kpis_finales['capacidad_utilizada_por_dia'].items():
         print(f"      - Día '{day}': {info['ocupados']}/{info['total_escritorios']} escritorios ({info['porcentaje']:.2f}%)")
     print(f"  • Porcentaje de Capacidad Utilizada GLOBAL: {kpis_finales['porcentaje_capacidad_utilizada_global']:.2f}% (Más alto es mejor)")
+    if 'asignaciones_conservadas_pct' in kpis_finales:
+        print(f"  • Asignaciones del plan anterior conservadas: {kpis_finales['asignaciones_conservadas_pct']:.2f}% (Más alto es mejor)")
 
     print("\n" + "="*50)
     print("FIN DEL RESUMEN DE KPIs")
@@ -611,18 +3391,228 @@ def ejecutar_algoritmo_genetico(datos):
     # ====================================================================
 
     # Generar reportes finales
-    generar_reporte_json(mejor_asignacion_global, datos, "reporte_asignaciones.json")
-    generar_reporte_excel(mejor_asignacion_global, kpis_finales, "reporte_asignaciones.xlsx")
-
-    graficos_paths = generar_graficos(kpis_finales)
-    generar_reporte_pdf(mejor_penalizacion_global, mejor_asignacion_global, kpis_finales, graficos_paths, "reporte_final.pdf")
+    resultado['kpis'] = kpis_finales
+    if resultado.get('frente'):
+        os.makedirs(directorio_salida, exist_ok=True)
+        print(f"\nFrente de Pareto: {len(resultado['frente'])} planes no dominados")
+        for i, plan in enumerate(resultado['frente'] if mostrar_progreso else resultado['frente'][:10]):
+            print(f"  - Plan {i}: penalización {plan['penalizacion']} ("
+                  + ", ".join(f"{nombre} {valor}" for nombre, valor in plan['objetivos'].items()) + ")")
+        if not mostrar_progreso and len(resultado['frente']) > 10:
+            print(f"  ... ({len(resultado['frente']) - 10} planes más en el reporte)")
+        generar_reporte_frente(resultado['frente'], datos, os.path.join(directorio_salida, "reporte_frente_pareto.csv"))
+        generar_planes_frente(resultado['frente'], os.path.join(directorio_salida, "planes_frente_pareto.jsonl"))
+    if etapa_reportes is not None:
+        resultado['reportes'] = etapa_reportes.enviar(mejor_penalizacion_global, mejor_asignacion_global, datos,
+                                                      kpis_finales, directorio_salida, formatos_reporte)
+        return resultado
+    os.makedirs(directorio_salida, exist_ok=True)
+    if 'json' in formatos_reporte:
+        generar_reporte_json(mejor_asignacion_global, datos, os.path.join(directorio_salida, "reporte_asignaciones.json"))
+    if 'jsonl' in formatos_reporte:
+        generar_reporte_jsonl(mejor_asignacion_global, os.path.join(directorio_salida, "reporte_asignaciones.jsonl"))
+    if 'csv' in formatos_reporte:
+        generar_reporte_csv(mejor_asignacion_global, os.path.join(directorio_salida, "reporte_asignaciones.csv"))
+    if 'parquet' in formatos_reporte:
+        generar_reporte_parquet(mejor_asignacion_global, os.path.join(directorio_salida, "reporte_asignaciones.parquet"))
+    if 'excel' in formatos_reporte:
+        generar_reporte_excel(mejor_asignacion_global, kpis_finales, os.path.join(directorio_salida, "reporte_asignaciones.xlsx"))
+    if 'graficos' in formatos_reporte or 'pdf' in formatos_reporte:
+        graficos_paths = generar_graficos(kpis_finales, directorio_salida)
+    if 'pdf' in formatos_reporte:
+        generar_reporte_pdf(mejor_penalizacion_global, mejor_asignacion_global, kpis_finales, graficos_paths,
+                            os.path.join(directorio_salida, "reporte_final.pdf"))
+    return resultado
 
 # ==============================================================================
 # EJECUCIÓN
 # ==============================================================================
 
-if __name__ == "__main__":
-    uploaded_file = None
+def carpeta_salida_instancia(ruta):
+    """Nombre de la carpeta de reportes de una instancia: 'instanceN.json' -> 'instancia N'."""
+    nombre = os.path.splitext(os.path.basename(ruta))[0]
+    coincidencia = re.fullmatch(r'instance(\d+)', nombre)
+    return f"instancia {coincidencia.group(1)}" if coincidencia else nombre
+
+
+def expandir_entradas(entradas):
+    """
+    Convierte la lista de entradas en rutas de instancias JSON: un directorio
+    aporta sus archivos *.json y un manifiesto (.txt) una ruta por línea,
+    relativa al manifiesto (se ignoran líneas vacías y comentarios '#').
+    """
+    rutas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            rutas += sorted(os.path.join(entrada, nombre) for nombre in os.listdir(entrada) if nombre.endswith('.json'))
+        elif entrada.endswith('.txt'):
+            with open(entrada, 'r') as f:
+                lineas = [linea.strip() for linea in f]
+            base = os.path.dirname(entrada)
+            rutas += [os.path.join(base, linea) for linea in lineas if linea and not linea.startswith('#')]
+        else:
+            rutas.append(entrada)
+    return rutas
+
+
+# KPIs que se copian a la tabla resumen de un lote
+KPIS_RESUMEN_LOTE = (
+    'empleados_con_asignacion_pct', 'escritorios_con_sobre_asignacion', 'asignaciones_en_escritorios_permitidos_pct',
+    'cumplimiento_promedio_dias_preferidos_pct', 'empleados_con_escritorio_unico_pct', 'porcentaje_asignaciones_aisladas',
+    'grupos_con_reunion_completa_pct', 'porcentaje_capacidad_utilizada_global',
+)
+
+
+def _tamano_instancia(ruta):
+    """Estimación del trabajo de una instancia (empleados x días) para ordenar el lote."""
+    try:
+        with open(ruta, 'r') as f:
+            datos = json.load(f)
+        return len(datos.get("Employees", [])) * max(len(datos.get("Days", [])), 1)
+    except (OSError, ValueError):
+        return 0
+
+
+def _inicializar_trabajador_lote(parametros, formatos_reporte):
+    """
+    Configura un proceso del lote e importa una sola vez las librerías de los
+    reportes pedidos, que luego reutilizan todos los trabajos del proceso.
+    """
+    configurar_parametros(**parametros)
+    _inicializar_trabajador_reportes(formatos_reporte)
+
+
+def _resolver_trabajo_lote(ruta, directorio_salida, opciones, semilla=None, archivo_log=None, devolver_solucion=False):
+    """
+    Resuelve una instancia del lote y retorna su fila de la tabla resumen. Si se
+    da `archivo_log`, la salida de la ejecución se escribe allí en lugar de la consola.
+    Con `devolver_solucion`, la fila lleva en 'solucion' lo necesario para
+    generar sus reportes en una `EtapaReportes` (ver `_encolar_reportes`).
+    """
+    import contextlib
+
+    fila = {'instancia': ruta, 'directorio': directorio_salida, 'penalizacion': None, 'motivo_parada': None,
+            'generacion_parada': None, 'tiempo': None, 'error': None}
+    inicio = time.perf_counter()
+    try:
+        with open(ruta, 'r') as f:
+            datos = json.load(f)
+        if semilla is not None:
+            random.seed(semilla)
+        os.makedirs(directorio_salida, exist_ok=True)
+        with contextlib.ExitStack() as pila:
+            if archivo_log is not None:
+                log = pila.enter_context(open(os.path.join(directorio_salida, archivo_log), 'w'))
+                pila.enter_context(contextlib.redirect_stdout(log))
+            resultado = ejecutar_algoritmo_genetico(datos, directorio_salida=directorio_salida, **opciones)
+        fila.update(penalizacion=resultado['mejor_penalizacion'], motivo_parada=resultado['motivo_parada'],
+                    generacion_parada=resultado['generacion_parada'])
+        fila.update({kpi: resultado['kpis'][kpi] for kpi in KPIS_RESUMEN_LOTE})
+        if devolver_solucion:
+            fila['solucion'] = {'mejor_penalizacion': resultado['mejor_penalizacion'],
+                                'mejor_asignacion': dict(resultado['mejor_asignacion']),
+                                'datos': _datos_reporte(datos), 'kpis': resultado['kpis']}
+    except Exception as e:
+        fila['error'] = f"{type(e).__name__}: {e}"
+    fila['tiempo'] = time.perf_counter() - inicio
+    return fila
+
+
+def _encolar_reportes(etapa_reportes, fila, formatos_reporte):
+    """Quita la solución de una fila de `_resolver_trabajo_lote` y encola sus reportes. Retorna el trabajo o None."""
+    solucion = fila.pop('solucion', None)
+    if etapa_reportes is None or solucion is None:
+        return None
+    return etapa_reportes.enviar(**solucion, directorio_salida=fila['directorio'], formatos_reporte=formatos_reporte)
+
+
+def _esperar_reportes(fila, trabajo):
+    """Espera los reportes de una fila y anota en ella su error, si lo hay."""
+    if trabajo is None:
+        return
+    try:
+        trabajo.esperar()
+    except Exception as e:
+        fila['error'] = f"Reportes: {type(e).__name__}: {e}"
+
+
+def ejecutar_lote(rutas, directorio_salida=".", opciones=None, num_trabajadores=1, semilla=None,
+                  trabajadores_reportes=TRABAJADORES_REPORTES):
+    """
+    Resuelve varias instancias y escribe cada una en su subcarpeta de
+    `directorio_salida` (ver `carpeta_salida_instancia`). Con `num_trabajadores`
+    mayor que 1 las instancias se reparten en un pool de procesos, de la más
+    grande a la más pequeña, y la salida de cada una va a 'ejecucion.log' en su
+    carpeta. `opciones` son argumentos de `ejecutar_algoritmo_genetico`. Con
+    `trabajadores_reportes` mayor que 0 los reportes se generan en una
+    `EtapaReportes` con ese número de procesos, mientras se resuelven las
+    instancias siguientes. Escribe 'resumen_lote.csv' en `directorio_salida` y
+    retorna sus filas en el orden de `rutas`.
+    """
+    import csv
+
+    opciones = opciones or {}
+    directorios = [os.path.join(directorio_salida, carpeta_salida_instancia(ruta)) for ruta in rutas]
+    formatos_reporte = opciones.get('formatos_reporte', FORMATOS_REPORTE_POR_DEFECTO)
+    etapa_reportes = EtapaReportes(trabajadores_reportes, formatos_reporte) if trabajadores_reportes > 0 else None
+    if etapa_reportes is not None:
+        opciones = {**opciones, 'formatos_reporte': ()}
+    trabajos_reportes = [None] * len(rutas)
+    filas = [None] * len(rutas)
+    try:
+        if num_trabajadores <= 1:
+            for i, (ruta, directorio) in enumerate(zip(rutas, directorios)):
+                filas[i] = _resolver_trabajo_lote(ruta, directorio, opciones, semilla,
+                                                  devolver_solucion=etapa_reportes is not None)
+                trabajos_reportes[i] = _encolar_reportes(etapa_reportes, filas[i], formatos_reporte)
+        else:
+            orden = sorted(range(len(rutas)), key=lambda i: _tamano_instancia(rutas[i]), reverse=True)
+            with ProcessPoolExecutor(num_trabajadores, initializer=_inicializar_trabajador_lote,
+                                     initargs=(parametros_algoritmo(), opciones.get('formatos_reporte', formatos_reporte))) as pool:
+                futuros = {pool.submit(_resolver_trabajo_lote, rutas[i], directorios[i], opciones, semilla, 'ejecucion.log',
+                                       etapa_reportes is not None): i
+                           for i in orden}
+                for futuro in as_completed(futuros):
+                    i = futuros[futuro]
+                    fila = filas[i] = futuro.result()
+                    trabajos_reportes[i] = _encolar_reportes(etapa_reportes, fila, formatos_reporte)
+                    estado = f"error: {fila['error']}" if fila['error'] else f"penalización {fila['penalizacion']}"
+                    print(f"[{sum(f is not None for f in filas)}/{len(rutas)}] {fila['instancia']}: {estado} ({fila['tiempo']:.1f}s)")
+    finally:
+        if etapa_reportes is not None:
+            etapa_reportes.cerrar()
+    for fila, trabajo in zip(filas, trabajos_reportes):
+        _esperar_reportes(fila, trabajo)
+
+    os.makedirs(directorio_salida, exist_ok=True)
+    columnas = ['instancia', 'directorio', 'penalizacion', 'motivo_parada', 'generacion_parada', 'tiempo',
+                *KPIS_RESUMEN_LOTE, 'error']
+    ruta_resumen = os.path.join(directorio_salida, "resumen_lote.csv")
+    with open(ruta_resumen, 'w', newline='') as f:
+        escritor = csv.DictWriter(f, fieldnames=columnas, restval='')
+        escritor.writeheader()
+        escritor.writerows(filas)
+
+    print("\n" + "="*50)
+    print("RESUMEN DEL LOTE")
+    print("="*50)
+    ancho = max([len('Instancia')] + [len(fila['instancia']) for fila in filas]) + 2
+    print(f"{'Instancia':<{ancho}}{'Penalización':>14}{'Asignados %':>13}{'Pref. %':>10}{'Aisladas %':>12}{'Tiempo (s)':>12}")
+    for fila in filas:
+        if fila['error']:
+            print(f"{fila['instancia']:<{ancho}}ERROR: {fila['error']}")
+            continue
+        print(f"{fila['instancia']:<{ancho}}{fila['penalizacion']:>14}{fila['empleados_con_asignacion_pct']:>13.2f}"
+              f"{fila['cumplimiento_promedio_dias_preferidos_pct']:>10.2f}{fila['porcentaje_asignaciones_aisladas']:>12.2f}"
+              f"{fila['tiempo']:>12.1f}")
+    print(f"Resumen guardado en: '{ruta_resumen}'")
+    return filas
+
+
+def ejecutar_en_colab():
+    """Flujo interactivo de Colab: pide subir el JSON y genera los reportes en el directorio actual."""
+    from google.colab import files
+
     try:
         # Solicitar a la usuario que cargue un archivo JSON
         print("Por favor sube tu 'data.json' archivo:")
@@ -643,3 +3633,152 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Se produjo un error durante la carga o el procesamiento del archivo.: {e}")
         print("Asegúrese de cargar un archivo JSON válido con la estructura correcta.")
+
+
+def crear_parser():
+    """Parser de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Asignación de escritorios con algoritmo genético.")
+    parser.add_argument('entradas', nargs='+', help="Archivos JSON de instancias, directorios con instancias "
+                        "o manifiestos .txt con una ruta por línea.")
+    parser.add_argument('-o', '--salida', default='.', help="Directorio de reportes. Con varias instancias, "
+                        "cada una usa una subcarpeta ('instance3.json' -> 'instancia 3') y se escribe 'resumen_lote.csv'.")
+    parser.add_argument('-j', '--trabajadores', type=int, default=1, help="Instancias que se resuelven a la vez en un lote.")
+    parser.add_argument('--reportes', nargs='*', default=list(FORMATOS_REPORTE_POR_DEFECTO), choices=FORMATOS_REPORTE,
+                        help="Reportes a generar (por defecto json, excel, graficos y pdf; sin valores, ninguno).")
+    parser.add_argument('--trabajadores-reportes', type=int, default=TRABAJADORES_REPORTES,
+                        help="Procesos que generan los reportes en segundo plano mientras el solver sigue "
+                        "(0: en el proceso principal, al terminar cada instancia).")
+    parser.add_argument('--semilla', type=int, default=None, help="Semilla del generador aleatorio.")
+    parser.add_argument('--silencioso', action='store_true', help="No imprimir cada generación ni la asignación completa.")
+    parser.add_argument('--registro', default=None, metavar='ARCHIVO',
+                        help="Escribe un registro JSONL por generación en este archivo dentro de la carpeta de salida.")
+    parser.add_argument('--progreso', type=float, default=None, metavar='SEGUNDOS',
+                        help="Imprime un resumen de la generación (con tiempo por fase) cada tantos segundos.")
+
+    grupo_ga = parser.add_argument_group("algoritmo genético")
+    grupo_ga.add_argument('--poblacion', type=int, default=POBLACION_SIZE, help="Tamaño de la población.")
+    grupo_ga.add_argument('--generaciones', type=int, default=GENERACIONES, help="Número máximo de generaciones.")
+    grupo_ga.add_argument('--tasa-cruce', type=float, default=TASA_CRUCE, help="Probabilidad de cruce.")
+    grupo_ga.add_argument('--tasa-mutacion', type=float, default=TASA_MUTACION, help="Probabilidad de mutación por asignación.")
+    grupo_ga.add_argument('--elitismo', type=int, default=ELITISMO_COUNT, help="Individuos que pasan intactos a la siguiente generación.")
+    grupo_ga.add_argument('--torneo', type=int, default=TOURNAMENT_SIZE, help="Participantes por torneo.")
+    grupo_ga.add_argument('--cruce', default=OPERADOR_CRUCE, choices=('uniforme', 'dias', 'grupos'),
+                          help="Operador de cruce: por asignación, por días completos o por grupos completos.")
+    grupo_ga.add_argument('--modo-evaluacion', default=MODO_EVALUACION, choices=('incremental', 'vectorizado', 'paralelo', 'completo'))
+    grupo_ga.add_argument('--procesos', type=int, default=NUM_PROCESOS, help="Procesos del modo 'paralelo'.")
+    grupo_ga.add_argument('--islas', type=int, default=NUM_ISLAS, help="Número de islas.")
+    grupo_ga.add_argument('--proporcion-grupal', type=float, default=PROPORCION_INICIAL_GRUPAL,
+                          help="Fracción de la población inicial creada por grupos (día de reunión y zona común).")
+    grupo_ga.add_argument('--proporcion-regret', type=float, default=PROPORCION_INICIAL_REGRET,
+                          help="Fracción de la población inicial creada con un escritorio único por empleado.")
+    grupo_ga.add_argument('--multiobjetivo', action='store_true', default=MULTIOBJETIVO,
+                          help="NSGA-II sobre días preferidos, reuniones, aislamiento y escritorio: escribe el frente de "
+                          "Pareto con sus KPIs en 'reporte_frente_pareto.csv'.")
+    grupo_ga.add_argument('--adaptativo', action='store_true', default=CONTROL_ADAPTATIVO,
+                          help="Ajusta las tasas de cruce y mutación durante la ejecución según qué operadores mejoran.")
+    grupo_ga.add_argument('--busqueda-local', default=BUSQUEDA_LOCAL, choices=('primera', 'mejor'),
+                          help="Activa el paso memético con primera o mejor mejora.")
+    grupo_ga.add_argument('--fraccion-busqueda-local', type=float, default=FRACCION_BUSQUEDA_LOCAL,
+                          help="Fracción de mejores individuos que se intensifica.")
+    grupo_ga.add_argument('--tiempo-busqueda-local', type=float, default=TIEMPO_BUSQUEDA_LOCAL,
+                          help="Segundos de búsqueda local por generación.")
+
+    grupo_solver = parser.add_argument_group("solver y parada")
+    grupo_solver.add_argument('--solver', default=SOLVER, choices=('ga', 'cp_sat', 'hibrido'))
+    grupo_solver.add_argument('--tiempo-limite-solver', type=float, default=TIEMPO_LIMITE_SOLVER, help="Segundos para CP-SAT.")
+    grupo_solver.add_argument('--trabajadores-solver', type=int, default=NUM_TRABAJADORES_SOLVER,
+                              help="Hilos de búsqueda de CP-SAT.")
+    grupo_solver.add_argument('--max-sin-mejora', type=int, default=MAX_GENERACIONES_SIN_MEJORA, help="Parar tras N generaciones sin mejora.")
+    grupo_solver.add_argument('--tiempo-limite', type=float, default=TIEMPO_LIMITE, help="Segundos para el bucle de generaciones.")
+    grupo_solver.add_argument('--penalizacion-objetivo', type=float, default=PENALIZACION_OBJETIVO, help="Parar al alcanzar esta penalización.")
+    grupo_solver.add_argument('--sin-cota-inferior', action='store_true', help="No parar al alcanzar la cota inferior.")
+
+    grupo_control = parser.add_argument_group("puntos de control")
+    grupo_control.add_argument('--punto-control', default=None, metavar='ARCHIVO',
+                               help="Guarda periódicamente el estado de la ejecución en este archivo (y al parar por --tiempo-limite).")
+    grupo_control.add_argument('--intervalo-punto-control', type=int, default=INTERVALO_PUNTO_CONTROL,
+                               help="Generaciones entre puntos de control.")
+    grupo_control.add_argument('--reanudar', action='store_true',
+                               help="Continúa desde --punto-control si el archivo existe (misma instancia y parámetros). "
+                               "El archivo se carga con pickle: use sólo puntos de control de confianza.")
+
+    grupo_replan = parser.add_argument_group("replanificación")
+    grupo_replan.add_argument('--replanificar', default=None, metavar='REPORTE',
+                              help="reporte_asignaciones.json del plan anterior: conserva las asignaciones de los "
+                              "empleados no afectados por los cambios de la instancia y reubica sólo a los demás.")
+    grupo_replan.add_argument('--instancia-anterior', default=None, metavar='JSON',
+                              help="Instancia del plan anterior (detecta también cambios de grupo).")
+    grupo_replan.add_argument('--penalizacion-cambio', type=int, default=PENALIZACION_CAMBIO,
+                              help="Penalización por cada asignación conservada que cambia (0: sin penalización).")
+    return parser
+
+
+def ejecutar_cli(argv=None):
+    """
+    Punto de entrada de la línea de comandos. Una sola instancia escribe sus
+    reportes directamente en --salida; varias se resuelven como un lote
+    (`ejecutar_lote`), donde un error en una instancia no detiene las demás.
+    Retorna el código de salida (0 si todas terminaron bien).
+    """
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    configurar_parametros(POBLACION_SIZE=args.poblacion, GENERACIONES=args.generaciones, TASA_CRUCE=args.tasa_cruce,
+                          TASA_MUTACION=args.tasa_mutacion, ELITISMO_COUNT=args.elitismo, TOURNAMENT_SIZE=args.torneo,
+                          OPERADOR_CRUCE=args.cruce,
+                          BUSQUEDA_LOCAL=args.busqueda_local, FRACCION_BUSQUEDA_LOCAL=args.fraccion_busqueda_local,
+                          TIEMPO_BUSQUEDA_LOCAL=args.tiempo_busqueda_local,
+                          PROPORCION_INICIAL_GRUPAL=args.proporcion_grupal, PROPORCION_INICIAL_REGRET=args.proporcion_regret,
+                          CONTROL_ADAPTATIVO=args.adaptativo, MULTIOBJETIVO=args.multiobjetivo)
+    opciones = {
+        'modo_evaluacion': args.modo_evaluacion, 'num_procesos': args.procesos, 'num_islas': args.islas,
+        'solver': args.solver, 'tiempo_limite_solver': args.tiempo_limite_solver,
+        'num_trabajadores_solver': args.trabajadores_solver,
+        'max_generaciones_sin_mejora': args.max_sin_mejora, 'tiempo_limite': args.tiempo_limite,
+        'penalizacion_objetivo': args.penalizacion_objetivo, 'usar_cota_inferior': not args.sin_cota_inferior,
+        'formatos_reporte': args.reportes, 'mostrar_progreso': not args.silencioso,
+        'callbacks': [ConsolaProgreso(args.progreso)] if args.progreso is not None else [],
+        'archivo_registro': args.registro,
+    }
+
+    rutas = expandir_entradas(args.entradas)
+    if args.replanificar:
+        if len(rutas) != 1:
+            parser.error("--replanificar requiere una sola instancia")
+        with open(args.replanificar, 'r', encoding='utf-8') as f:
+            replanificacion = {'reporte': json.load(f), 'penalizacion_cambio': args.penalizacion_cambio}
+        if args.instancia_anterior:
+            with open(args.instancia_anterior, 'r', encoding='utf-8') as f:
+                replanificacion['instancia_anterior'] = json.load(f)
+        opciones['replanificacion'] = replanificacion
+    elif args.instancia_anterior:
+        parser.error("--instancia-anterior requiere --replanificar")
+    if args.punto_control:
+        if len(rutas) != 1:
+            parser.error("--punto-control requiere una sola instancia")
+        opciones.update(archivo_punto_control=args.punto_control, intervalo_punto_control=args.intervalo_punto_control,
+                        reanudar=args.reanudar)
+    elif args.reanudar:
+        parser.error("--reanudar requiere --punto-control")
+    if len(rutas) == 1:
+        if args.trabajadores_reportes > 0:
+            with EtapaReportes(args.trabajadores_reportes, args.reportes) as etapa_reportes:
+                fila = _resolver_trabajo_lote(rutas[0], args.salida, {**opciones, 'formatos_reporte': ()}, args.semilla,
+                                              devolver_solucion=True)
+                trabajo = _encolar_reportes(etapa_reportes, fila, args.reportes)
+            _esperar_reportes(fila, trabajo)
+        else:
+            fila = _resolver_trabajo_lote(rutas[0], args.salida, opciones, args.semilla)
+        if fila['error']:
+            print(f"Error al procesar '{rutas[0]}': {fila['error']}", file=sys.stderr)
+            return 1
+        return 0
+    filas = ejecutar_lote(rutas, args.salida, opciones, args.trabajadores, args.semilla, args.trabajadores_reportes)
+    return 1 if any(fila['error'] for fila in filas) else 0
+
+
+if __name__ == "__main__":
+    # En un cuaderno de Colab se mantiene el flujo interactivo de carga de archivo
+    if 'google.colab' in sys.modules:
+        ejecutar_en_colab()
+    else:
+        sys.exit(ejecutar_cli())
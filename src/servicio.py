@@ -0,0 +1,522 @@
+"""
+Servicio HTTP local del solver (asyncio, sin dependencias externas).
+
+Recibe instancias con el esquema JSON de data/ y las resuelve con el algoritmo
+genético en un grupo de procesos que se crean al arrancar, con `main` ya
+importado y, opcionalmente, las instancias de --precargar ya preprocesadas
+(cada proceso guarda además las últimas instancias que resolvió). Los trabajos
+esperan en una cola hasta que haya un proceso libre; cada uno tiene su límite
+de tiempo (contado desde que un proceso lo toma, con el preprocesamiento y la
+población inicial incluidos), puede cancelarse y publica su mejor penalización
+cada vez que mejora.
+
+Uso:
+    python src/servicio.py --puerto 8765 --trabajadores 2 --precargar data/instance10.json
+
+Endpoints (JSON salvo /eventos):
+    POST   /trabajos                  {"instancia": {...}, "tiempo_limite": 10, "semilla": 1, "generaciones": 300}
+                                      -> 202 {"id": 1, "estado": "en_cola"}
+    GET    /trabajos/<id>             estado, posición en la cola, generación y mejor penalización
+    GET    /trabajos/<id>/resultado   penalización, asignaciones y KPIs (202 mientras no termine)
+    GET    /trabajos/<id>/eventos     text/event-stream con un evento 'progreso' por mejora y uno 'fin'
+    DELETE /trabajos/<id>             cancela el trabajo, en cola o en ejecución
+    GET    /estado                    procesos, trabajos en cola y en ejecución
+
+Ejemplo contra localhost:
+    curl -s -X POST localhost:8765/trabajos -d "{\"instancia\": $(cat data/instance1.json), \"tiempo_limite\": 5}"
+    curl -N localhost:8765/trabajos/1/eventos
+    curl -s localhost:8765/trabajos/1/resultado
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import random
+import time
+from collections import OrderedDict
+
+import main
+
+TIEMPO_LIMITE_POR_DEFECTO = 30.0  # Segundos por trabajo si la solicitud no indica otro
+TIEMPO_LIMITE_MAXIMO = 600.0  # Tope del límite de tiempo que puede pedir un trabajo
+MARGEN_TIEMPO = 5.0  # Segundos de gracia tras el límite antes de cancelar y, el doble, de reiniciar el proceso
+INSTANCIAS_EN_CACHE = 8  # Instancias preprocesadas que guarda cada proceso
+MAX_TRABAJOS_TERMINADOS = 1000  # Trabajos terminados que se conservan para consultar su resultado
+MAX_CUERPO = 64 * 1024 * 1024  # Tamaño máximo de una solicitud
+ESTADOS_FINALES = ('terminado', 'cancelado', 'error')
+
+
+# ==============================================================================
+# PROCESOS TRABAJADORES
+# ==============================================================================
+
+class _TrabajoCancelado(Exception):
+    """Se lanza dentro del proceso cuando el servicio cancela el trabajo en curso."""
+
+
+def _trabajador(indice, arranque, cola_entrada, cola_eventos, cancelar, parametros, modo_evaluacion, precargas):
+    """
+    Bucle de un proceso trabajador: preprocesa las instancias de `precargas`,
+    avisa que está listo (con su número de `arranque`) y resuelve los trabajos de
+    `cola_entrada` hasta recibir None. Envía a `cola_eventos` tuplas (tipo,
+    índice del proceso, id del trabajo, contenido) con tipo 'listo', 'inicio',
+    'progreso', 'terminado', 'cancelado' o 'error'. `cancelar` guarda el id del
+    trabajo a cancelar.
+    """
+    main.configurar_parametros(**parametros)
+    instancias = OrderedDict()  # Huella -> datos preprocesados (los más recientes al final)
+
+    def preparar(instancia):
+        huella = main.huella_instancia(instancia)
+        datos = instancias.pop(huella, None)
+        if datos is None:
+            datos = main.preprocesar_datos(instancia)
+        instancias[huella] = datos
+        while len(instancias) > INSTANCIAS_EN_CACHE:
+            instancias.popitem(last=False)
+        return datos
+
+    for instancia in precargas:
+        preparar(instancia)
+    cola_eventos.put(('listo', indice, None, arranque))
+
+    while True:
+        trabajo = cola_entrada.get()
+        if trabajo is None:
+            break
+        id_trabajo = trabajo['id']
+        inicio = time.perf_counter()
+        cola_eventos.put(('inicio', indice, id_trabajo, None))
+        try:
+            resultado = _resolver(trabajo, preparar(trabajo['instancia']), inicio, modo_evaluacion,
+                                  lambda progreso: cola_eventos.put(('progreso', indice, id_trabajo, progreso)),
+                                  lambda: cancelar.value == id_trabajo)
+            cola_eventos.put(('terminado', indice, id_trabajo, resultado))
+        except _TrabajoCancelado:
+            cola_eventos.put(('cancelado', indice, id_trabajo, None))
+        except Exception as e:
+            cola_eventos.put(('error', indice, id_trabajo, f"{type(e).__name__}: {e}"))
+
+
+def _resolver(trabajo, datos, inicio, modo_evaluacion, publicar, cancelado):
+    """
+    Resuelve un trabajo sobre `datos` ya preprocesados con `evolucionar_poblacion`.
+    El límite de tiempo cuenta desde `inicio` (cuando el proceso recibió el
+    trabajo), así que incluye el preprocesamiento y la población inicial: el
+    bucle de generaciones recibe sólo lo que queda (y hace al menos una
+    generación). Cada generación comprueba `cancelado()` y, si la mejor
+    penalización mejoró, llama a `publicar` con la generación, la penalización y
+    los segundos desde `inicio`.
+    """
+    if cancelado():
+        raise _TrabajoCancelado
+    generaciones = main.GENERACIONES
+    if trabajo.get('generaciones'):
+        main.configurar_parametros(GENERACIONES=trabajo['generaciones'])
+    ultima = [None]
+
+    def progreso(registro):
+        if cancelado():
+            raise _TrabajoCancelado
+        if registro['mejor_global'] != ultima[0]:
+            ultima[0] = registro['mejor_global']
+            publicar({'generacion': registro['generacion'], 'mejor_penalizacion': registro['mejor_global'],
+                      'tiempo': time.perf_counter() - inicio})
+
+    try:
+        if trabajo.get('semilla') is not None:
+            random.seed(trabajo['semilla'])
+        poblacion = main.preparar_poblacion(main.crear_poblacion_inicial(datos, main.POBLACION_SIZE), datos, modo_evaluacion)
+        restante = max(trabajo['tiempo_limite'] - (time.perf_counter() - inicio), 0.0)
+        criterios_parada = {'tiempo_limite': restante,
+                            'penalizacion_objetivo': trabajo.get('penalizacion_objetivo'),
+                            'cota_inferior': main.calcular_cota_inferior(datos)}
+        resultado = main.evolucionar_poblacion(poblacion, datos, modo_evaluacion, criterios_parada=criterios_parada,
+                                               mostrar_progreso=False, callbacks=[progreso])
+    finally:
+        main.configurar_parametros(GENERACIONES=generaciones)
+
+    return {
+        'penalizacion': resultado['mejor_penalizacion'],
+        'generacion_parada': resultado['generacion_parada'],
+        'motivo_parada': resultado['motivo_parada'],
+        'tiempo': time.perf_counter() - inicio,
+        'asignaciones': [{'empleado': e, 'dia': d, 'escritorio': desk}
+                         for e, d, desk in main._filas_asignacion(resultado['mejor_asignacion'])],
+        'kpis': main.reportar_resultados(resultado['mejor_asignacion'], datos),
+    }
+
+
+# ==============================================================================
+# SERVICIO
+# ==============================================================================
+
+class ServicioSolver:
+    """
+    Cola de trabajos, procesos trabajadores y servidor HTTP. Todo el estado de
+    los trabajos vive en el bucle de asyncio; los procesos sólo reciben el
+    trabajo y devuelven eventos por una cola que lee un hilo auxiliar.
+    """
+
+    def __init__(self, num_trabajadores=1, precargas=(), modo_evaluacion='vectorizado',
+                 tiempo_limite_maximo=TIEMPO_LIMITE_MAXIMO, parametros=None):
+        self.num_trabajadores = num_trabajadores
+        self.precargas = list(precargas)
+        self.modo_evaluacion = modo_evaluacion
+        self.tiempo_limite_maximo = tiempo_limite_maximo
+        self.parametros = parametros if parametros is not None else main.parametros_algoritmo()
+        self.trabajos = {}
+        self.ids = itertools.count(1)
+        self.en_cola = []  # Ids en orden de llegada (la cola de asyncio sólo despierta al despachador)
+        self.procesos = []  # Por proceso: dict con 'proceso', 'arranque', 'cola', 'cancelar' y 'trabajo' (id en curso o None)
+
+    # --- Ciclo de vida ---
+
+    async def iniciar(self, host='127.0.0.1', puerto=8765):
+        """Arranca los procesos, espera a que estén listos y abre el servidor HTTP. Retorna el servidor."""
+        self.bucle = asyncio.get_running_loop()
+        self.cola_eventos = multiprocessing.Queue()
+        self.libres = asyncio.Queue()  # (índice, arranque) de los procesos sin trabajo
+        self.pendientes = asyncio.Queue()
+        self.listos = 0
+        self.todos_listos = asyncio.Event()
+        for i in range(self.num_trabajadores):
+            self.procesos.append(None)
+            self._iniciar_proceso(i)
+        self.tareas = [asyncio.ensure_future(corrutina) for corrutina in
+                       (self._leer_eventos(), self._despachar(), self._supervisar())]
+        await self.todos_listos.wait()
+        self.servidor = await asyncio.start_server(self._atender, host, puerto)
+        return self.servidor
+
+    def _iniciar_proceso(self, i):
+        """
+        Arranca (o reemplaza) el proceso `i`. Cada arranque tiene su número, de
+        modo que las entradas de `libres` de un proceso ya reemplazado se descartan.
+        """
+        arranque = self.procesos[i]['arranque'] + 1 if self.procesos[i] else 0
+        cola, cancelar = multiprocessing.Queue(), multiprocessing.Value('q', 0)
+        proceso = multiprocessing.Process(
+            target=_trabajador,
+            args=(i, arranque, cola, self.cola_eventos, cancelar, self.parametros, self.modo_evaluacion, self.precargas),
+            daemon=True)
+        proceso.start()
+        self.procesos[i] = {'proceso': proceso, 'arranque': arranque, 'cola': cola, 'cancelar': cancelar, 'trabajo': None}
+
+    async def cerrar(self):
+        """Cierra el servidor, detiene los procesos y las tareas auxiliares."""
+        if getattr(self, 'servidor', None) is not None:
+            self.servidor.close()
+            await self.servidor.wait_closed()
+        for tarea in self.tareas:
+            tarea.cancel()
+        for info in self.procesos:
+            info['cola'].put(None)
+        for info in self.procesos:
+            await self.bucle.run_in_executor(None, info['proceso'].join, MARGEN_TIEMPO)
+            if info['proceso'].is_alive():
+                info['proceso'].terminate()
+        self.cola_eventos.put(None)
+
+    # --- Trabajos ---
+
+    def enviar(self, instancia, tiempo_limite=None, semilla=None, generaciones=None, penalizacion_objetivo=None):
+        """Valida la solicitud (ValueError si no es válida), encola el trabajo y retorna su id."""
+        if not isinstance(instancia, dict) or not instancia.get("Employees"):
+            raise ValueError("'instancia' debe ser un objeto con el esquema de data/ (Employees, Desks, Days, ...)")
+        _validar_numero('tiempo_limite', tiempo_limite, minimo=0, incluir_minimo=False)
+        _validar_numero('semilla', semilla, entero=True)
+        _validar_numero('generaciones', generaciones, entero=True, minimo=1)
+        _validar_numero('penalizacion_objetivo', penalizacion_objetivo)
+        tiempo_limite = min(float(tiempo_limite or TIEMPO_LIMITE_POR_DEFECTO), self.tiempo_limite_maximo)
+        id_trabajo = next(self.ids)
+        self.trabajos[id_trabajo] = {
+            'id': id_trabajo, 'estado': 'en_cola', 'creado': time.time(), 'inicio': None, 'fin': None,
+            'tiempo_limite': tiempo_limite, 'generacion': None, 'mejor_penalizacion': None, 'eventos': [],
+            'resultado': None, 'error': None, 'cambio': asyncio.Condition(),
+            'solicitud': {'id': id_trabajo, 'instancia': instancia, 'tiempo_limite': tiempo_limite, 'semilla': semilla,
+                          'generaciones': generaciones, 'penalizacion_objetivo': penalizacion_objetivo},
+        }
+        self.en_cola.append(id_trabajo)
+        self.pendientes.put_nowait(id_trabajo)
+        self._podar()
+        return id_trabajo
+
+    async def cancelar(self, id_trabajo):
+        """Cancela un trabajo en cola (de inmediato) o en ejecución (el proceso lo deja en la siguiente generación)."""
+        trabajo = self.trabajos[id_trabajo]
+        if trabajo['estado'] == 'en_cola':
+            self.en_cola.remove(id_trabajo)
+            await self._finalizar(trabajo, 'cancelado')
+        elif trabajo['estado'] == 'ejecutando':
+            trabajo['estado'] = 'cancelando'
+            self.procesos[trabajo['trabajador']]['cancelar'].value = id_trabajo
+
+    def resumen(self, trabajo):
+        """Estado público de un trabajo."""
+        resumen = {clave: trabajo[clave] for clave in
+                   ('id', 'estado', 'tiempo_limite', 'generacion', 'mejor_penalizacion', 'error')}
+        resumen['posicion_en_cola'] = self.en_cola.index(trabajo['id']) if trabajo['estado'] == 'en_cola' else None
+        inicio = trabajo['inicio']
+        resumen['tiempo'] = ((trabajo['fin'] or time.time()) - inicio) if inicio else None
+        return resumen
+
+    async def _finalizar(self, trabajo, estado, resultado=None, error=None):
+        trabajo.update(estado=estado, resultado=resultado, error=error, fin=time.time())
+        trabajo.pop('solicitud', None)
+        async with trabajo['cambio']:
+            trabajo['cambio'].notify_all()
+
+    def _podar(self):
+        """Olvida los trabajos terminados más antiguos por encima de MAX_TRABAJOS_TERMINADOS."""
+        terminados = [i for i, t in self.trabajos.items() if t['estado'] in ESTADOS_FINALES]
+        for id_trabajo in terminados[:max(0, len(terminados) - MAX_TRABAJOS_TERMINADOS)]:
+            del self.trabajos[id_trabajo]
+
+    # --- Tareas auxiliares ---
+
+    async def _despachar(self):
+        """Entrega cada trabajo en cola, en orden de llegada, al primer proceso libre."""
+        while True:
+            id_trabajo = await self.pendientes.get()
+            trabajo = self.trabajos.get(id_trabajo)
+            if trabajo is None or trabajo['estado'] != 'en_cola':
+                continue
+            i = await self._proceso_libre()
+            if trabajo['estado'] != 'en_cola':  # Cancelado mientras esperaba un proceso
+                self.libres.put_nowait((i, self.procesos[i]['arranque']))
+                continue
+            self.en_cola.remove(id_trabajo)
+            trabajo.update(estado='ejecutando', trabajador=i, inicio=time.time())
+            self.procesos[i]['trabajo'] = id_trabajo
+            self.procesos[i]['cola'].put(trabajo['solicitud'])
+
+    async def _proceso_libre(self):
+        """Espera un proceso libre y vivo; descarta los reemplazados y reinicia los que murieron sin trabajo."""
+        while True:
+            i, arranque = await self.libres.get()
+            info = self.procesos[i]
+            if arranque != info['arranque']:
+                continue
+            if not info['proceso'].is_alive():
+                self._iniciar_proceso(i)  # Vuelve a `libres` cuando el nuevo proceso avise que está listo
+                continue
+            return i
+
+    async def _leer_eventos(self):
+        """Lee los eventos de los procesos (en un hilo, porque la cola es bloqueante) y actualiza los trabajos."""
+        while True:
+            evento = await self.bucle.run_in_executor(None, self.cola_eventos.get)
+            if evento is None:
+                return
+            tipo, i, id_trabajo, contenido = evento
+            if tipo == 'listo':
+                if contenido != self.procesos[i]['arranque']:
+                    continue
+                self.libres.put_nowait((i, contenido))
+                self.listos += 1
+                if self.listos >= self.num_trabajadores:
+                    self.todos_listos.set()
+                continue
+            trabajo = self.trabajos.get(id_trabajo)
+            if trabajo is None or trabajo['estado'] in ESTADOS_FINALES:
+                continue
+            if tipo == 'progreso':
+                trabajo.update(generacion=contenido['generacion'], mejor_penalizacion=contenido['mejor_penalizacion'])
+                trabajo['eventos'].append(contenido)
+                async with trabajo['cambio']:
+                    trabajo['cambio'].notify_all()
+            elif tipo in ESTADOS_FINALES:
+                if tipo == 'terminado':
+                    trabajo.update(generacion=contenido['generacion_parada'], mejor_penalizacion=contenido['penalizacion'])
+                await self._finalizar(trabajo, tipo, resultado=contenido if tipo == 'terminado' else None,
+                                      error=contenido if tipo == 'error' else None)
+                if self.procesos[i]['trabajo'] == id_trabajo:
+                    self.procesos[i]['trabajo'] = None
+                    self.libres.put_nowait((i, self.procesos[i]['arranque']))
+
+    async def _supervisar(self):
+        """
+        Hace cumplir los límites de tiempo: cancela el trabajo que pasa su límite
+        más MARGEN_TIEMPO y, si tras otro margen sigue ocupado (o el proceso murió),
+        termina el proceso, marca el trabajo con error y arranca uno nuevo. Los
+        procesos que mueren sin trabajo se reemplazan antes de recibir uno.
+        """
+        while True:
+            await asyncio.sleep(0.5)
+            ahora = time.time()
+            for i, info in enumerate(self.procesos):
+                trabajo = self.trabajos.get(info['trabajo'])
+                if trabajo is None:
+                    if not info['proceso'].is_alive():
+                        self._iniciar_proceso(i)
+                    continue
+                exceso = ahora - trabajo['inicio'] - trabajo['tiempo_limite']
+                vivo = info['proceso'].is_alive()
+                if vivo and exceso > MARGEN_TIEMPO and info['cancelar'].value != trabajo['id']:
+                    info['cancelar'].value = trabajo['id']
+                if not vivo or exceso > 2 * MARGEN_TIEMPO:
+                    info['proceso'].terminate()
+                    motivo = "el proceso excedió el límite de tiempo" if vivo else "el proceso terminó inesperadamente"
+                    await self._finalizar(trabajo, 'error', error=motivo)
+                    self._iniciar_proceso(i)
+
+    # --- HTTP ---
+
+    async def _atender(self, lector, escritor):
+        """Atiende una conexión HTTP/1.1 con una sola solicitud."""
+        try:
+            linea = await lector.readline()
+            if not linea:
+                return
+            metodo, ruta, _ = linea.decode('latin-1').split(' ', 2)
+            cabeceras = {}
+            while True:
+                linea = await lector.readline()
+                if linea in (b'\r\n', b'\n', b''):
+                    break
+                nombre, _, valor = linea.decode('latin-1').partition(':')
+                cabeceras[nombre.strip().lower()] = valor.strip()
+            longitud = int(cabeceras.get('content-length') or 0)
+            if longitud > MAX_CUERPO:
+                await self._responder(escritor, 413, {'error': "Solicitud demasiado grande"})
+                return
+            cuerpo = await lector.readexactly(longitud) if longitud else b''
+            await self._enrutar(metodo.upper(), ruta.split('?', 1)[0].rstrip('/'), cuerpo, escritor)
+        except (ValueError, TypeError, asyncio.IncompleteReadError):
+            await self._responder(escritor, 400, {'error': "Solicitud HTTP mal formada"})
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+
+    async def _enrutar(self, metodo, ruta, cuerpo, escritor):
+        partes = [parte for parte in ruta.split('/') if parte]
+        if partes == ['estado'] and metodo == 'GET':
+            await self._responder(escritor, 200, {
+                'trabajadores': self.num_trabajadores,
+                'en_cola': len(self.en_cola),
+                'ejecutando': sum(1 for info in self.procesos if info['trabajo'] is not None),
+            })
+            return
+        if partes == ['trabajos'] and metodo == 'POST':
+            try:
+                solicitud = json.loads(cuerpo or b'{}')
+                if not isinstance(solicitud, dict):
+                    raise ValueError("El cuerpo debe ser un objeto JSON")
+                opciones = {clave: solicitud.get(clave) for clave in
+                            ('tiempo_limite', 'semilla', 'generaciones', 'penalizacion_objetivo')}
+                id_trabajo = self.enviar(solicitud.get('instancia'), **opciones)
+            except ValueError as e:
+                await self._responder(escritor, 400, {'error': str(e)})
+                return
+            await self._responder(escritor, 202, self.resumen(self.trabajos[id_trabajo]))
+            return
+        if len(partes) in (2, 3) and partes[0] == 'trabajos':
+            trabajo = self.trabajos.get(int(partes[1])) if partes[1].isdigit() else None
+            if trabajo is None:
+                await self._responder(escritor, 404, {'error': "Trabajo no encontrado"})
+                return
+            accion = partes[2] if len(partes) == 3 else None
+            if accion is None and metodo == 'GET':
+                await self._responder(escritor, 200, self.resumen(trabajo))
+                return
+            if accion is None and metodo == 'DELETE':
+                await self.cancelar(trabajo['id'])
+                await self._responder(escritor, 202, self.resumen(trabajo))
+                return
+            if accion == 'resultado' and metodo == 'GET':
+                if trabajo['estado'] == 'terminado':
+                    await self._responder(escritor, 200, dict(self.resumen(trabajo), **trabajo['resultado']))
+                elif trabajo['estado'] in ESTADOS_FINALES:
+                    await self._responder(escritor, 409, self.resumen(trabajo))
+                else:
+                    await self._responder(escritor, 202, self.resumen(trabajo))
+                return
+            if accion == 'eventos' and metodo == 'GET':
+                await self._transmitir_eventos(trabajo, escritor)
+                return
+        await self._responder(escritor, 404, {'error': f"Ruta desconocida: {metodo} {ruta}"})
+
+    async def _responder(self, escritor, estado, contenido):
+        cuerpo = json.dumps(contenido, ensure_ascii=False).encode('utf-8')
+        escritor.write(f"HTTP/1.1 {estado} {_TEXTOS_ESTADO.get(estado, '')}\r\n"
+                       f"Content-Type: application/json; charset=utf-8\r\n"
+                       f"Content-Length: {len(cuerpo)}\r\nConnection: close\r\n\r\n".encode('latin-1') + cuerpo)
+        await escritor.drain()
+
+    async def _transmitir_eventos(self, trabajo, escritor):
+        """Server-Sent Events: todos los eventos 'progreso' del trabajo (también los ya ocurridos) y un 'fin'."""
+        escritor.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nCache-Control: no-cache\r\n"
+                       b"Connection: close\r\n\r\n")
+        enviados = 0
+        while True:
+            async with trabajo['cambio']:
+                await trabajo['cambio'].wait_for(
+                    lambda: len(trabajo['eventos']) > enviados or trabajo['estado'] in ESTADOS_FINALES)
+            for evento in trabajo['eventos'][enviados:]:
+                escritor.write(f"event: progreso\ndata: {json.dumps(evento)}\n\n".encode('utf-8'))
+            enviados = len(trabajo['eventos'])
+            await escritor.drain()
+            if trabajo['estado'] in ESTADOS_FINALES:
+                escritor.write(f"event: fin\ndata: {json.dumps(self.resumen(trabajo), ensure_ascii=False)}\n\n".encode('utf-8'))
+                await escritor.drain()
+                return
+
+
+def _validar_numero(nombre, valor, entero=False, minimo=None, incluir_minimo=True):
+    """ValueError si `valor` no es None ni un número JSON (entero si `entero`) no menor que `minimo`."""
+    if valor is None:
+        return
+    tipos = int if entero else (int, float)
+    if isinstance(valor, bool) or not isinstance(valor, tipos):
+        raise ValueError(f"'{nombre}' debe ser un número{' entero' if entero else ''}")
+    if minimo is not None and (valor < minimo or (valor == minimo and not incluir_minimo)):
+        raise ValueError(f"'{nombre}' debe ser {'al menos' if incluir_minimo else 'mayor que'} {minimo}")
+
+
+_TEXTOS_ESTADO = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 409: 'Conflict',
+                  413: 'Payload Too Large'}
+
+
+# ==============================================================================
+# EJECUCIÓN
+# ==============================================================================
+
+def crear_parser():
+    """Parser de argumentos de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Servicio HTTP local del solver de asignación de escritorios.")
+    parser.add_argument('--host', default='127.0.0.1', help="Dirección en la que escuchar (por defecto, sólo localhost).")
+    parser.add_argument('--puerto', type=int, default=8765, help="Puerto HTTP.")
+    parser.add_argument('--trabajadores', type=int, default=1, help="Procesos que resuelven trabajos a la vez.")
+    parser.add_argument('--precargar', nargs='*', default=[], metavar='JSON',
+                        help="Instancias que cada proceso preprocesa al arrancar.")
+    parser.add_argument('--modo-evaluacion', default='vectorizado', choices=('incremental', 'vectorizado', 'completo'))
+    parser.add_argument('--poblacion', type=int, default=main.POBLACION_SIZE, help="Tamaño de la población.")
+    parser.add_argument('--tiempo-limite-maximo', type=float, default=TIEMPO_LIMITE_MAXIMO,
+                        help="Tope de segundos que puede pedir un trabajo.")
+    return parser
+
+
+async def _servir(args):
+    precargas = []
+    for ruta in args.precargar:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            precargas.append(json.load(f))
+    main.configurar_parametros(POBLACION_SIZE=args.poblacion)
+    servicio = ServicioSolver(args.trabajadores, precargas, args.modo_evaluacion, args.tiempo_limite_maximo)
+    try:
+        servidor = await servicio.iniciar(args.host, args.puerto)
+        print(f"Servicio escuchando en http://{args.host}:{args.puerto} con {args.trabajadores} procesos")
+        await servidor.serve_forever()
+    finally:
+        await servicio.cerrar()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_servir(crear_parser().parse_args()))
+    except KeyboardInterrupt:
+        pass
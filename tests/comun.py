@@ -0,0 +1,36 @@
+"""Utilidades compartidas por las pruebas: importa src/main.py y carga instancias de data/."""
+
+import json
+import os
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(RAIZ, 'src'))
+
+import main  # noqa: E402
+
+DIA_FUERA_DE_CALENDARIO = 'Sa'
+
+
+def leer_instancia(nombre):
+    """JSON de data/<nombre>.json sin preprocesar."""
+    with open(os.path.join(RAIZ, 'data', f'{nombre}.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def cargar_instancia(nombre, dia_fuera_de_calendario=False):
+    """Lee data/<nombre>.json; con `dia_fuera_de_calendario`, añade un día preferido que no está en Days."""
+    datos = leer_instancia(nombre)
+    if dia_fuera_de_calendario:
+        for e in datos['Employees'][:3]:
+            datos['Days_E'][e] = list(datos['Days_E'].get(e, [])) + [DIA_FUERA_DE_CALENDARIO]
+    return main.preprocesar_datos(datos)
+
+
+def instancia_reunion_fuera_de_calendario():
+    """Dos empleados de un grupo, un escritorio permitido cada uno y su único día preferido fuera de Days (óptimo 0)."""
+    return {
+        "Employees": ["E0", "E1"], "Desks": ["D0", "D1"], "Days": ["L"], "Groups": ["G0"], "Zones": ["Z0"],
+        "Desks_Z": {"Z0": ["D0", "D1"]}, "Desks_E": {"E0": ["D0"], "E1": ["D1"]},
+        "Employees_G": {"G0": ["E0", "E1"]}, "Days_E": {"E0": [DIA_FUERA_DE_CALENDARIO], "E1": [DIA_FUERA_DE_CALENDARIO]},
+    }
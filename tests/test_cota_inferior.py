@@ -0,0 +1,24 @@
+"""`calcular_cota_inferior` nunca supera la penalización de una asignación, también con días fuera del calendario."""
+
+import random
+
+import pytest
+
+from comun import cargar_instancia, instancia_reunion_fuera_de_calendario, main
+
+
+@pytest.mark.parametrize('nombre, dia_fuera_de_calendario',
+                         [('instance1', False), ('instance5', False), ('instance10', False), ('instance1', True)])
+def test_cota_inferior_no_supera_la_penalizacion(nombre, dia_fuera_de_calendario):
+    datos = cargar_instancia(nombre, dia_fuera_de_calendario)
+    random.seed(11)
+    cota = main.calcular_cota_inferior(datos)
+    for individuo in main.crear_poblacion_inicial(datos, 20):
+        assert cota <= main.calcular_fitness(individuo, datos)
+
+
+def test_cota_inferior_con_reunion_fuera_de_calendario():
+    datos = main.preprocesar_datos(instancia_reunion_fuera_de_calendario())
+    asignacion = {('E0', 'Sa'): 'D0', ('E1', 'Sa'): 'D1'}
+    assert main.calcular_fitness(asignacion, datos) == 0
+    assert main.calcular_cota_inferior(datos) == 0
@@ -0,0 +1,30 @@
+"""El modelo de `resolver_cp_sat` optimiza la misma penalización que `calcular_fitness`."""
+
+import re
+
+import pytest
+
+from comun import cargar_instancia, instancia_reunion_fuera_de_calendario, main
+
+pytest.importorskip('ortools')
+
+
+def test_cp_sat_asigna_dias_preferidos_fuera_de_calendario(capsys):
+    datos = main.preprocesar_datos(instancia_reunion_fuera_de_calendario())
+    penalizacion, asignacion = main.resolver_cp_sat(datos, tiempo_limite=10, num_trabajadores=1)
+    assert penalizacion == 0
+    assert asignacion == {('E0', 'Sa'): 'D0', ('E1', 'Sa'): 'D1'}
+    assert "estado OPTIMAL, objetivo 0" in capsys.readouterr().out
+
+
+def test_objetivo_cp_sat_igual_a_calcular_fitness(capsys):
+    datos = cargar_instancia('instance1', dia_fuera_de_calendario=True)
+    penalizacion, asignacion = main.resolver_cp_sat(datos, tiempo_limite=5, num_trabajadores=1)
+    assert asignacion is not None and main.es_factible(asignacion, datos)
+    estado, objetivo = re.search(r"estado (\w+), objetivo ([0-9.]+)", capsys.readouterr().out).groups()
+    assert penalizacion == main.calcular_fitness(asignacion, datos)
+    # Las variables auxiliares (sin asignar, ausente, aislado, escritorio usado) sólo
+    # están acotadas por debajo: una solución FEASIBLE puede sobrestimar, nunca subestimar
+    assert penalizacion <= float(objetivo)
+    if estado == 'OPTIMAL':
+        assert penalizacion == float(objetivo)
@@ -0,0 +1,107 @@
+"""
+La penalización que mantiene `AsignacionIncremental` y la de la evaluación
+vectorizada coinciden con `calcular_fitness` tras cada cruce, mutación y reparación.
+
+Ejecutar desde la raíz del repositorio: python -m pytest -q tests
+"""
+
+import random
+
+import pytest
+
+from comun import DIA_FUERA_DE_CALENDARIO, cargar_instancia, leer_instancia, main
+
+TASAS_MUTACION = {'mutacion': 0.2, 'escritorio': 0.4, 'dia': 0.3, 'adicion': 0.5}
+OPERADORES_CRUCE = ('uniforme', 'dias', 'grupos')
+
+
+CASOS = [('instance1', False), ('instance5', False), ('instance10', False), ('instance1', True)]
+
+
+def _comprobar(individuo, datos):
+    esperada = main.calcular_fitness(dict(individuo), datos)
+    assert individuo.penalizacion == esperada
+    codificacion = datos['codificacion']
+    assert main.calcular_fitness_poblacion(main.poblacion_a_tensor([individuo], codificacion), codificacion)[0] == esperada
+
+
+@pytest.mark.parametrize('nombre, dia_fuera_de_calendario', CASOS)
+def test_penalizacion_incremental_igual_a_calcular_fitness(nombre, dia_fuera_de_calendario):
+    datos = cargar_instancia(nombre, dia_fuera_de_calendario)
+    random.seed(7)
+    escritorios_por_empleado, indice = datos['escritorios_por_empleado'], datos['indice']
+    poblacion = main.preparar_poblacion(main.crear_poblacion_inicial(datos, 8), datos, 'incremental')
+    for individuo in poblacion:
+        _comprobar(individuo, datos)
+    if dia_fuera_de_calendario:
+        assert any(d == DIA_FUERA_DE_CALENDARIO for individuo in poblacion for (_, d) in individuo)
+
+    for _ in range(60):
+        padre1, padre2 = random.sample(poblacion, 2)
+        antes = [(dict(padre), padre.penalizacion) for padre in (padre1, padre2)]
+        if random.random() < 0.5:
+            hijo = main.cruzar(padre1, padre2, escritorios_por_empleado, indice, reparar=False,
+                               operador=random.choice(OPERADORES_CRUCE))
+        else:
+            hijo = main.mutar(padre1, datos['employees'], datos['days'], escritorios_por_empleado, indice,
+                              reparar=False, tasas=TASAS_MUTACION)
+        _comprobar(hijo, datos)
+        hijo = main.reparar_individuo(hijo, escritorios_por_empleado, indice)
+        _comprobar(hijo, datos)
+        # Los operadores copian al escribir: los padres quedan intactos
+        assert [(dict(padre), padre.penalizacion) for padre in (padre1, padre2)] == antes
+        poblacion[random.randrange(len(poblacion))] = hijo
+
+
+def test_reunion_en_dia_fuera_de_calendario():
+    datos = leer_instancia('instance1')
+    _, miembros = next(iter(datos['Employees_G'].items()))
+    for e in miembros:
+        datos['Days_E'][e] = [DIA_FUERA_DE_CALENDARIO]
+    datos = main.preprocesar_datos(datos)
+    asignacion = {(e, DIA_FUERA_DE_CALENDARIO): datos['escritorios_por_empleado'][e][0] for e in miembros}
+    individuo = main.AsignacionIncremental(asignacion, datos)
+    _comprobar(individuo, datos)
+    for e in miembros:
+        individuo = individuo.copy()
+        del individuo[(e, DIA_FUERA_DE_CALENDARIO)]
+        _comprobar(individuo, datos)
+
+
+def test_modos_de_evaluacion_con_dia_fuera_de_calendario():
+    datos = cargar_instancia('instance1', dia_fuera_de_calendario=True)
+    random.seed(3)
+    poblacion = main.crear_poblacion_inicial(datos, 10)
+    esperadas = [main.calcular_fitness(individuo, datos) for individuo in poblacion]
+    for modo in ('incremental', 'vectorizado', 'completo'):
+        assert main.evaluar_poblacion(main.preparar_poblacion(poblacion, datos, modo), datos, modo) == esperadas
+
+
+def test_cache_fitness_lru():
+    cache = main.CacheFitness(capacidad=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.obtener('a') == 1  # 'a' pasa a ser la más reciente
+    cache.guardar('c', 3)
+    assert cache.obtener('b') is None
+    assert (cache.obtener('a'), cache.obtener('c')) == (1, 3)
+    cache.guardar('d', 4)
+    assert cache.obtener('a') is None and cache.obtener('d') == 4
+    assert cache.estadisticas() == {'aciertos': 4, 'fallos': 2, 'tasa_aciertos': 4 / 6, 'entradas': 2}
+
+
+@pytest.mark.parametrize('modo', ['vectorizado', 'completo'])
+def test_evaluar_poblacion_con_cache_igual_que_sin_cache(modo):
+    datos = cargar_instancia('instance1', dia_fuera_de_calendario=True)
+    random.seed(13)
+    poblacion = main.preparar_poblacion(main.crear_poblacion_inicial(datos, 8), datos, modo)
+    # Capacidad menor que la población: hay desalojos entre una generación y la siguiente
+    cache = main.CacheFitness(capacidad=6)
+    for _ in range(15):
+        assert main.evaluar_poblacion(poblacion, datos, modo, cache=cache) == main.evaluar_poblacion(poblacion, datos, modo)
+        # Siguiente población: copias (genomas repetidos) e hijos mutados
+        poblacion = [random.choice(poblacion).copy() for _ in range(4)] + [
+            main.mutar(random.choice(poblacion), datos['employees'], datos['days'], datos['escritorios_por_empleado'],
+                       datos['indice'], tasas=TASAS_MUTACION) for _ in range(6)]
+    estadisticas = cache.estadisticas()
+    assert estadisticas['aciertos'] > 0 and estadisticas['fallos'] > 0 and estadisticas['entradas'] <= 6
@@ -0,0 +1,64 @@
+"""`ordenar_no_dominados` y `distancia_crowding` contra una referencia directa en matrices aleatorias."""
+
+import math
+
+import numpy as np
+import pytest
+
+from comun import main
+
+
+def _domina(a, b, violacion_a=0, violacion_b=0):
+    if violacion_a or violacion_b:
+        return violacion_a < violacion_b
+    return all(x <= y for x, y in zip(a, b)) and any(x < y for x, y in zip(a, b))
+
+
+def _rangos_fuerza_bruta(objetivos, violaciones):
+    """Pela frentes uno a uno: cada frente son los restantes que ningún otro restante domina."""
+    restantes = set(range(len(objetivos)))
+    rangos = [None] * len(objetivos)
+    rango = 0
+    while restantes:
+        frente = {i for i in restantes
+                  if not any(_domina(objetivos[j], objetivos[i], violaciones[j], violaciones[i]) for j in restantes)}
+        for i in frente:
+            rangos[i] = rango
+        restantes -= frente
+        rango += 1
+    return rangos
+
+
+@pytest.mark.parametrize('con_violaciones', [False, True])
+def test_rangos_iguales_a_fuerza_bruta(con_violaciones):
+    generador = np.random.default_rng(11)
+    for _ in range(200):
+        n, m = generador.integers(1, 25), generador.integers(1, 5)
+        # Valores pequeños para que haya empates e individuos repetidos
+        objetivos = generador.integers(0, 4, size=(n, m))
+        violaciones = generador.integers(0, 3, size=n) * generador.integers(0, 2, size=n) if con_violaciones else None
+        esperados = _rangos_fuerza_bruta(objetivos.tolist(), violaciones.tolist() if con_violaciones else [0] * n)
+        assert main.ordenar_no_dominados(objetivos, violaciones).tolist() == esperados
+
+
+def test_extremos_con_distancia_infinita():
+    generador = np.random.default_rng(5)
+    for _ in range(100):
+        objetivos = generador.integers(0, 50, size=(generador.integers(1, 30), 3))
+        rangos = main.ordenar_no_dominados(objetivos)
+        distancia = main.distancia_crowding(objetivos, rangos)
+        for rango in np.unique(rangos):
+            miembros = np.flatnonzero(rangos == rango)
+            for k in range(objetivos.shape[1]):
+                valores = objetivos[miembros, k]
+                # Con empates, el extremo es el primero (o último) del orden estable
+                for extremo in (miembros[np.argmin(valores)], miembros[np.flatnonzero(valores == valores.max())[-1]]):
+                    assert distancia[extremo] == math.inf
+            assert np.isfinite(distancia[miembros]).sum() <= max(len(miembros) - 2, 0)
+
+
+def test_distancia_de_puntos_interiores():
+    objetivos = np.array([[0, 4], [1, 3], [3, 1], [4, 0]])
+    distancia = main.distancia_crowding(objetivos, np.zeros(4, dtype=np.int64))
+    # (3 - 0) / 4 en cada objetivo para el segundo; (4 - 1) / 4 para el tercero
+    assert distancia.tolist() == [math.inf, 1.5, 1.5, math.inf]
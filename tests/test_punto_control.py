@@ -0,0 +1,64 @@
+"""Reanudar desde un punto de control reproduce exactamente la ejecución sin interrumpir."""
+
+import contextlib
+import copy
+import io
+import random
+
+import pytest
+
+from comun import leer_instancia, main
+
+GENERACIONES = 20
+
+
+class _Corte(Exception):
+    """Simula la interrupción de la ejecución."""
+
+
+def _ejecutar(instancia, callbacks=(), **opciones):
+    trayectoria = {}
+
+    def registrar(registro):
+        trayectoria[registro['generacion']] = (registro['mejor'], registro['media'])
+
+    random.seed(5)
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultado = main.resolver_instancia(copy.deepcopy(instancia), 'incremental', mostrar_progreso=False,
+                                            usar_cota_inferior=False, callbacks=[registrar, *callbacks], **opciones)
+    return resultado, trayectoria
+
+
+def test_reanudar_da_la_misma_mejor_asignacion(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'GENERACIONES', GENERACIONES)
+    instancia = leer_instancia('instance1')
+    completo, trayectoria_completa = _ejecutar(instancia)
+
+    archivo = str(tmp_path / 'corrida.ckpt')
+
+    def cortar(registro):
+        if registro['generacion'] == 12:
+            raise _Corte
+
+    with pytest.raises(_Corte):
+        _ejecutar(instancia, callbacks=[cortar], archivo_punto_control=archivo, intervalo_punto_control=5)
+    reanudado, trayectoria_reanudada = _ejecutar(instancia, archivo_punto_control=archivo, intervalo_punto_control=5,
+                                                 reanudar=True)
+
+    assert min(trayectoria_reanudada) == 11  # Continúa tras el punto de control de la generación 10
+    assert all(trayectoria_reanudada[g] == trayectoria_completa[g] for g in trayectoria_reanudada)
+    assert reanudado['mejor_penalizacion'] == completo['mejor_penalizacion']
+    assert dict(reanudado['mejor_asignacion']) == dict(completo['mejor_asignacion'])
+    assert reanudado['generacion_parada'] == completo['generacion_parada']
+
+
+def test_punto_control_de_otra_instancia_o_archivo(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, 'GENERACIONES', 3)
+    archivo = str(tmp_path / 'corrida.ckpt')
+    _ejecutar(leer_instancia('instance1'), archivo_punto_control=archivo, intervalo_punto_control=1)
+    with pytest.raises(ValueError, match="otra instancia"):
+        main.cargar_punto_control(archivo, main.preprocesar_datos(leer_instancia('instance2')))
+    otro = tmp_path / 'otro.bin'
+    otro.write_bytes(b'no es un punto de control')
+    with pytest.raises(ValueError, match="no es un punto de control"):
+        main.cargar_punto_control(str(otro))
@@ -0,0 +1,103 @@
+"""
+`diferenciar_instancias` sobre una copia modificada de instance1 (empleados,
+escritorios y días añadidos o retirados) y factibilidad de las semillas de
+`sembrar_replanificacion` en la instancia nueva.
+"""
+
+import copy
+import json
+import random
+
+import pytest
+
+from comun import leer_instancia, main
+
+RETIRADO, NUEVO, CAMBIA_GRUPO = 'E19', 'E20', 'E10'
+DIA_RETIRADO, DIA_NUEVO = 'V', 'S'
+ESCRITORIO_NUEVO = 'D9'
+
+
+def _reporte_anterior(instancia, tmp_path):
+    datos = main.preprocesar_datos(copy.deepcopy(instancia))
+    random.seed(4)
+    plan = main.crear_poblacion_inicial(datos, 1)[0]
+    assert main.es_factible(plan, datos)
+    archivo = main.generar_reporte_json(plan, datos, str(tmp_path / 'reporte_asignaciones.json'))
+    with open(archivo, encoding='utf-8') as f:
+        return dict(plan), json.load(f)
+
+
+def _quitar(lista, valor):
+    if valor in lista:
+        lista.remove(valor)
+
+
+def _modificar(instancia, escritorio_retirado, mover_de_grupo):
+    nueva = copy.deepcopy(instancia)
+    # Retira un empleado y añade otro
+    nueva['Employees'].remove(RETIRADO)
+    del nueva['Desks_E'][RETIRADO], nueva['Days_E'][RETIRADO]
+    for miembros in nueva['Employees_G'].values():
+        _quitar(miembros, RETIRADO)
+    nueva['Employees'].append(NUEVO)
+    nueva['Desks_E'][NUEVO] = ['D5', 'D8']
+    nueva['Days_E'][NUEVO] = ['L', 'Ma']
+    nueva['Employees_G']['G3'].append(NUEVO)
+    # Retira un escritorio usado en el plan y añade otro (permitido a E1, que no queda afectado por ello)
+    nueva['Desks'].remove(escritorio_retirado)
+    for escritorios in [*nueva['Desks_Z'].values(), *nueva['Desks_E'].values()]:
+        _quitar(escritorios, escritorio_retirado)
+    nueva['Desks'].append(ESCRITORIO_NUEVO)
+    nueva['Desks_Z']['Z1'].append(ESCRITORIO_NUEVO)
+    nueva['Desks_E']['E1'].append(ESCRITORIO_NUEVO)
+    # Retira un día (también de las preferencias) y añade otro; E5 cambia sus días preferidos
+    nueva['Days'].remove(DIA_RETIRADO)
+    nueva['Days'].append(DIA_NUEVO)
+    for dias in nueva['Days_E'].values():
+        _quitar(dias, DIA_RETIRADO)
+    nueva['Days_E']['E5'] = ['L']
+    if mover_de_grupo:
+        nueva['Employees_G']['G2'].remove(CAMBIA_GRUPO)
+        nueva['Employees_G']['G3'].append(CAMBIA_GRUPO)
+    return nueva
+
+
+@pytest.mark.parametrize('con_instancia_anterior', [False, True])
+def test_diferencia_y_semillas_factibles(tmp_path, con_instancia_anterior):
+    anterior = leer_instancia('instance1')
+    plan, reporte = _reporte_anterior(anterior, tmp_path)
+    escritorio_retirado = plan[min(k for k in plan if k[0] != RETIRADO)]
+    nueva = _modificar(anterior, escritorio_retirado, mover_de_grupo=con_instancia_anterior)
+
+    diferencia = main.preparar_replanificacion(nueva, reporte, anterior if con_instancia_anterior else None,
+                                               penalizacion_cambio=30)
+
+    empleados = nueva['Employees']
+    asignacion_invalida = {e for (e, d), desk in plan.items()
+                           if e != RETIRADO and (d == DIA_RETIRADO or desk == escritorio_retirado)}
+    dias_preferidos = {e for e in empleados if e != NUEVO and set(nueva['Days_E'][e]) != set(anterior['Days_E'][e])}
+    grupo = {CAMBIA_GRUPO} if con_instancia_anterior else set()
+    assert 'E5' in dias_preferidos and asignacion_invalida
+    assert diferencia['resumen'] == {
+        'nuevos': 1, 'dias_preferidos': len(dias_preferidos), 'grupo': len(grupo),
+        'asignacion_invalida': len(asignacion_invalida), 'retirados': 1,
+        'afectados': len({NUEVO} | dias_preferidos | grupo | asignacion_invalida),
+        'asignaciones_conservadas': len(diferencia['plan_conservado'])}
+    afectados = {NUEVO} | dias_preferidos | grupo | asignacion_invalida
+    assert diferencia['afectados'] == [e for e in empleados if e in afectados]
+    assert diferencia['plan_conservado'] == {(e, d): desk for (e, d), desk in plan.items()
+                                             if e != RETIRADO and e not in afectados}
+    assert nueva['plan_anterior'] == diferencia['plan_conservado'] and nueva['penalizacion_cambio'] == 30
+
+    datos = main.preprocesar_datos(nueva)
+    random.seed(9)
+    semillas = main.sembrar_replanificacion(datos, diferencia, 6)
+    assert len(semillas) == 6
+    for semilla in semillas:
+        assert main.es_factible(semilla, datos)
+        assert diferencia['plan_conservado'].items() <= semilla.items()
+        for (e, d), desk in semilla.items():
+            assert e in empleados and d in datos['dias_evaluacion'] and desk in nueva['Desks']
+            assert d != DIA_RETIRADO and desk != escritorio_retirado
+        # Conserva todo el plan no afectado: no paga penalización por cambios
+        assert main.agregar_asignacion(semilla, datos)['cambios_plan_anterior'] == 0
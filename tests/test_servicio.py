@@ -0,0 +1,74 @@
+"""`ServicioSolver` con un proceso sobre instance1: validación, resolución, cancelación y HTTP en localhost."""
+
+import asyncio
+import json
+
+import pytest
+
+from comun import leer_instancia, main
+
+import servicio  # noqa: E402  (src/ queda en sys.path al importar comun)
+
+ESPERA_MAXIMA = 60
+
+
+async def _http(puerto, metodo, ruta, contenido=None):
+    """Una solicitud HTTP/1.1 contra el servicio; retorna (estado, JSON de la respuesta)."""
+    lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+    cuerpo = json.dumps(contenido).encode('utf-8') if contenido is not None else b''
+    escritor.write(f"{metodo} {ruta} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {len(cuerpo)}\r\n\r\n".encode('latin-1')
+                   + cuerpo)
+    await escritor.drain()
+    respuesta = await lector.read()
+    escritor.close()
+    cabecera, _, datos = respuesta.partition(b'\r\n\r\n')
+    return int(cabecera.split()[1]), json.loads(datos)
+
+
+async def _esperar_fin(trabajo):
+    async with trabajo['cambio']:
+        await asyncio.wait_for(trabajo['cambio'].wait_for(lambda: trabajo['estado'] in servicio.ESTADOS_FINALES),
+                               ESPERA_MAXIMA)
+
+
+async def _probar_servicio():
+    solver = servicio.ServicioSolver(1, modo_evaluacion='vectorizado')
+    servidor = await solver.iniciar('127.0.0.1', 0)
+    puerto = servidor.sockets[0].getsockname()[1]
+    try:
+        instancia = leer_instancia('instance1')
+
+        for opciones in ({'tiempo_limite': [1]}, {'tiempo_limite': 0}, {'tiempo_limite': True},
+                         {'generaciones': 0}, {'generaciones': 2.5}, {'semilla': 'x'}):
+            with pytest.raises(ValueError):
+                solver.enviar(instancia, **opciones)
+        estado, respuesta = await _http(puerto, 'POST', '/trabajos', {'instancia': instancia, 'tiempo_limite': [1]})
+        assert estado == 400 and 'tiempo_limite' in respuesta['error']
+
+        # El primero ocupa al único proceso; el segundo espera en la cola y se cancela allí
+        estado, primero = await _http(puerto, 'POST', '/trabajos',
+                                      {'instancia': instancia, 'tiempo_limite': 2, 'semilla': 1, 'generaciones': 30})
+        assert estado == 202
+        estado, segundo = await _http(puerto, 'POST', '/trabajos', {'instancia': instancia, 'tiempo_limite': 2})
+        assert estado == 202 and segundo['estado'] == 'en_cola'
+        estado, cancelado = await _http(puerto, 'DELETE', f"/trabajos/{segundo['id']}")
+        assert estado == 202 and cancelado['estado'] == 'cancelado'
+
+        await _esperar_fin(solver.trabajos[primero['id']])
+        estado, resultado = await _http(puerto, 'GET', f"/trabajos/{primero['id']}/resultado")
+        assert estado == 200 and resultado['estado'] == 'terminado'
+        asignacion = {(fila['empleado'], fila['dia']): fila['escritorio'] for fila in resultado['asignaciones']}
+        datos = main.preprocesar_datos(leer_instancia('instance1'))
+        assert resultado['penalizacion'] == main.calcular_fitness(asignacion, datos)
+        assert resultado['kpis'] == json.loads(json.dumps(main.reportar_resultados(asignacion, datos)))
+
+        estado, _ = await _http(puerto, 'GET', f"/trabajos/{segundo['id']}/resultado")
+        assert estado == 409
+        estado, _ = await _http(puerto, 'GET', '/trabajos/999')
+        assert estado == 404
+    finally:
+        await solver.cerrar()
+
+
+def test_servicio_solver():
+    asyncio.run(_probar_servicio())